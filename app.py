@@ -4,7 +4,7 @@ Flask Web UI für Revolico Phone Number Scraper + WhatsApp Integration
 Mit QR-Code Screenshot Anzeige und Session Persistierung
 """
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Blueprint, current_app, render_template, request, jsonify, send_file, Response
 from flask_socketio import SocketIO, emit
 import json
 import os
@@ -13,37 +13,40 @@ import time
 from datetime import datetime
 from typing import Dict, Any
 
-from selenium_browser_scraper import SeleniumBrowserScraper
-from utils import load_from_json, get_file_size
-from models import db, Customer, ScrapedListing, ImageProxy, WhatsAppAccount, init_database
-from whatsapp_simple import get_whatsapp_bot, SIMPLE_MESSAGES
+from utils import load_from_json, get_file_size, configure_logging
+from models import db, Customer, ScrapedListing, ListingPhone, ImageProxy, WhatsAppAccount, ScrapeJob, ScrapeSchedule, ScheduleRun, init_database
+from whatsapp_messages import SIMPLE_MESSAGES
 from whatsapp_manager import WhatsAppAccountManager
-from image_service import ImageProxyService
-import requests
-
-app = Flask(__name__)
-app.config['SECRET_KEY'] = 'revolico_scraper_secret_key'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///revolico_customers.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
-    'connect_args': {'check_same_thread': False}
-}
-socketio = SocketIO(app, cors_allowed_origins="*")
-
-# Datenbank initialisieren
-init_database(app)
+from category_mapping import map_categories
+from change_feed import ChangeFeed, LISTING_STATUS_CHANGED, LISTINGS_CLEARED
+from collection_version import CollectionVersion, conditional_collection
+from crawl_frontier import CrawlFrontier
+from image_backoff import ImageBackoff
+from image_fetcher import PLACEHOLDER_PNG, image_fetcher
+from metrics import metrics
+from job_queue import JobQueue
+from listing_search import ListingSearch
+from listing_stats import ListingStats
+from json_provider import FastJSONProvider
+from phone_index import PhoneIndex
+from response_compression import init_compression
+from scheduler import Scheduler, ScheduleService
+from log_broadcaster import LogBroadcaster
+
+# Logging einmal zentral einrichten (JSON-Dateien mit Rotation, QueueListener)
+configure_logging()
+
+socketio = SocketIO(cors_allowed_origins="*")
+bp = Blueprint('web', __name__)
 
 # Initialize WhatsApp Account Manager
 wa_manager = WhatsAppAccountManager(db)
 
-# Restore previously logged-in WhatsApp sessions on startup
-with app.app_context():
-    wa_manager.restore_logged_in_accounts()
+def emit_restore_progress(progress):
+    """Fortschritt der Session-Wiederherstellung an die Web-UI senden"""
+    socketio.emit('whatsapp_restore_progress', progress)
 
-# Global variables to track scraping state
-scraping_active = False
-current_scraper = None
-scraping_results = {}
+wa_manager.on_restore_progress = emit_restore_progress
 
 # Global variables for WhatsApp automation
 whatsapp_active = False
@@ -52,21 +55,22 @@ whatsapp_results = {}
 whatsapp_qr_ready = False
 
 class WebScrapeLogger:
-    """Custom logger that emits to web interface"""
+    """Custom logger that emits to web interface (batched via LogBroadcaster)"""
 
-    def __init__(self, socketio):
-        self.socketio = socketio
+    def __init__(self, broadcaster):
+        self.broadcaster = broadcaster
 
     def log(self, level: str, message: str):
         """Send log message to web interface"""
-        self.socketio.emit('log_message', {
-            'level': level,
-            'message': message,
-            'timestamp': datetime.now().strftime('%H:%M:%S')
-        })
+        self.broadcaster.publish(level, message)
 
-        # Also print to console
-        print(f"[{level}] {message}")
+        # Also print to console (DEBUG only goes to the web UI buffer)
+        if level != 'DEBUG':
+            print(f"[{level}] {message}")
+
+    def debug(self, message: str):
+        """Log debug message (sampled under load)"""
+        self.log('DEBUG', message)
 
     def info(self, message: str):
         """Log info message"""
@@ -81,27 +85,149 @@ class WebScrapeLogger:
         self.log('ERROR', message)
 
 # Initialize logger
-web_logger = WebScrapeLogger(socketio)
+log_broadcaster = LogBroadcaster(socketio)
+web_logger = WebScrapeLogger(log_broadcaster)
+
+# Metrics-Snapshots per SocketIO höchstens alle METRICS_PUBLISH_INTERVAL Sekunden
+METRICS_PUBLISH_INTERVAL = 2.0
+_last_metrics_publish = 0.0
+
+def publish_metrics(force=False):
+    """Sendet einen Metrics-Snapshot an die Web-UI ('metrics_update')"""
+    global _last_metrics_publish
+    now = time.time()
+    if not force and now - _last_metrics_publish < METRICS_PUBLISH_INTERVAL:
+        return
+    _last_metrics_publish = now
+    socketio.emit('metrics_update', metrics.snapshot())
+
+def dispatch_job_event(event, payload):
+    """
+    Leitet ein Worker-Event an die Web-UI weiter
+    (direkt vom eingebetteten Worker oder über relay_job_events)
+    """
+    if event == 'log':
+        log_broadcaster.publish(payload.get('level', 'INFO'), payload.get('message', ''))
+        return
+    socketio.emit(event, payload)
+    if event == 'job_progress':
+        publish_metrics()
+    elif event == 'job_update' and payload.get('status') in JobQueue.FINISHED:
+        publish_metrics(force=True)
+
+def relay_job_events(app, interval=0.5, prune_every=1200):
+    """
+    Hintergrund-Task im Web-Prozess: liest neue Events externer Worker aus
+    scrape_job_events und sendet sie per SocketIO (alte Events werden regelmäßig gelöscht)
+    """
+    with app.app_context():
+        last_id = JobQueue.last_event_id()
+
+    polls = 0
+    while True:
+        socketio.sleep(interval)
+        polls += 1
+        try:
+            with app.app_context():
+                events = [(e.id, e.event, e.payload) for e in JobQueue.events_since(last_id)]
+                if polls % prune_every == 0:
+                    JobQueue.prune_events()
+        except Exception as e:
+            print(f"[ERROR] Job event relay failed: {e}")
+            continue
+
+        for event_id, event, payload in events:
+            last_id = event_id
+            dispatch_job_event(event, payload or {})
+
+def relay_changes(app, interval=0.5, prune_every=7200):
+    """
+    Hintergrund-Task im Web-Prozess: sendet neue change_events (Listings,
+    Accounts - aus allen Prozessen) als 'change' mit Version an alle Clients.
+    Versionen hinter einer noch offenen Lücke warten bis zum nächsten Poll (siehe change_feed.py)
+    """
+    with app.app_context():
+        version = ChangeFeed.latest_version()
+
+    polls = 0
+    while True:
+        socketio.sleep(interval)
+        polls += 1
+        try:
+            with app.app_context():
+                changes = ChangeFeed.since(version)
+                if polls % prune_every == 0:
+                    ChangeFeed.prune()
+        except Exception as e:
+            print(f"[ERROR] Change relay failed: {e}")
+            continue
+
+        for change in changes:
+            version = change['version']
+            socketio.emit('change', change)
 
-@app.route('/')
+@bp.route('/')
 def index():
     """Main dashboard"""
     return render_template('index.html')
 
-@app.route('/api/status')
+@bp.route('/metrics')
+def prometheus_metrics():
+    """Prometheus Scrape-Endpoint (Timer, Counter, Histogramme)"""
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+@bp.route('/api/metrics')
+def get_metrics():
+    """Metrics-Snapshot als JSON"""
+    return jsonify({'success': True, 'metrics': metrics.snapshot()})
+
+@bp.route('/api/logs/recent')
+def get_recent_logs():
+    """
+    Letzte Log-Zeilen aus dem Ringpuffer (für neu verbundene Clients)
+    Query params:
+      - limit=200: max Anzahl
+      - since=<seq>: nur neuere Einträge
+    """
+    try:
+        limit = int(request.args.get('limit', 200))
+        since = request.args.get('since', type=int)
+        return jsonify({'success': True, 'logs': log_broadcaster.recent(limit=limit, since=since)})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/api/changes')
+def get_changes():
+    """
+    Versionierte Änderungen für Clients (Reconnect oder Versionslücke)
+    Query params:
+      - since=<version>: nur neuere Änderungen (ohne: nur aktuelle Version)
+      - limit=500: max Anzahl (has_more=true wenn es weitere gibt)
+    """
+    try:
+        since = request.args.get('since', type=int)
+        limit = max(1, min(request.args.get('limit', 500, type=int), 1000))
+        if since is None:
+            return jsonify({'success': True, 'version': ChangeFeed.latest_version(), 'changes': [],
+                            'reset': False, 'has_more': False})
+        return jsonify({'success': True, **ChangeFeed.missed(since, limit=limit)})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/api/status')
 def get_status():
     """Get scraping status"""
     return jsonify({
-        'scraping_active': scraping_active,
+        'scraping_active': scraping_jobs_active(),
         'whatsapp_active': whatsapp_active,
-        'results_available': bool(scraping_results),
+        'results_available': JobQueue.latest_finished() is not None,
         'data_file_size': get_file_size('revolico_data.json'),
         'whatsapp_qr_ready': whatsapp_qr_ready
     })
 
 # ===== WHATSAPP API ENDPOINTS =====
 
-@app.route('/api/whatsapp/setup', methods=['POST'])
+@bp.route('/api/whatsapp/setup', methods=['POST'])
 def whatsapp_setup():
     """Setup WhatsApp Web automation with QR code"""
     global whatsapp_active, current_whatsapp_bot, whatsapp_qr_ready
@@ -116,7 +242,8 @@ def whatsapp_setup():
         # Start WhatsApp setup in background thread
         def run_whatsapp_setup():
             global whatsapp_active, current_whatsapp_bot, whatsapp_qr_ready
-            
+            from whatsapp_simple import get_whatsapp_bot
+
             try:
                 whatsapp_active = True
                 current_whatsapp_bot = get_whatsapp_bot()
@@ -200,7 +327,7 @@ def whatsapp_setup():
             'message': f'WhatsApp setup failed: {str(e)}'
         }), 500
 
-@app.route('/api/whatsapp/qr-image', methods=['GET'])
+@bp.route('/api/whatsapp/qr-image', methods=['GET'])
 def get_qr_image():
     """Get QR code screenshot in original resolution"""
     global current_whatsapp_bot
@@ -227,7 +354,7 @@ def get_qr_image():
             'message': f'Failed to get QR image: {str(e)}'
         }), 500
 
-@app.route('/api/whatsapp/templates', methods=['GET'])
+@bp.route('/api/whatsapp/templates', methods=['GET'])
 def get_whatsapp_templates():
     """Get available WhatsApp message templates"""
     return jsonify({
@@ -235,7 +362,7 @@ def get_whatsapp_templates():
         'templates': SIMPLE_MESSAGES
     })
 
-@app.route('/api/whatsapp/status', methods=['GET'])
+@bp.route('/api/whatsapp/status', methods=['GET'])
 def whatsapp_status():
     """Get WhatsApp status"""
     global whatsapp_active, current_whatsapp_bot
@@ -261,10 +388,10 @@ def whatsapp_status():
             'message': str(e)
         }), 500
 
-@app.route('/api/whatsapp/start-campaign', methods=['POST'])
+@bp.route('/api/whatsapp/start-campaign', methods=['POST'])
 def start_whatsapp_campaign():
     """Start WhatsApp outreach campaign using multi-account system"""
-    from whatsapp_simple import SIMPLE_MESSAGES
+    app = current_app._get_current_object()
 
     try:
         # Get all active logged-in accounts
@@ -281,14 +408,14 @@ def start_whatsapp_campaign():
         account = logged_in_accounts[0]
         account_id = account['id']
 
-        # Get bot instance for this account
-        bot = wa_manager.get_bot(account_id)
+        # Get bot instance for this account (restores the session on first use)
+        bot = wa_manager.ensure_bot_ready(account_id)
 
         # Validate that bot exists AND is actually logged in (both DB and runtime status)
         if not bot:
             return jsonify({
                 'success': False,
-                'message': f'WhatsApp bot for account "{account["account_name"]}" is not running. Please click Setup first.'
+                'message': f'WhatsApp bot for account "{account["account_name"]}" could not be restored. Please click Setup first.'
             }), 400
 
         if not bot.is_logged_in or not bot.driver:
@@ -317,13 +444,11 @@ def start_whatsapp_campaign():
         message_template = data.get('message_template', SIMPLE_MESSAGES['simple'])
         daily_limit = int(data.get('daily_limit', 10))
 
-        # Get uncontacted listings with phone numbers
+        # Get uncontacted listings with phone numbers (one per seller, limit applied in SQL)
         with app.app_context():
-            listings = ScrapedListing.query.filter_by(whatsapp_contacted=False).limit(daily_limit).all()
-            # Filter only listings that have phone numbers
-            listings = [l for l in listings if l.phone_numbers and len(l.phone_numbers) > 0]
+            targets = PhoneIndex.campaign_targets(daily_limit)
 
-            if not listings:
+            if not targets:
                 return jsonify({
                     'success': False,
                     'message': 'No uncontacted listings found'
@@ -336,11 +461,16 @@ def start_whatsapp_campaign():
 
                 socketio.emit('whatsapp_log', {
                     'level': 'INFO',
-                    'message': f'Starting campaign with account: {account["account_name"]} ({sent_count}/{len(listings)} listings)'
+                    'message': f'Starting campaign with account: {account["account_name"]} ({sent_count}/{len(targets)} listings)'
                 })
 
-                for listing in listings:
+                for target, phone in targets:
                     try:
+                        # Targets stammen aus einer anderen Session - hier neu laden
+                        listing = db.session.get(ScrapedListing, target.id)
+                        if not listing:
+                            continue
+
                         # Check if account can still send messages (daily limit)
                         can_send, reason = wa_manager.can_send_message(account_id)
                         if not can_send:
@@ -350,18 +480,17 @@ def start_whatsapp_campaign():
                             })
                             break
 
-                        # Send to first phone number in the listing
-                        phone = listing.phone_numbers[0] if listing.phone_numbers else None
-                        if not phone:
-                            continue
-
                         result = bot.send_message(phone, message_template)
+                        publish_metrics()
 
                         if result['status'] == 'success':
+                            stats_before = ListingStats.keys(listing)
                             listing.whatsapp_contacted = True
                             listing.whatsapp_contacted_at = datetime.utcnow()
                             listing.whatsapp_status = 'sent'
                             listing.whatsapp_account_id = account_id
+                            ListingStats.move(stats_before, listing)
+                            ChangeFeed.listing(LISTING_STATUS_CHANGED, listing)
                             db.session.commit()
 
                             # Increment message counter for this account
@@ -370,10 +499,11 @@ def start_whatsapp_campaign():
                             sent_count += 1
                             socketio.emit('whatsapp_log', {
                                 'level': 'SUCCESS',
-                                'message': f'Message sent to {phone} - {listing.title} ({sent_count}/{len(listings)})'
+                                'message': f'Message sent to {phone} - {listing.title} ({sent_count}/{len(targets)})'
                             })
                         else:
                             listing.whatsapp_status = 'failed'
+                            ChangeFeed.listing(LISTING_STATUS_CHANGED, listing)
                             db.session.commit()
 
                             wa_manager.increment_message_counter(account_id, success=False)
@@ -394,10 +524,12 @@ def start_whatsapp_campaign():
                         time.sleep(delay)
 
                     except Exception as e:
+                        # Halb geschriebene Änderungen verwerfen, sonst scheitert jeder weitere Commit
+                        db.session.rollback()
                         failed_count += 1
                         socketio.emit('whatsapp_log', {
                             'level': 'ERROR',
-                            'message': f'Error sending to listing {listing.id}: {str(e)}'
+                            'message': f'Error sending to listing {target.id}: {str(e)}'
                         })
 
                 socketio.emit('whatsapp_campaign_completed', {
@@ -411,12 +543,12 @@ def start_whatsapp_campaign():
         threading.Thread(target=run_campaign, daemon=True).start()
 
         socketio.emit('whatsapp_campaign_started', {
-            'message': f'Campaign started for {len(listings)} listings using {account["account_name"]}'
+            'message': f'Campaign started for {len(targets)} listings using {account["account_name"]}'
         })
 
         return jsonify({
             'success': True,
-            'message': f'Campaign started for {len(listings)} listings using account {account["account_name"]}'
+            'message': f'Campaign started for {len(targets)} listings using account {account["account_name"]}'
         })
 
     except Exception as e:
@@ -427,7 +559,7 @@ def start_whatsapp_campaign():
             'message': str(e)
         }), 500
 
-@app.route('/api/whatsapp/stop', methods=['POST'])
+@bp.route('/api/whatsapp/stop', methods=['POST'])
 def stop_whatsapp():
     """Stop WhatsApp automation"""
     global whatsapp_active, current_whatsapp_bot, whatsapp_qr_ready
@@ -455,20 +587,22 @@ def stop_whatsapp():
             'message': str(e)
         }), 500
 
-@app.route('/api/whatsapp/uncontacted', methods=['GET'])
+@bp.route('/api/whatsapp/uncontacted', methods=['GET'])
 def get_uncontacted_customers():
     """Get list of uncontacted listings with phone numbers"""
     try:
-        listings = ScrapedListing.query.filter_by(whatsapp_contacted=False).all()
-        # Filter only listings with phone numbers
-        listings = [l for l in listings if l.phone_numbers and len(l.phone_numbers) > 0]
+        listings = ScrapedListing.query.filter(
+            ScrapedListing.whatsapp_contacted.is_(False),
+            PhoneIndex.has_phone()
+        ).all()
+        phones = PhoneIndex.primary_phones([l.id for l in listings])
 
         return jsonify({
             'success': True,
             'count': len(listings),
             'customers': [{
                 'id': l.id,
-                'phone_number': l.phone_numbers[0] if l.phone_numbers else None,
+                'phone_number': phones.get(l.id),
                 'source_title': l.title,
                 'source_url': l.url,
                 'created_at': l.created_at.isoformat()
@@ -480,12 +614,42 @@ def get_uncontacted_customers():
             'message': str(e)
         }), 500
 
+@bp.route('/api/phones/<phone>/listings', methods=['GET'])
+def get_phone_listings(phone):
+    """All listings of one seller phone number (any format, normalized to E.164)"""
+    try:
+        normalized = PhoneIndex.normalize(phone)
+        if not normalized:
+            return jsonify({'success': False, 'error': f'Invalid phone number: {phone}'}), 400
+
+        listings = PhoneIndex.listings_for_phone(normalized)
+        return jsonify({
+            'success': True,
+            'phone': normalized,
+            'count': len(listings),
+            'listings': [l.to_dict() for l in listings]
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/api/sellers', methods=['GET'])
+def get_sellers():
+    """Sellers grouped by phone number with listing count (most listings first)"""
+    try:
+        limit = min(request.args.get('limit', 100, type=int), 1000)
+        offset = request.args.get('offset', 0, type=int)
+        sellers = PhoneIndex.sellers(limit=limit, offset=offset)
+        return jsonify({'success': True, 'count': len(sellers), 'sellers': sellers})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 
 # ============================================
 # WhatsApp Account Management API Endpoints
 # ============================================
 
-@app.route('/api/whatsapp/accounts', methods=['GET'])
+@bp.route('/api/whatsapp/accounts', methods=['GET'])
+@conditional_collection(CollectionVersion.accounts)
 def get_whatsapp_accounts():
     """Get all WhatsApp accounts"""
     try:
@@ -501,7 +665,7 @@ def get_whatsapp_accounts():
         }), 500
 
 
-@app.route('/api/whatsapp/accounts', methods=['POST'])
+@bp.route('/api/whatsapp/accounts', methods=['POST'])
 def create_whatsapp_account():
     """Create new WhatsApp account"""
     try:
@@ -542,7 +706,7 @@ def create_whatsapp_account():
         }), 500
 
 
-@app.route('/api/whatsapp/accounts/<int:account_id>', methods=['DELETE'])
+@bp.route('/api/whatsapp/accounts/<int:account_id>', methods=['DELETE'])
 def delete_whatsapp_account(account_id):
     """Delete WhatsApp account"""
     try:
@@ -573,10 +737,11 @@ def delete_whatsapp_account(account_id):
         }), 500
 
 
-@app.route('/api/whatsapp/accounts/<int:account_id>/setup', methods=['POST'])
+@bp.route('/api/whatsapp/accounts/<int:account_id>/setup', methods=['POST'])
 def setup_whatsapp_account(account_id):
     """Setup WhatsApp for specific account (show QR code)"""
     global whatsapp_active, whatsapp_qr_ready
+    app = current_app._get_current_object()
 
     try:
         # Get or create bot for this account
@@ -711,7 +876,7 @@ def setup_whatsapp_account(account_id):
         }), 500
 
 
-@app.route('/api/whatsapp/accounts/<int:account_id>/qr-image', methods=['GET'])
+@bp.route('/api/whatsapp/accounts/<int:account_id>/qr-image', methods=['GET'])
 def get_account_qr_image(account_id):
     """Get QR code image for specific account"""
     try:
@@ -738,7 +903,7 @@ def get_account_qr_image(account_id):
         }), 500
 
 
-@app.route('/api/whatsapp/accounts/<int:account_id>/status', methods=['GET'])
+@bp.route('/api/whatsapp/accounts/<int:account_id>/status', methods=['GET'])
 def get_account_status(account_id):
     """Get status for specific WhatsApp account"""
     try:
@@ -764,160 +929,419 @@ def get_account_status(account_id):
             'message': str(e)
         }), 500
 
+@bp.route('/api/whatsapp/restore-status', methods=['GET'])
+def get_restore_status():
+    """Status der Session-Wiederherstellung aller Accounts"""
+    return jsonify({
+        'success': True,
+        'mode': current_app.config['WHATSAPP_RESTORE_MODE'],
+        'accounts': wa_manager.get_restore_status()
+    })
+
+
+@bp.route('/api/whatsapp/accounts/<int:account_id>/restore', methods=['POST'])
+def restore_whatsapp_account(account_id):
+    """Restore the saved WhatsApp session of one account on demand"""
+    app = current_app._get_current_object()
+
+    try:
+        account = db.session.get(WhatsAppAccount, account_id)
+        if not account:
+            return jsonify({
+                'success': False,
+                'message': 'Account not found'
+            }), 404
+
+        def restore_thread():
+            with app.app_context():
+                wa_manager.restore_account(account_id)
+
+        threading.Thread(target=restore_thread, daemon=True).start()
+
+        return jsonify({
+            'success': True,
+            'message': f'Restoring session for account "{account.account_name}"'
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
+
 # ===== SCRAPING AND CUSTOMER ENDPOINTS =====
 
-@app.route('/api/scrape', methods=['POST'])
-@app.route('/api/start-scraping', methods=['POST'])
-def start_scraping():
-    """Start scraping process"""
-    global scraping_active, current_scraper
-    
-    if scraping_active:
+def scraping_jobs_active() -> bool:
+    """True wenn ein Scraping- oder Refresh-Job wartet oder läuft"""
+    return bool(JobQueue.active_jobs())
+
+def job_params(kind, data):
+    """Job-Parameter aus dem JSON-Body (nur bekannte Felder)"""
+    if kind == 'refresh':
+        return {'limit': int(data.get('limit') or 50)}
+    params = {
+        'max_listings': int(data.get('max_listings') or 3),
+        'resume': bool(data.get('resume', True)),
+    }
+    if data.get('category'):
+        params['category'] = data['category']
+    return params
+
+def enqueue_job(kind, data):
+    """Legt einen Job an und meldet ihn an die Web-UI; Antwort für die Start-Endpoints"""
+    try:
+        queued_before = len(JobQueue.active_jobs())
+        job = JobQueue.enqueue(kind, job_params(kind, data), priority=data.get('priority', 0))
+        dispatch_job_event('job_update', job.to_dict(include_result=False))
+        web_logger.log('INFO', f'{kind.capitalize()} job #{job.id} queued (scope {job.scope}, priority {job.priority})'
+                               + (f', {queued_before} ahead' if queued_before else ''))
+
+        return jsonify({
+            'success': True,
+            'message': f'{kind.capitalize()} job queued',
+            'job_id': job.id,
+            'job': job.to_dict(include_result=False)
+        })
+    except ValueError as e:
+        db.session.rollback()
         return jsonify({
             'success': False,
-            'message': 'Scraping is already running'
+            'message': str(e)
         }), 400
-    
-    def run_scraping():
-        global scraping_active, current_scraper, scraping_results
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
 
-        try:
-            scraping_active = True
-            web_logger.log('INFO', 'Initializing scraper...')
+@bp.route('/api/scrape', methods=['POST'])
+@bp.route('/api/start-scraping', methods=['POST'])
+def start_scraping():
+    """
+    Start scraping process (legt einen Job für den Scrape-Worker an)
+    JSON body (optional):
+      - resume=true: offene URLs aus der Crawl-Frontier fortsetzen
+      - max_listings=3: maximale Anzahl Listings
+      - category=moviles: nur diese Kategorie (siehe /api/jobs/categories)
+      - priority=0: höhere Priorität wird zuerst gestartet
+    """
+    return enqueue_job('scrape', request.get_json(silent=True) or {})
 
-            try:
-                current_scraper = SeleniumBrowserScraper(web_logger)
-            except Exception as init_error:
-                import traceback
-                error_trace = traceback.format_exc()
-                web_logger.log('ERROR', f'Failed to initialize scraper: {str(init_error)}')
-                web_logger.log('ERROR', f'Traceback: {error_trace}')
-                raise
+@bp.route('/api/stop-scraping', methods=['POST'])
+def stop_scraping():
+    """Stop the scraping process (bricht alle wartenden und laufenden Jobs ab)"""
+    try:
+        count = JobQueue.cancel()
+        if count:
+            web_logger.log('WARNING', 'Scraping gestoppt durch Benutzer')
 
-            web_logger.log('INFO', 'Starting Firefox browser scraper...')
+        return jsonify({
+            'success': True,
+            'message': 'Scraping stopped',
+            'cancelled_jobs': count
+        })
+    except Exception as e:
+        web_logger.log('ERROR', f'Fehler beim Stoppen: {str(e)}')
+        return jsonify({
+            'success': False,
+            'message': f'Fehler beim Stoppen: {str(e)}'
+        }), 500
 
-            try:
-                results = current_scraper.scrape_revolico()
-            except Exception as scrape_error:
-                import traceback
-                error_trace = traceback.format_exc()
-                web_logger.log('ERROR', f'Scraping execution failed: {str(scrape_error)}')
-                web_logger.log('ERROR', f'Traceback: {error_trace}')
-                raise
-
-            if results and 'results' in results:
-                # Save to database
-                with app.app_context():
-                    saved_listings = 0
-
-                    for result in results['results']:
-                        # Save to ScrapedListing table
-                        if result.get('revolico_id'):
-                            # Check if listing already exists
-                            existing_listing = ScrapedListing.query.filter_by(
-                                revolico_id=result['revolico_id']
-                            ).first()
-
-                            if not existing_listing:
-                                # Process images through proxy service
-                                image_ids = ImageProxyService.process_image_urls(
-                                    result.get('images', [])
-                                )
-
-                                # Process profile picture through proxy service
-                                profile_picture_id = None
-                                if result.get('profile_picture_url'):
-                                    profile_url = result['profile_picture_url']
-
-                                    # Revolico profile pictures: Use direct URL (no proxy/caching)
-                                    # They are time-limited tokens that expire quickly, so caching doesn't help
-                                    if 'pic.revolico.com/users' in profile_url:
-                                        profile_picture_id = profile_url  # Direct URL as ID
-                                        web_logger.log('INFO', f"📸 Revolico profile pic (direct): {profile_url[:80]}...")
-                                    else:
-                                        # Google profile pictures: Use proxy (they don't expire)
-                                        profile_picture_id = ImageProxyService.get_or_create_proxy(profile_url)
-                                        web_logger.log('INFO', f"📸 Saved profile picture: {profile_picture_id}")
-
-                                # Create new listing
-                                listing = ScrapedListing(
-                                    revolico_id=result['revolico_id'],
-                                    title=result.get('title', ''),
-                                    description=result.get('description', ''),
-                                    url=result.get('url', ''),
-                                    price=result.get('price'),
-                                    currency=result.get('currency', 'USD'),
-                                    phone_numbers=result.get('phone_numbers', []),
-                                    seller_name=result.get('seller_name'),
-                                    profile_picture_id=profile_picture_id,
-                                    image_ids=image_ids,
-                                    category=result.get('category', ''),
-                                    location=result.get('location', ''),
-                                    condition=result.get('condition', 'used'),
-                                    exported=False,
-                                    whatsapp_contacted=False
-                                )
-                                db.session.add(listing)
-                                saved_listings += 1
-
-                    db.session.commit()
-                    web_logger.log('SUCCESS', f'Saved {saved_listings} new listings to database')
-
-            scraping_results = results
-            web_logger.log('SUCCESS', 'Scraping completed successfully')
+@bp.route('/api/refresh-listings', methods=['POST'])
+def refresh_listings():
+    """
+    Refresh-Modus: lädt bekannte Listings leichtgewichtig nach und aktualisiert
+    nur Listings mit geändertem Fingerprint (als Job für den Scrape-Worker)
+    JSON body (optional):
+      - limit=50: max Anzahl Listings (älteste Aktualisierung zuerst)
+      - priority=0: Job-Priorität
+    """
+    return enqueue_job('refresh', request.get_json(silent=True) or {})
 
-        except Exception as e:
-            import traceback
-            error_trace = traceback.format_exc()
-            web_logger.log('ERROR', f'Scraping failed: {str(e)}')
-            web_logger.log('ERROR', f'Full traceback: {error_trace}')
-            scraping_results = {
-                'error': str(e),
-                'traceback': error_trace
-            }
-        finally:
-            scraping_active = False
-            if current_scraper:
-                try:
-                    current_scraper.close()
-                except Exception as close_error:
-                    web_logger.log('WARNING', f'Error closing scraper: {str(close_error)}')
-                current_scraper = None
-    
-    threading.Thread(target=run_scraping, daemon=True).start()
+@bp.route('/api/jobs', methods=['GET'])
+def get_jobs():
+    """
+    Scraping-Jobs (neueste zuerst)
+    Query params:
+      - limit=20: max Anzahl
+      - status=queued,running: nur diese Status
+    """
+    try:
+        limit = int(request.args.get('limit', 20))
+        query = ScrapeJob.query
+        if request.args.get('status'):
+            query = query.filter(ScrapeJob.status.in_(request.args['status'].split(',')))
+        jobs = query.order_by(ScrapeJob.id.desc()).limit(limit).all()
+        return jsonify({
+            'success': True,
+            'worker_mode': current_app.config['SCRAPE_WORKER_MODE'],
+            'jobs': [job.to_dict(include_result=False) for job in jobs]
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
+
+@bp.route('/api/jobs', methods=['POST'])
+def create_job():
+    """
+    Neuen Job anlegen
+    JSON body:
+      - kind=scrape|refresh
+      - priority, category, max_listings, resume (scrape) bzw. limit (refresh)
+    """
+    data = request.get_json(silent=True) or {}
+    return enqueue_job(data.get('kind', 'scrape'), data)
+
+@bp.route('/api/jobs/categories', methods=['GET'])
+def get_job_categories():
+    """Kategorien mit Start-URL für Scraping-Jobs"""
+    from scraper_config import ScraperConfig
 
     return jsonify({
         'success': True,
-        'message': 'Scraping started'
+        'categories': ScraperConfig.CATEGORY_START_URLS
     })
 
-@app.route('/api/stop-scraping', methods=['POST'])
-def stop_scraping():
-    """Stop the scraping process"""
-    global scraping_active, current_scraper
+@bp.route('/api/jobs/<int:job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status, Zwischenstand und Ergebnis eines Jobs"""
+    job = JobQueue.get(job_id)
+    if not job:
+        return jsonify({
+            'success': False,
+            'message': 'Job not found'
+        }), 404
+    return jsonify({
+        'success': True,
+        'job': job.to_dict()
+    })
 
+@bp.route('/api/jobs/<int:job_id>/stop', methods=['POST'])
+def stop_job(job_id):
+    """Einen Job abbrechen (wartend: sofort, laufend: beim nächsten Heartbeat)"""
     try:
-        scraping_active = False
-        if current_scraper:
-            # Try to stop the scraper if it has a stop method
-            if hasattr(current_scraper, 'stop'):
-                current_scraper.stop()
-                web_logger.log('WARNING', 'Scraping gestoppt durch Benutzer')
-            current_scraper = None
+        job = JobQueue.get(job_id)
+        if not job:
+            return jsonify({
+                'success': False,
+                'message': 'Job not found'
+            }), 404
 
+        count = JobQueue.cancel(job_id)
+        job = JobQueue.get(job_id)
+        dispatch_job_event('job_update', job.to_dict(include_result=False))
         return jsonify({
             'success': True,
-            'message': 'Scraping stopped'
+            'message': f'Job #{job_id} stopped' if count else f'Job #{job_id} is not active',
+            'job': job.to_dict(include_result=False)
         })
     except Exception as e:
-        web_logger.log('ERROR', f'Fehler beim Stoppen: {str(e)}')
+        db.session.rollback()
         return jsonify({
             'success': False,
-            'message': f'Fehler beim Stoppen: {str(e)}'
+            'message': str(e)
+        }), 500
+
+def publish_scheduled_job(job):
+    """Neuer Job vom Scheduler -> Web-UI"""
+    dispatch_job_event('job_update', job)
+
+@bp.route('/api/schedules', methods=['GET'])
+def get_schedules():
+    """Alle Schedules mit letztem Lauf"""
+    try:
+        schedules = ScrapeSchedule.query.order_by(ScrapeSchedule.name).all()
+        result = []
+        for schedule in schedules:
+            data = schedule.to_dict()
+            last_run = ScheduleRun.query.filter_by(schedule_id=schedule.id) \
+                .order_by(ScheduleRun.id.desc()).first()
+            data['last_run'] = last_run.to_dict() if last_run else None
+            result.append(data)
+        return jsonify({
+            'success': True,
+            'schedules': result
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
+
+@bp.route('/api/schedules', methods=['POST'])
+def create_schedule():
+    """
+    Neuen Schedule anlegen
+    JSON body:
+      - name (eindeutig), kind=scrape|refresh, category
+      - interval_minutes, jitter_seconds=0, priority=0, enabled=true
+      - params: weitere Job-Parameter (z.B. max_listings)
+    """
+    try:
+        schedule = ScheduleService.create(request.get_json(silent=True) or {})
+        return jsonify({
+            'success': True,
+            'message': f"Schedule '{schedule.name}' created",
+            'schedule': schedule.to_dict()
+        })
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': str(e)
         }), 500
 
-@app.route('/api/customers', methods=['GET'])
-@app.route('/api/listings', methods=['GET'])
+@bp.route('/api/schedules/<int:schedule_id>', methods=['PUT'])
+def update_schedule(schedule_id):
+    """Schedule ändern (Felder wie beim Anlegen)"""
+    try:
+        schedule = db.session.get(ScrapeSchedule, schedule_id)
+        if not schedule:
+            return jsonify({
+                'success': False,
+                'message': 'Schedule not found'
+            }), 404
+        ScheduleService.update(schedule, request.get_json(silent=True) or {})
+        return jsonify({
+            'success': True,
+            'schedule': schedule.to_dict()
+        })
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
+
+@bp.route('/api/schedules/<int:schedule_id>', methods=['DELETE'])
+def delete_schedule(schedule_id):
+    """Schedule samt Lauf-Historie löschen"""
+    try:
+        schedule = db.session.get(ScrapeSchedule, schedule_id)
+        if not schedule:
+            return jsonify({
+                'success': False,
+                'message': 'Schedule not found'
+            }), 404
+        ScheduleRun.query.filter_by(schedule_id=schedule_id).delete(synchronize_session=False)
+        db.session.delete(schedule)
+        db.session.commit()
+        return jsonify({
+            'success': True,
+            'message': f"Schedule '{schedule.name}' deleted"
+        })
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
+
+@bp.route('/api/schedules/<int:schedule_id>/run', methods=['POST'])
+def run_schedule(schedule_id):
+    """Schedule sofort auslösen (nächster planmäßiger Lauf bleibt unverändert)"""
+    try:
+        schedule = db.session.get(ScrapeSchedule, schedule_id)
+        if not schedule:
+            return jsonify({
+                'success': False,
+                'message': 'Schedule not found'
+            }), 404
+        run = Scheduler(current_app._get_current_object(), on_job=publish_scheduled_job) \
+            .trigger(schedule, force=True)
+        return jsonify({
+            'success': True,
+            'message': run['reason'] if run['status'] == 'skipped' else f"Job #{run['job_id']} queued",
+            'run': run
+        })
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
+
+@bp.route('/api/schedules/<int:schedule_id>/runs', methods=['GET'])
+def get_schedule_runs(schedule_id):
+    """
+    Lauf-Historie eines Schedules (neueste zuerst)
+    Query params:
+      - limit=50: max Anzahl
+    """
+    try:
+        limit = int(request.args.get('limit', 50))
+        runs = ScheduleRun.query.filter_by(schedule_id=schedule_id) \
+            .order_by(ScheduleRun.id.desc()).limit(limit).all()
+        return jsonify({
+            'success': True,
+            'runs': [run.to_dict() for run in runs]
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
+
+@bp.route('/api/frontier', methods=['GET'])
+def get_frontier_status():
+    """
+    Get crawl frontier summary (URLs per state)
+    Query params:
+      - scope=moviles: nur dieser Bereich (Standard: alle)
+    """
+    try:
+        return jsonify({
+            'success': True,
+            'frontier': CrawlFrontier(scope=request.args.get('scope')).summary()
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
+
+@bp.route('/api/frontier/clear', methods=['POST'])
+def clear_frontier():
+    """Clear crawl frontier so the next run starts from the homepage"""
+    scope = request.args.get('scope')
+    active_scopes = {job.scope for job in JobQueue.active_jobs('scrape')}
+    if active_scopes and (scope is None or scope in active_scopes):
+        return jsonify({
+            'success': False,
+            'message': 'Scraping is running'
+        }), 400
+
+    try:
+        count = CrawlFrontier(scope=scope).clear()
+        return jsonify({
+            'success': True,
+            'message': f'Deleted {count} frontier entries'
+        })
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
+
+@bp.route('/api/customers', methods=['GET'])
+@bp.route('/api/listings', methods=['GET'])
+@conditional_collection(CollectionVersion.listings)
 def get_customers():
     """Get all listings (with phone numbers for WhatsApp)"""
     try:
@@ -935,7 +1359,7 @@ def get_customers():
                 # Override specific fields for frontend compatibility
                 'phone_number': phone,  # Frontend expects singular phone_number
                 'contacted': l.whatsapp_contacted,  # Frontend expects 'contacted'
-                'contacted_at': l.whatsapp_contacted_at.isoformat() if l.whatsapp_contacted_at else None,
+                'contacted_at': l.whatsapp_contacted_at,
                 'notes': l.whatsapp_notes,
                 'source_title': l.title,  # Frontend expects source_title
                 'source_url': l.url,  # Frontend expects source_url
@@ -955,18 +1379,60 @@ def get_customers():
             'message': str(e)
         }), 500
 
-@app.route('/api/customers/<int:customer_id>/contact', methods=['POST'])
-@app.route('/api/listings/<int:customer_id>/contact', methods=['POST'])
+@bp.route('/api/stats', methods=['GET'])
+def get_stats():
+    """
+    Dashboard statistics from the listing_stats rollups (no scan of scraped_listings):
+    totals, contacted/pending, exported/unexported, per category, currency and day
+    """
+    try:
+        return jsonify({'success': True, **ListingStats.summary()})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/api/listings/search', methods=['GET'])
+def search_listings():
+    """
+    Full-text search over listing titles and descriptions
+    Query params:
+      - q: search words (all must match, prefix match)
+      - limit=20: page size (max 100)
+      - cursor: next_cursor of the previous page
+    """
+    try:
+        limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+        page = ListingSearch.search(request.args.get('q', ''), limit=limit, cursor=request.args.get('cursor'))
+
+        return jsonify({
+            'success': True,
+            'count': len(page['results']),
+            'next_cursor': page['next_cursor'],
+            'listings': [{
+                **listing.to_dict(),
+                'score': -score,
+                'snippet': snippet,
+            } for listing, score, snippet in page['results']]
+        })
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/api/customers/<int:customer_id>/contact', methods=['POST'])
+@bp.route('/api/listings/<int:customer_id>/contact', methods=['POST'])
 def mark_customer_contacted(customer_id):
     """Mark listing as contacted via WhatsApp"""
     try:
         listing = ScrapedListing.query.get_or_404(customer_id)
         data = request.get_json()
 
+        stats_before = ListingStats.keys(listing)
         listing.whatsapp_contacted = True
         listing.whatsapp_contacted_at = datetime.utcnow()
         listing.whatsapp_notes = data.get('notes', '')
         listing.whatsapp_status = data.get('status', 'sent')
+        ListingStats.move(stats_before, listing)
+        ChangeFeed.listing(LISTING_STATUS_CHANGED, listing)
 
         db.session.commit()
 
@@ -980,12 +1446,14 @@ def mark_customer_contacted(customer_id):
             'error': str(e)
         }), 500
 
-@app.route('/api/customers/clear', methods=['POST'])
-@app.route('/api/listings/clear', methods=['POST'])
+@bp.route('/api/customers/clear', methods=['POST'])
+@bp.route('/api/listings/clear', methods=['POST'])
 def clear_customers():
     """Clear all listings and related data from database"""
     try:
-        # Delete scraped listings
+        # Delete phone index, stats and scraped listings
+        ListingPhone.query.delete()
+        ListingStats.clear()
         listings_count = ScrapedListing.query.delete()
 
         # Delete image proxy mappings
@@ -997,6 +1465,7 @@ def clear_customers():
         except:
             customers_count = 0
 
+        ChangeFeed.record(LISTINGS_CLEARED)
         db.session.commit()
 
         return jsonify({
@@ -1010,13 +1479,13 @@ def clear_customers():
             'error': str(e)
         }), 500
 
-@app.route('/api/results')
+@bp.route('/api/results')
 def get_results():
-    """Get scraping results"""
-    global scraping_results
-    return jsonify(scraping_results)
+    """Get scraping results (Ergebnis des zuletzt abgeschlossenen Jobs)"""
+    job = JobQueue.latest_finished()
+    return jsonify(job.result or {} if job else {})
 
-@app.route('/download/results')
+@bp.route('/download/results')
 def download_results():
     """Download results as JSON"""
     results_file = 'revolico_data.json'
@@ -1039,13 +1508,15 @@ def handle_disconnect():
 # RICO-CUBA INTEGRATION API ENDPOINTS
 # ============================================================================
 
-@app.route('/api/scraped-listings', methods=['GET'])
+@bp.route('/api/scraped-listings', methods=['GET'])
+@conditional_collection(CollectionVersion.listings)
 def get_scraped_listings():
     """
     API Endpoint für Rico-Cuba zum Abrufen aller gescrapten Listings
     Query params:
       - exported=false: nur nicht-exportierte
       - limit=50: max Anzahl
+    Jedes Listing enthält rico_category (Rico-Cuba Kategorie aus category_mapping)
     """
     try:
         # Get query parameters
@@ -1060,11 +1531,13 @@ def get_scraped_listings():
 
         # Get listings
         listings = query.order_by(ScrapedListing.created_at.desc()).limit(limit).all()
+        rico_categories = map_categories([listing.category for listing in listings])
 
         return jsonify({
             'success': True,
             'count': len(listings),
-            'listings': [listing.to_dict() for listing in listings]
+            'listings': [{**listing.to_dict(), 'rico_category': rico_category}
+                         for listing, rico_category in zip(listings, rico_categories)]
         }), 200
 
     except Exception as e:
@@ -1074,7 +1547,7 @@ def get_scraped_listings():
         }), 500
 
 
-@app.route('/api/scraped-listings/<int:listing_id>/mark-exported', methods=['POST'])
+@bp.route('/api/scraped-listings/<int:listing_id>/mark-exported', methods=['POST'])
 def mark_listing_exported(listing_id):
     """Markiert ein Listing als exportiert"""
     try:
@@ -1082,8 +1555,11 @@ def mark_listing_exported(listing_id):
         if not listing:
             return jsonify({'success': False, 'error': 'Listing not found'}), 404
 
+        stats_before = ListingStats.keys(listing)
         listing.exported = True
         listing.exported_at = datetime.utcnow()
+        ListingStats.move(stats_before, listing)
+        ChangeFeed.listing(LISTING_STATUS_CHANGED, listing)
         db.session.commit()
 
         return jsonify({'success': True}), 200
@@ -1093,7 +1569,7 @@ def mark_listing_exported(listing_id):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
-@app.route('/api/image-proxy/<image_hash>', methods=['GET'])
+@bp.route('/api/image-proxy/<image_hash>', methods=['GET'])
 def image_proxy(image_hash):
     """
     Image Proxy Endpoint - gibt Bild zurück ohne URL zu exposen
@@ -1116,58 +1592,110 @@ def image_proxy(image_hash):
                 mimetype = 'image/jpeg'
             return send_file(proxy.cache_path, mimetype=mimetype, as_attachment=False)
 
-        original_url = proxy.original_url
-
-        # Prepare browser-like headers to bypass hotlinking protection
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0',
-            'Accept': 'image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Sec-Fetch-Dest': 'image',
-            'Sec-Fetch-Mode': 'no-cors',
-            'Sec-Fetch-Site': 'cross-site',
-        }
-
-        # Add domain-specific referer for hotlinking protection
-        if 'lh3.googleusercontent.com' in original_url:
-            headers['Referer'] = 'https://www.google.com/'
-        elif 'revolico.com' in original_url:
-            headers['Referer'] = 'https://www.revolico.com/'
-
-        # Fetch image from Revolico/Google with headers
-        response = requests.get(original_url, headers=headers, timeout=10)
-
-        if response.status_code != 200:
-            # Return 1x1 transparent PNG as fallback (instead of 500 error)
-            # This prevents broken image icons in the UI
-            import base64
-            transparent_png = base64.b64decode('iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg==')
-            return transparent_png, 200, {
-                'Content-Type': 'image/png',
-                'Cache-Control': 'public, max-age=3600'  # Cache for 1h (shorter since it's fallback)
-            }
+        # Negativ-Cache: tote URLs/Hosts nicht bei jedem Request erneut abrufen
+        blocked = ImageBackoff.blocked_for(proxy)
+        if blocked:
+            return placeholder_image(max_age=min(blocked, 3600))
 
-        # Return image with proper content type
-        content_type = response.headers.get('Content-Type', 'image/jpeg')
+        # Cache-Miss: gepoolter Upstream-Download, parallel in den Cache geschrieben
+        # und gestreamt; gleichzeitige Requests für denselben Hash teilen sich den Download
+        flight = image_fetcher.fetch(current_app._get_current_object(), proxy.image_hash, proxy.original_url)
+        if not flight.wait_ready() or not flight.ok or flight.error:
+            return placeholder_image()
 
-        return response.content, 200, {
-            'Content-Type': content_type,
+        # stream() wirft FlightFailed, wenn der Download inzwischen gescheitert ist (-> Platzhalter);
+        # ein Abbruch mitten im Body bricht die Verbindung ab, das halbe Bild wird nicht gecacht
+        return Response(flight.stream(), mimetype=flight.content_type, headers={
             'Cache-Control': 'public, max-age=86400'  # Cache for 24h
-        }
+        })
 
     except Exception as e:
-        # Return 1x1 transparent PNG as fallback on error
-        import base64
-        transparent_png = base64.b64decode('iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg==')
-        return transparent_png, 200, {
-            'Content-Type': 'image/png',
-            'Cache-Control': 'public, max-age=3600'
-        }
+        return placeholder_image()
+
+
+def placeholder_image(max_age=3600):
+    """1x1 transparentes PNG statt eines Fehlers (verhindert kaputte Bild-Icons in der UI)"""
+    return PLACEHOLDER_PNG, 200, {
+        'Content-Type': 'image/png',
+        # Kürzer als echte Bilder; während eines Retry-Fensters nur bis zu dessen Ende
+        'Cache-Control': f'public, max-age={max_age}'
+    }
+
+
+def create_app(config=None):
+    """
+    Application Factory
+
+    Args:
+        config: optionale Config-Overrides (z.B. SQLALCHEMY_DATABASE_URI,
+                SCRAPE_WORKER_MODE, WHATSAPP_RESTORE_MODE)
+    """
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    app.config['SECRET_KEY'] = 'revolico_scraper_secret_key'
+    # DATABASE_URL erlaubt eine andere DB (z.B. Postgres oder eine Benchmark-DB)
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///revolico_customers.db')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    # Restore previously logged-in WhatsApp sessions in the background so the
+    # server binds immediately. WHATSAPP_RESTORE_MODE=lazy restores only on demand.
+    app.config['WHATSAPP_RESTORE_MODE'] = os.environ.get('WHATSAPP_RESTORE_MODE', 'background').lower()
+    app.config['WHATSAPP_RESTORE_WORKERS'] = int(os.environ.get('WHATSAPP_RESTORE_WORKERS', '2'))
+
+    # Scraping-Jobs: 'embedded' = Worker-Threads in diesem Prozess,
+    # 'external' = separate `python scrape_worker.py` Prozesse (Events per DB-Relay),
+    # 'off' = Jobs werden nur angelegt (Tests/Benchmarks)
+    app.config['SCRAPE_WORKER_MODE'] = os.environ.get('SCRAPE_WORKER_MODE', 'embedded').lower()
+    app.config['SCRAPE_WORKERS'] = int(os.environ.get('SCRAPE_WORKERS', '1'))
+    # Max. gleichzeitig laufende Jobs über alle Worker/Prozesse (0 = unbegrenzt)
+    app.config['SCRAPE_MAX_RUNNING'] = int(os.environ.get('SCRAPE_MAX_RUNNING', '0'))
+    # Wiederkehrende Crawls aus scrape_schedules (SCHEDULER_ENABLED=0 z.B. wenn
+    # `python scheduler.py` separat läuft)
+    app.config['SCHEDULER_ENABLED'] = os.environ.get('SCHEDULER_ENABLED', '1') == '1'
+    app.config['SCHEDULER_TICK_INTERVAL'] = float(os.environ.get('SCHEDULER_TICK_INTERVAL', '30'))
+    # Abstand, in dem neue change_events an die Clients gehen
+    app.config['CHANGE_RELAY_INTERVAL'] = float(os.environ.get('CHANGE_RELAY_INTERVAL', '0.5'))
+    # Brotli/gzip ab dieser Größe (Bytes), COMPRESS_ENABLED=0 z.B. hinter einem komprimierenden Proxy
+    app.config['COMPRESS_ENABLED'] = os.environ.get('COMPRESS_ENABLED', '1') == '1'
+    app.config['COMPRESS_MIN_SIZE'] = int(os.environ.get('COMPRESS_MIN_SIZE', '500'))
+
+    app.config.update(config or {})
+
+    # Datenbank initialisieren
+    init_database(app)
+    socketio.init_app(app)
+    app.register_blueprint(bp)
+    init_compression(app)
+
+    if app.config['WHATSAPP_RESTORE_MODE'] == 'background':
+        wa_manager.start_background_restore(app, max_workers=app.config['WHATSAPP_RESTORE_WORKERS'])
+
+    if app.config['SCRAPE_WORKER_MODE'] == 'embedded':
+        from scrape_worker import ScrapeWorker
+
+        for _ in range(app.config['SCRAPE_WORKERS']):
+            ScrapeWorker(
+                app,
+                publish=lambda job_id, event, payload: dispatch_job_event(event, payload),
+                max_running=app.config['SCRAPE_MAX_RUNNING']
+            ).start()
+    elif app.config['SCRAPE_WORKER_MODE'] == 'external':
+        socketio.start_background_task(relay_job_events, app)
+
+    # Listing-/Account-Änderungen als versionierte Push-Events ('change')
+    socketio.start_background_task(relay_changes, app, interval=app.config['CHANGE_RELAY_INTERVAL'])
+
+    if app.config['SCHEDULER_ENABLED']:
+        Scheduler(app, tick_interval=app.config['SCHEDULER_TICK_INTERVAL'],
+                  on_job=publish_scheduled_job).start()
+
+    return app
+
 
 if __name__ == '__main__':
+    # Nur beim direkten Start - ein Import (Tests, Benchmarks, Tools) startet keine Worker/Threads.
+    # Für WSGI-Server: wsgi:app
+    app = create_app()
     print("\n✅ Datenbank-Tabellen erstellt/aktualisiert")
     print("=" * 60)
     print("REVOLICO SCRAPER + WHATSAPP AUTOMATION")
@@ -0,0 +1,171 @@
+"""
+DOM Extract Benchmark
+Vergleicht WebDriver-Round-Trips und Zeit pro Seite: Einzelzugriffe pro
+Element (bisheriger Stil: find_elements, get_attribute, .text) gegen das
+JavaScript-Bündel aus dom_extract (ein execute_script pro Seite).
+Läuft mit echtem Firefox gegen ein abgespieltes Fixture-Archiv.
+
+Verwendung:
+    python benchmarks/bench_dom_extract.py                        # Archiv aus debug_page_*.html
+    python benchmarks/bench_dom_extract.py --archive fixtures/revolico.tar.gz --repeat 5
+    python benchmarks/bench_dom_extract.py --json dom_extract.json
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from common import percentile
+
+from selenium.webdriver.common.by import By
+
+from bench_pipeline import build_archive_from_dumps
+from dom_extract import (AVATAR_SELECTORS, BREADCRUMB_SELECTORS, ITEM_LINK_SELECTORS, PROFILE_SELECTORS,
+                         collect_links, collect_listing)
+from firefox_setup import launch_firefox, remove_session_profile
+from fixtures import FixtureArchive, ReplayServer, fixture_key
+
+
+class CountingDriver:
+    """Zählt alle WebDriver-Kommandos (auch die von WebElements) eines Drivers"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.commands = 0
+        original = driver.execute
+
+        def execute(command, params=None):
+            self.commands += 1
+            return original(command, params)
+
+        driver.execute = execute
+
+    def measure(self, fn):
+        """Returns: (Round-Trips, Sekunden)"""
+        before = self.commands
+        start = time.perf_counter()
+        fn(self.driver)
+        return self.commands - before, time.perf_counter() - start
+
+
+def per_element_links(driver):
+    """Link-Suche wie bisher: href und text einzeln pro Element"""
+    links = []
+    for selector in ITEM_LINK_SELECTORS:
+        for element in driver.find_elements(By.CSS_SELECTOR, selector)[:10]:
+            links.append((element.get_attribute('href'), element.text))
+    for element in driver.find_elements(By.TAG_NAME, 'a')[:100]:
+        links.append((element.get_attribute('href'), element.text))
+    return links
+
+
+def per_element_listing(driver):
+    """Detailseite wie bisher: jeder Selektor, jedes Element, jedes Attribut ein Round-Trip"""
+    data = {'url': driver.current_url, 'error': 'Ha ocurrido un error' in driver.page_source,
+            'page_title': driver.title, 'links': [], 'images': []}
+    for selector in PROFILE_SELECTORS:
+        for area in driver.find_elements(By.CSS_SELECTOR, selector):
+            for link in area.find_elements(By.CSS_SELECTOR, 'a[href*="wa.me"], a[href*="whatsapp"]'):
+                data['links'].append(link.get_attribute('href'))
+    for field in ('adTitle', 'adDescription', 'userFullname', 'adPrice', 'adLocation'):
+        elements = driver.find_elements(By.CSS_SELECTOR, f'[data-cy="{field}"]')
+        data[field] = elements[0].text if elements else None
+    for selector in AVATAR_SELECTORS:
+        elements = driver.find_elements(By.CSS_SELECTOR, selector)
+        if elements and elements[0].get_attribute('src'):
+            data['avatar'] = elements[0].get_attribute('src')
+            break
+    for gallery in driver.find_elements(By.CSS_SELECTOR, '[data-cy="adImages"]')[:1]:
+        for slide in gallery.find_elements(By.CSS_SELECTOR, '.swiper-slide'):
+            for img in slide.find_elements(By.CSS_SELECTOR, '.swiper-zoom-container img'):
+                data['images'].append(img.get_attribute('src'))
+            for source in slide.find_elements(By.TAG_NAME, 'source'):
+                data['images'].append(source.get_attribute('srcSet'))
+            for img in slide.find_elements(By.TAG_NAME, 'img')[:1]:
+                data['images'].append(img.get_attribute('src'))
+    for selector in BREADCRUMB_SELECTORS:
+        elements = driver.find_elements(By.CSS_SELECTOR, selector)
+        if elements:
+            data['breadcrumb'] = elements[0].text
+            break
+    data['condition'] = 'nuevo' in driver.page_source.lower()
+    return data
+
+
+# Seitentyp -> (Einzelzugriffe, JS-Bündel); timeout=0: Seite ist bereits geladen
+EXTRACTORS = {
+    'homepage': (per_element_links, collect_links),
+    'listing': (per_element_listing, lambda driver: collect_listing(driver, timeout=0)),
+}
+
+
+def run(archive, repeat=3):
+    """
+    Returns:
+        dict pro Seitentyp (homepage/listing) und Methode: Round-Trips und ms pro Seite (p50/p95)
+    """
+    samples = {}
+
+    def add(page_type, method, commands, seconds):
+        entry = samples.setdefault(page_type, {}).setdefault(method, {'commands': [], 'seconds': []})
+        entry['commands'].append(commands)
+        entry['seconds'].append(seconds)
+
+    driver = launch_firefox(['--headless'], session=True, name='benchmark')
+    counter = CountingDriver(driver)
+    try:
+        with ReplayServer(archive) as server:
+            pages = [('homepage', '/')] if archive.get('/') else []
+            pages += [('listing', fixture_key(url)) for url in archive.listing_urls()]
+
+            for page_type, path in pages:
+                driver.get(server.url_for(path))
+                per_element, bundle = EXTRACTORS[page_type]
+                for _ in range(repeat):
+                    add(page_type, 'per_element', *counter.measure(per_element))
+                    add(page_type, 'bundle', *counter.measure(bundle))
+    finally:
+        driver.quit()
+        remove_session_profile(driver)
+
+    return {
+        page_type: {
+            method: {
+                'pages': len(values['commands']) // repeat,
+                'round_trips_p50': percentile(values['commands'], 50),
+                'ms_p50': round(percentile(values['seconds'], 50) * 1000, 2),
+                'ms_p95': round(percentile(values['seconds'], 95) * 1000, 2),
+            }
+            for method, values in methods.items()
+        }
+        for page_type, methods in samples.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WebDriver round-trip benchmark: per-element access vs. JS bundle')
+    parser.add_argument('--archive', help='Fixture archive (default: built from debug_page_*.html)')
+    parser.add_argument('--repeat', type=int, default=3, help='Measurements per page and method')
+    parser.add_argument('--json', dest='json_path', help='Write results to this file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive_path = args.archive or build_archive_from_dumps(os.path.join(tmp, 'fixtures.tar.gz'))
+        archive = FixtureArchive.load(archive_path)
+
+    results = run(archive, repeat=args.repeat)
+
+    for page_type, methods in results.items():
+        print(f"📄 {page_type} ({methods['bundle']['pages']} pages)")
+        for method, stats in methods.items():
+            print(f"   {method:<12} {stats['round_trips_p50']:>5} round-trips   "
+                  f"p50 {stats['ms_p50']:>9.2f} ms   p95 {stats['ms_p95']:>9.2f} ms")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
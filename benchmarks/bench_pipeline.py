@@ -0,0 +1,161 @@
+"""
+Pipeline Benchmark
+Misst die komplette Kette Discovery -> Fetch -> Parse -> Persist gegen ein
+abgespieltes Fixture-Archiv (lokaler Replay-Server, feste Eingaben).
+
+Verwendung:
+    python benchmarks/bench_pipeline.py                        # Archiv aus debug_page_*.html
+    python benchmarks/bench_pipeline.py --archive fixtures/revolico.tar.gz --latency 0.05
+    python benchmarks/bench_pipeline.py --repeat 20 --json results.json
+"""
+import argparse
+import glob
+import json
+import os
+import tempfile
+import time
+
+from common import ROOT, percentile
+
+import requests
+from bs4 import BeautifulSoup
+from flask import Flask
+
+from fixtures import FixtureArchive, FixtureRecorder, ReplayServer, fixture_key
+from listing_parser import parse_listing_page
+from listing_store import save_scraped_listing
+from models import db
+
+
+def build_archive_from_dumps(path):
+    """Erzeugt ein Archiv aus den im Repo liegenden HTML-Dumps"""
+    recorder = FixtureRecorder(source='html-dumps')
+    for dump in sorted(glob.glob(os.path.join(ROOT, 'debug_page_*.html'))) + \
+            glob.glob(os.path.join(ROOT, 'homepage_debug.html')):
+        recorder.import_html_dump(dump)
+    recorder.save(path)
+    return path
+
+
+def create_bench_app(db_path):
+    """Eigenständige Flask App mit leerer SQLite DB für den Persist-Schritt"""
+    bench_app = Flask(__name__)
+    bench_app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+    bench_app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(bench_app)
+    with bench_app.app_context():
+        db.create_all()
+    return bench_app
+
+
+def discover(session, server, archive):
+    """
+    Liest die Listing-Links von der (abgespielten) Startseite
+    Enthält das Archiv keine dazu passenden Detailseiten (z.B. bei importierten
+    Einzel-Dumps), werden alle archivierten Detailseiten verwendet
+    """
+    response = session.get(server.url_for('/'), timeout=10)
+    urls = []
+    if response.status_code == 200:
+        soup = BeautifulSoup(response.text, 'html.parser')
+        for link in soup.select('a[href*="/item/"]'):
+            href = link.get('href') or ''
+            if '/item/publish' in href:
+                continue
+            if archive.get(href) and href not in urls:
+                urls.append(href)
+    return urls or [fixture_key(url) for url in archive.listing_urls()]
+
+
+def run_pipeline(archive, latency=0.0, repeat=1):
+    """
+    Führt die Pipeline gegen das Archiv aus
+
+    Returns:
+        dict mit Anzahl, Dauer, listings/sec und Latenzen (p50/p95) pro Schritt
+    """
+    timings = {'fetch': [], 'parse': [], 'persist': []}
+    outcomes = {'created': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0, 'gone': 0, 'errors': 0}
+
+    with tempfile.TemporaryDirectory() as tmp, ReplayServer(archive, latency=latency) as server:
+        bench_app = create_bench_app(os.path.join(tmp, 'bench.db'))
+        session = requests.Session()
+
+        start = time.perf_counter()
+        discovery_start = time.perf_counter()
+        urls = discover(session, server, archive)
+        discovery_time = time.perf_counter() - discovery_start
+
+        with bench_app.app_context():
+            for _ in range(repeat):
+                for path in urls:
+                    t0 = time.perf_counter()
+                    response = session.get(server.url_for(path), timeout=10)
+                    t1 = time.perf_counter()
+                    timings['fetch'].append(t1 - t0)
+                    if response.status_code != 200:
+                        outcomes['errors'] += 1
+                        continue
+
+                    data = parse_listing_page(response.text, archive.get(path)['url'])
+                    t2 = time.perf_counter()
+                    timings['parse'].append(t2 - t1)
+                    if not data:
+                        outcomes['errors'] += 1
+                        continue
+                    if data.get('gone'):
+                        outcomes['gone'] += 1
+                        continue
+
+                    outcomes[save_scraped_listing(data)] += 1
+                    timings['persist'].append(time.perf_counter() - t2)
+
+        total = time.perf_counter() - start
+
+    processed = len(timings['fetch'])
+    return {
+        'archive_version': archive.manifest['version'],
+        'archive_source': archive.manifest.get('source'),
+        'listings': processed,
+        'outcomes': outcomes,
+        'discovery_seconds': round(discovery_time, 4),
+        'total_seconds': round(total, 4),
+        'listings_per_sec': round(processed / total, 2) if total else 0.0,
+        'latency_ms': {
+            step: {
+                'p50': round(percentile(values, 50) * 1000, 3),
+                'p95': round(percentile(values, 95) * 1000, 3),
+            }
+            for step, values in timings.items()
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end scraping pipeline benchmark')
+    parser.add_argument('--archive', help='Fixture archive (default: built from debug_page_*.html)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Simulated server latency per request (s)')
+    parser.add_argument('--repeat', type=int, default=5, help='Passes over the discovered listings')
+    parser.add_argument('--json', dest='json_path', help='Write results to this file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive_path = args.archive or build_archive_from_dumps(os.path.join(tmp, 'fixtures.tar.gz'))
+        archive = FixtureArchive.load(archive_path)
+
+    results = run_pipeline(archive, latency=args.latency, repeat=args.repeat)
+
+    print(f"📦 Archive v{results['archive_version']} ({results['archive_source']}), {len(archive.pages)} pages")
+    print(f"⏱️  {results['listings']} listings in {results['total_seconds']}s "
+          f"= {results['listings_per_sec']} listings/sec")
+    for step, latency in results['latency_ms'].items():
+        print(f"   {step:<8} p50 {latency['p50']:>9.3f} ms   p95 {latency['p95']:>9.3f} ms")
+    print(f"   outcomes: {results['outcomes']}")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Gemeinsame Helfer für die Benchmarks (Pfad-Setup, Zeitmessung, synthetische Daten)
+"""
+import glob
+import math
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def percentile(values, pct):
+    """Perzentil (nearest-rank) einer Werteliste"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def measure(fn, repeat=5, warmup=1):
+    """
+    Führt fn mehrfach aus und misst die Laufzeit
+
+    Returns:
+        dict mit seconds (Median), p95, min und runs
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        'seconds': round(percentile(samples, 50), 6),
+        'p95': round(percentile(samples, 95), 6),
+        'min': round(min(samples), 6),
+        'runs': repeat,
+    }
+
+
+def saved_html_pages():
+    """Die im Repo gespeicherten HTML-Seiten (debug_page_*.html, homepage_debug.html)"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(ROOT, 'debug_page_*.html'))) + \
+            glob.glob(os.path.join(ROOT, 'homepage_debug.html')):
+        with open(path, encoding='utf-8') as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def synthetic_listing(i):
+    """Deterministisches synthetisches Scraping-Ergebnis"""
+    return {
+        'revolico_id': str(40000000 + i),
+        'url': f'https://www.revolico.com/item/synthetic-listing-{40000000 + i}',
+        'title': f'Synthetic listing {i} - iPhone {i % 15} Pro nuevo en caja',
+        'description': f'Descripción de prueba número {i}. ' * 8,
+        'price': float(50 + (i % 500)),
+        'currency': 'USD',
+        'phone_numbers': [f'+535{i % 10000000:07d}'],
+        'seller_name': f'Vendedor {i % 977}',
+        'images': [f'https://pic.revolico.com/synthetic/{i}_{n}_high.jpg' for n in range(3)],
+        'category': 'Celulares',
+        'location': 'Plaza, La Habana',
+        'condition': 'used',
+    }
@@ -0,0 +1,291 @@
+"""
+Benchmark Suite mit Regressions-Gate
+Misst die Ingestion-Pipeline auf synthetischen Daten und den gespeicherten
+HTML-Seiten, schreibt die Ergebnisse als JSON und vergleicht sie mit einer
+gespeicherten Baseline. Langsamer als Baseline * (1 + Toleranz) -> Exit-Code 1.
+
+Verwendung:
+    python benchmarks/run_benchmarks.py                       # Vergleich mit benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --sizes 1000 --tolerance 0.5
+    python benchmarks/run_benchmarks.py --update-baseline     # neue Baseline speichern
+"""
+import argparse
+import atexit
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+
+from common import ROOT, measure, saved_html_pages, synthetic_listing
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+DEFAULT_OUTPUT = os.path.join(ROOT, 'benchmarks', 'results.json')
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+# Eigene Wegwerf-DB, bevor app.py importiert wird
+TMP_DIR = tempfile.mkdtemp(prefix='revolico_bench_')
+atexit.register(shutil.rmtree, TMP_DIR, ignore_errors=True)
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(TMP_DIR, 'bench.db')}")
+os.environ.setdefault('SCRAPE_WORKER_MODE', 'off')
+os.environ.setdefault('WHATSAPP_RESTORE_MODE', 'lazy')
+os.environ.setdefault('SCHEDULER_ENABLED', '0')
+
+
+def bench_phone_extractor():
+    from phone_parser import PhoneNumberParser
+
+    parser = PhoneNumberParser()
+    pages = saved_html_pages()
+    return {'phone_extractor.saved_pages': measure(
+        lambda: [parser.extract_phone_numbers(html) for _, html in pages], repeat=5
+    )}
+
+
+def bench_listing_parser():
+    from listing_parser import parse_listing_page
+
+    pages = saved_html_pages()
+    return {'listing_parser.saved_pages_x20': measure(
+        lambda: [parse_listing_page(html) for _ in range(20) for _, html in pages], repeat=5
+    )}
+
+
+def bench_image_proxy_batching(app):
+    from image_service import ImageProxyService
+    from models import db, ImageProxy
+
+    urls = [f'https://pic.revolico.com/bench/{n}_high.jpg' for n in range(300)]
+
+    def create():
+        ImageProxy.query.delete()
+        db.session.commit()
+        ImageProxyService.process_image_urls(urls)
+
+    with app.app_context():
+        results = {'image_proxy.process_300_new': measure(create, repeat=3)}
+        results['image_proxy.process_300_existing'] = measure(
+            lambda: ImageProxyService.process_image_urls(urls), repeat=5
+        )
+    return results
+
+
+def bench_upsert(app):
+    from listing_store import save_scraped_listing
+    from models import db, ScrapedListing, ListingPhone, ListingStat, ImageProxy
+
+    listings = [synthetic_listing(i) for i in range(200)]
+
+    def reset():
+        ListingPhone.query.delete()
+        ListingStat.query.delete()
+        ScrapedListing.query.delete()
+        ImageProxy.query.delete()
+        db.session.commit()
+
+    def insert_all():
+        reset()
+        for listing in listings:
+            save_scraped_listing(listing)
+
+    with app.app_context():
+        results = {'upsert.create_200': measure(insert_all, repeat=3)}
+        results['upsert.unchanged_200'] = measure(
+            lambda: [save_scraped_listing(listing) for listing in listings], repeat=3
+        )
+        reset()
+    return results
+
+
+def seed_listings(app, count):
+    """Füllt scraped_listings per Bulk-Insert mit `count` synthetischen Zeilen"""
+    from models import db, ScrapedListing, ListingPhone
+    from listing_stats import ListingStats
+    from phone_index import PhoneIndex
+
+    with app.app_context():
+        ListingPhone.query.delete()
+        ScrapedListing.query.delete()
+        rows = []
+        for i in range(count):
+            data = synthetic_listing(i)
+            rows.append({
+                'revolico_id': data['revolico_id'],
+                'title': data['title'],
+                'description': data['description'],
+                'url': data['url'],
+                'price': data['price'],
+                'currency': data['currency'],
+                'phone_numbers': data['phone_numbers'],
+                'seller_name': data['seller_name'],
+                'image_ids': [],
+                'category': data['category'],
+                'location': data['location'],
+                'condition': data['condition'],
+                'exported': i % 3 == 0,
+                'whatsapp_contacted': i % 4 == 0,
+                'created_at': datetime(2024, 1, 1),
+                'scraped_at': datetime(2024, 1, 1),
+                'updated_at': datetime(2024, 1, 1),
+            })
+            if len(rows) == 5000:
+                db.session.execute(ScrapedListing.__table__.insert(), rows)
+                rows = []
+        if rows:
+            db.session.execute(ScrapedListing.__table__.insert(), rows)
+        db.session.commit()
+        PhoneIndex.backfill()
+        ListingStats.rebuild()
+
+
+def bench_api_listings(app, sizes):
+    client = app.test_client()
+    results = {}
+
+    def get(path, times=1):
+        for _ in range(times):
+            response = client.get(path)
+            assert response.status_code == 200, response.status_code
+
+    for size in sizes:
+        seed_listings(app, size)
+        repeat = 5 if size <= 10000 else 1
+        results[f'api.customers.{size}'] = measure(lambda: get('/api/customers'), repeat=repeat)
+        results[f'api.customers_br.{size}'] = measure(
+            lambda: client.get('/api/customers', headers={'Accept-Encoding': 'br'}).get_data(), repeat=repeat
+        )
+        etag = client.get('/api/customers').headers['ETag']
+        results[f'api.customers_not_modified_x10.{size}'] = measure(
+            lambda: [client.get('/api/customers', headers={'If-None-Match': etag}) for _ in range(10)],
+            repeat=repeat
+        )
+        results[f'api.scraped_listings_x10.{size}'] = measure(
+            lambda: get('/api/scraped-listings?limit=100', times=10), repeat=repeat
+        )
+        results[f'api.scraped_listings_unexported.{size}'] = measure(
+            lambda: get('/api/scraped-listings?exported=false&limit=1000'), repeat=repeat
+        )
+        results[f'api.whatsapp_uncontacted.{size}'] = measure(lambda: get('/api/whatsapp/uncontacted'), repeat=repeat)
+        results[f'api.sellers.{size}'] = measure(lambda: get('/api/sellers?limit=100'), repeat=repeat)
+        results[f'api.stats.{size}'] = measure(lambda: get('/api/stats', times=10), repeat=repeat)
+    seed_listings(app, 0)
+    return results
+
+
+def bench_image_proxy_hit(app):
+    from models import db, ImageProxy
+    from image_service import ImageProxyService
+
+    cache_path = os.path.join(TMP_DIR, 'bench_image.jpg')
+    with open(cache_path, 'wb') as f:
+        f.write(b'\xff\xd8\xff\xe0' + os.urandom(40 * 1024))
+
+    url = 'https://pic.revolico.com/bench/cached_high.jpg'
+    image_hash = ImageProxyService.create_hash(url)
+    with app.app_context():
+        ImageProxy.query.filter_by(image_hash=image_hash).delete()
+        db.session.add(ImageProxy(image_hash=image_hash, original_url=url, cached=True, cache_path=cache_path))
+        db.session.commit()
+
+    client = app.test_client()
+
+    def hit_100():
+        for _ in range(100):
+            response = client.get(f'/api/image-proxy/{image_hash}')
+            assert response.status_code == 200
+            response.close()
+
+    return {'image_proxy.cached_hit_100': measure(hit_100, repeat=5)}
+
+
+def run_all(sizes):
+    from app import create_app
+
+    flask_app = create_app()
+    results = {}
+    results.update(bench_phone_extractor())
+    results.update(bench_listing_parser())
+    results.update(bench_image_proxy_batching(flask_app))
+    results.update(bench_upsert(flask_app))
+    results.update(bench_api_listings(flask_app, sizes))
+    results.update(bench_image_proxy_hit(flask_app))
+    return results
+
+
+def compare(results, baseline, tolerance, min_delta):
+    """
+    Vergleicht Ergebnisse mit der Baseline
+    Regression = langsamer als Baseline * (1 + tolerance) UND mehr als min_delta Sekunden
+    (kleine Messungen schwanken relativ stark)
+
+    Returns:
+        Liste von (name, baseline_seconds, current_seconds, ratio) für Regressionen
+    """
+    regressions = []
+    for name, reference in baseline.get('results', {}).items():
+        current = results.get(name)
+        if current is None:
+            continue
+        ratio = current['seconds'] / reference['seconds'] if reference['seconds'] else 1.0
+        slower = current['seconds'] - reference['seconds']
+        status = 'REGRESSION' if ratio > 1 + tolerance and slower > min_delta else 'ok'
+        print(f"   {name:<42} {reference['seconds']:>10.4f}s -> {current['seconds']:>10.4f}s "
+              f"({ratio:>5.2f}x) {status}")
+        if status != 'ok':
+            regressions.append((name, reference['seconds'], current['seconds'], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ingestion pipeline benchmark suite')
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help='Synthetic row counts for the API benchmarks (comma separated)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--tolerance', type=float, default=float(os.environ.get('BENCH_TOLERANCE', '0.25')),
+                        help='Allowed slowdown relative to the baseline (0.25 = 25%%)')
+    parser.add_argument('--min-delta', type=float, default=0.005,
+                        help='Ignore slowdowns smaller than this many seconds (noise floor)')
+    parser.add_argument('--update-baseline', action='store_true', help='Store the results as new baseline')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    results = run_all(sizes)
+
+    report = {
+        'created_at': datetime.utcnow().isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📊 {len(results)} benchmarks written to {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Baseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"⚠️ No baseline at {args.baseline} - run with --update-baseline first")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    print(f"🔍 Comparing against baseline (tolerance {args.tolerance:.0%})")
+    regressions = compare(results, baseline, args.tolerance, args.min_delta)
+    if regressions:
+        print(f"❌ {len(regressions)} performance regression(s)")
+        return 1
+
+    print("✅ No performance regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
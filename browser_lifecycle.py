@@ -0,0 +1,155 @@
+"""
+Browser Lifecycle
+Hält einen Selenium-Driver und startet ihn nach N geladenen Seiten oder ab
+M MB Speicher (RSS von geckodriver + Firefox-Prozessen) neu. Firefox wächst
+bei langen Sessions stetig; regelmäßiges Recycling hält den Speicher flach.
+
+Der Neustart geht über dieselbe launch-Funktion, ein per `-profile`
+übergebenes Profil-Verzeichnis (WhatsApp-Sessions) bleibt also erhalten.
+Die RSS-Messung braucht psutil (optional) - ohne psutil wird nur nach
+Seitenzahl recycelt.
+
+Verwendung:
+    browser = ManagedBrowser(launch_driver, max_pages=200, max_rss_mb=1500)
+    browser.start()
+    browser.driver.get(url)
+    browser.page_loaded()
+    browser.maybe_recycle()   # an einer sicheren Stelle (zwischen zwei Seiten)
+    browser.quit()
+"""
+import logging
+import os
+import time
+
+from metrics import metrics
+
+try:
+    import psutil
+except ImportError:  # optional
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PAGES = int(os.environ.get('BROWSER_MAX_PAGES', '150'))
+DEFAULT_MAX_RSS_MB = int(os.environ.get('BROWSER_MAX_RSS_MB', '1200'))
+
+
+def driver_rss_mb(driver):
+    """
+    Speicherverbrauch (RSS in MB) eines Drivers: geckodriver-Prozess plus alle
+    Kindprozesse (Firefox Parent + Content-Prozesse)
+
+    Returns: MB oder None wenn psutil fehlt bzw. die PID unbekannt ist
+    """
+    if psutil is None or driver is None:
+        return None
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+    except (AttributeError, psutil.Error):
+        return None
+
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            continue  # Content-Prozess gerade beendet
+    return total / (1024 * 1024)
+
+
+class ManagedBrowser:
+    """Selenium-Driver mit Seitenzähler, RSS-Grenze und automatischem Neustart"""
+
+    def __init__(self, launch, max_pages=None, max_rss_mb=None, name='browser', log=None, on_quit=None):
+        """
+        Args:
+            launch: callable() -> WebDriver (wird bei jedem (Neu-)Start aufgerufen)
+            max_pages: Neustart nach so vielen Seiten (0 = nie)
+            max_rss_mb: Neustart ab so viel RSS in MB (0 = nie, braucht psutil)
+            name: Name für Logs und Metriken ('scraper', 'whatsapp', ...)
+            log: Logger mit info/warning (Standard: Modul-Logger)
+            on_quit: optionales callable(driver) nach dem Beenden (z.B. Profil-Kopie löschen)
+        """
+        self.launch = launch
+        self.max_pages = DEFAULT_MAX_PAGES if max_pages is None else max_pages
+        self.max_rss_mb = DEFAULT_MAX_RSS_MB if max_rss_mb is None else max_rss_mb
+        self.name = name
+        self.log = log or logger
+        self.on_quit = on_quit
+        self.driver = None
+        self.pages = 0
+        self.recycles = 0
+        self.started_at = None
+
+        if self.max_rss_mb and psutil is None:
+            self.log.info(f"ℹ️  psutil not installed - {name} browser is recycled by page count only")
+
+    def start(self):
+        """Startet den Driver (falls noch keiner läuft) und gibt ihn zurück"""
+        if self.driver is None:
+            self.driver = self.launch()
+            self.pages = 0
+            self.started_at = time.time()
+        return self.driver
+
+    def quit(self):
+        """Beendet den Driver (Fehler beim Beenden werden nur geloggt)"""
+        driver, self.driver = self.driver, None
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception as e:
+                self.log.warning(f"Error quitting {self.name} driver: {e}")
+            if self.on_quit:
+                self.on_quit(driver)
+
+    def page_loaded(self, count=1):
+        """Zählt geladene Seiten seit dem letzten (Neu-)Start"""
+        self.pages += count
+
+    def rss_mb(self):
+        return driver_rss_mb(self.driver)
+
+    def recycle_reason(self):
+        """Grund für einen Neustart oder None"""
+        if self.driver is None:
+            return None
+        if self.max_pages and self.pages >= self.max_pages:
+            return 'pages'
+        if self.max_rss_mb:
+            rss = self.rss_mb()
+            if rss is not None and rss >= self.max_rss_mb:
+                return 'memory'
+        return None
+
+    def maybe_recycle(self):
+        """
+        Startet den Driver neu, wenn eine Grenze erreicht ist
+        Nur an Stellen aufrufen, an denen kein Seitenzustand mehr gebraucht wird
+
+        Returns: True wenn neu gestartet wurde
+        """
+        reason = self.recycle_reason()
+        if not reason:
+            return False
+
+        rss = self.rss_mb()
+        rss_text = f", {rss:.0f} MB" if rss is not None else ''
+        self.log.info(f"♻️  Recycling {self.name} browser after {self.pages} pages{rss_text} ({reason})")
+        with metrics.timer('browser_recycle_seconds', browser=self.name):
+            self.quit()
+            self.start()
+        self.recycles += 1
+        metrics.inc('browser_recycles_total', browser=self.name, reason=reason)
+        return True
+
+    def stats(self):
+        rss = self.rss_mb()
+        return {
+            'running': self.driver is not None,
+            'pages': self.pages,
+            'recycles': self.recycles,
+            'rss_mb': round(rss, 1) if rss is not None else None,
+            'uptime_seconds': round(time.time() - self.started_at, 1) if self.driver and self.started_at else None,
+        }
@@ -4,12 +4,12 @@ Script to cache existing Revolico profile pictures from database
 """
 import os
 import sys
-from app import app
-from models import db, ImageProxy
+from models import db, ImageProxy, create_db_app
 from image_service import ImageProxyService
 
 def cache_existing_profiles():
     """Cache all uncached Revolico profile pictures"""
+    app = create_db_app()
     with app.app_context():
         # Find all Revolico profile pictures that are not cached
         revolico_profiles = ImageProxy.query.filter(
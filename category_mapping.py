@@ -1,7 +1,15 @@
 """
 Category Mapping: Revolico -> Rico-Cuba
 Mappt Revolico Kategorien auf Rico-Cuba Kategorien
+
+Alle Keywords stecken in einem einmal kompilierten Regex, der in einem
+Durchlauf jede Fundstelle liefert. Eingaben werden vorher akzentfrei
+kleingeschrieben ('Telefonía' -> 'telefonia'). Bei mehreren Treffern gewinnt
+das längste (spezifischste) Keyword, dann das frühere im Text - unabhängig
+von der Reihenfolge in CATEGORY_MAPPINGS.
 """
+import re
+import unicodedata
 
 # Kategorie-Mapping basierend auf Keywords und Patterns
 CATEGORY_MAPPINGS = {
@@ -166,6 +174,28 @@ CATEGORY_MAPPINGS = {
 # Default category wenn kein Match gefunden wird
 DEFAULT_CATEGORY = 'Otros'
 
+
+def fold(text):
+    """Kleinschreibung ohne Akzente/Tilden ('Diseño Gráfico' -> 'diseno grafico')"""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+_KEYWORDS = {fold(keyword): rico_category for keyword, rico_category in CATEGORY_MAPPINGS.items()}
+
+# Lookahead findet an jeder Position das längste passende Keyword (auch überlappende Treffer)
+_KEYWORD_PATTERN = re.compile(
+    '(?=(' + '|'.join(re.escape(k) for k in sorted(_KEYWORDS, key=len, reverse=True)) + '))'
+)
+
+
+def _ranked_keywords(revolico_category):
+    """Alle Keyword-Treffer, spezifischste zuerst (längstes Keyword, dann Position im Text)"""
+    hits = [(match.group(1), match.start()) for match in _KEYWORD_PATTERN.finditer(fold(revolico_category))]
+    hits.sort(key=lambda hit: (-len(hit[0]), hit[1]))
+    return [keyword for keyword, _ in hits]
+
+
 def map_category(revolico_category):
     """
     Mappt eine Revolico-Kategorie auf eine Rico-Cuba Kategorie
@@ -179,21 +209,33 @@ def map_category(revolico_category):
     if not revolico_category:
         return DEFAULT_CATEGORY
 
-    # Normalize: lowercase und ohne Sonderzeichen
-    category_lower = revolico_category.lower()
+    keywords = _ranked_keywords(revolico_category)
+    return _KEYWORDS[keywords[0]] if keywords else DEFAULT_CATEGORY
+
+
+def map_categories(revolico_categories):
+    """
+    Mappt eine ganze Spalte von Kategorien (Export, Backfill)
+    Jeder unterschiedliche Wert wird nur einmal ausgewertet
 
-    # Suche nach Keywords in der Kategorie
-    for keyword, rico_category in CATEGORY_MAPPINGS.items():
-        if keyword in category_lower:
-            return rico_category
+    Args:
+        revolico_categories (iterable): Revolico Kategorie Texte
 
-    # Kein Match gefunden
-    return DEFAULT_CATEGORY
+    Returns:
+        list: Rico-Cuba Kategorien in derselben Reihenfolge
+    """
+    mapped = {}
+    result = []
+    for revolico_category in revolico_categories:
+        if revolico_category not in mapped:
+            mapped[revolico_category] = map_category(revolico_category)
+        result.append(mapped[revolico_category])
+    return result
 
 
 def get_category_suggestions(revolico_category):
     """
-    Gibt mehrere mögliche Kategorie-Matches zurück
+    Gibt mehrere mögliche Kategorie-Matches zurück (spezifischste zuerst)
 
     Args:
         revolico_category (str): Revolico Kategorie Text
@@ -204,12 +246,9 @@ def get_category_suggestions(revolico_category):
     if not revolico_category:
         return [DEFAULT_CATEGORY]
 
-    category_lower = revolico_category.lower()
     matches = []
-
-    for keyword, rico_category in CATEGORY_MAPPINGS.items():
-        if keyword in category_lower:
-            if rico_category not in matches:
-                matches.append(rico_category)
+    for keyword in _ranked_keywords(revolico_category):
+        if _KEYWORDS[keyword] not in matches:
+            matches.append(_KEYWORDS[keyword])
 
     return matches if matches else [DEFAULT_CATEGORY]
@@ -0,0 +1,160 @@
+"""
+Change Feed
+Versionierte Änderungs-Events für die Web-UI statt Intervall-Polling.
+
+Jede Änderung an Listings oder WhatsApp-Accounts schreibt im selben Commit
+eine Zeile in change_events; deren id ist die monotone Version. Der
+Web-Prozess sendet neue Zeilen per SocketIO ('change') an alle Clients
+(relay_changes in app.py) - auch Änderungen aus externen Worker-Prozessen.
+Clients wenden die Deltas an und holen nach einem Reconnect oder einer
+Versionslücke nur den fehlenden Bereich über /api/changes?since=<version>.
+
+Postgres vergibt die ids beim Insert, nicht beim Commit: eine kleinere Version
+kann nach einer größeren sichtbar werden. Relay und /api/changes liefern daher
+nur bis zur ersten Lücke, die jünger als GAP_GRACE_SECONDS ist (offene
+Transaktion); ältere Lücken gelten als Rollback und werden übersprungen.
+
+Verwendung im Schreibpfad (ohne Commit):
+    ChangeFeed.listing(LISTING_STATUS_CHANGED, listing)
+    db.session.commit()
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from models import db, ChangeEvent
+
+LISTING_INSERTED = 'listing_inserted'
+LISTING_UPDATED = 'listing_updated'
+LISTING_STATUS_CHANGED = 'listing_status_changed'
+LISTINGS_CLEARED = 'listings_cleared'
+ACCOUNT_UPDATED = 'account_updated'
+ACCOUNT_DELETED = 'account_deleted'
+
+# So lange wird auf eine fehlende Version (noch nicht committet) gewartet
+GAP_GRACE_SECONDS = 10
+
+
+def listing_payload(listing) -> dict:
+    """Kompakte Zeile für die Kundenliste (ohne Beschreibung und Bilder)"""
+    return {
+        'id': listing.id,
+        'title': listing.title,
+        'source_title': listing.title,
+        'url': listing.url,
+        'source_url': listing.url,
+        'phone_number': listing.phone_numbers[0] if listing.phone_numbers else None,
+        'seller_name': listing.seller_name,
+        'profile_picture_id': listing.profile_picture_id,
+        'category': listing.category,
+        'price': listing.price,
+        'currency': listing.currency,
+        'contacted': listing.whatsapp_contacted,
+        'contacted_at': listing.whatsapp_contacted_at.isoformat() if listing.whatsapp_contacted_at else None,
+        'whatsapp_status': listing.whatsapp_status,
+        'exported': listing.exported,
+        'created_at': (listing.created_at or datetime.utcnow()).isoformat(),
+    }
+
+
+class ChangeFeed:
+    """Service für change_events (braucht einen aktiven App-Context)"""
+
+    @staticmethod
+    def record(change_type: str, data: Optional[dict] = None, entity_id: Optional[int] = None) -> None:
+        """Merkt eine Änderung in der laufenden Transaktion vor (ohne Commit)"""
+        db.session.add(ChangeEvent(type=change_type, entity_id=entity_id, payload=data or {},
+                                   created_at=datetime.utcnow()))
+
+    @staticmethod
+    def listing(change_type: str, listing) -> None:
+        """Listing-Änderung (das Listing braucht bereits eine id, ggf. nach flush())"""
+        ChangeFeed.record(change_type, listing_payload(listing), entity_id=listing.id)
+
+    @staticmethod
+    def account(account) -> None:
+        ChangeFeed.record(ACCOUNT_UPDATED, account.to_dict(), entity_id=account.id)
+
+    @staticmethod
+    def account_deleted(account_id: int) -> None:
+        ChangeFeed.record(ACCOUNT_DELETED, {'id': account_id}, entity_id=account_id)
+
+    @staticmethod
+    def latest_version() -> int:
+        """
+        Höchste Version ohne offene Lücke darunter - bis hierhin ist alles
+        committet, was noch kommen kann (Stand für neue Clients und das Relay).
+        Lücken vor Events, die älter als GAP_GRACE_SECONDS sind, gelten als
+        Rollback (wie in since())
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=GAP_GRACE_SECONDS)
+        version = db.session.query(db.func.max(ChangeEvent.id)) \
+            .filter(ChangeEvent.created_at <= cutoff).scalar()
+        recent = [event_id for (event_id,) in db.session.query(ChangeEvent.id)
+                  .filter(ChangeEvent.id > (version or 0)).order_by(ChangeEvent.id)]
+        if not recent:
+            return version or 0
+        if version is None:
+            # Keine älteren Zeilen (neue DB oder alles geprunt)
+            version = recent[0] - 1
+        for event_id in recent:
+            if event_id != version + 1:
+                break
+            version = event_id
+        return version
+
+    @staticmethod
+    def max_version() -> int:
+        return db.session.query(db.func.max(ChangeEvent.id)).scalar() or 0
+
+    @staticmethod
+    def oldest_version() -> int:
+        return db.session.query(db.func.min(ChangeEvent.id)).scalar() or 0
+
+    @staticmethod
+    def since(version: int, limit: int = 500) -> List[dict]:
+        """Änderungen mit Version > version (älteste zuerst), bis zur ersten offenen Lücke"""
+        events = ChangeEvent.query.filter(ChangeEvent.id > version) \
+            .order_by(ChangeEvent.id).limit(limit).all()
+        cutoff = datetime.utcnow() - timedelta(seconds=GAP_GRACE_SECONDS)
+        changes = []
+        for event in events:
+            if event.id != version + 1 and event.created_at and event.created_at > cutoff:
+                # Die fehlende Version kann noch committet werden - beim nächsten Poll weiter
+                break
+            changes.append(ChangeFeed.to_message(event))
+            version = event.id
+        return changes
+
+    @staticmethod
+    def to_message(event: ChangeEvent) -> dict:
+        """Format für SocketIO ('change') und /api/changes"""
+        return {'version': event.id, 'type': event.type, 'data': event.payload or {}}
+
+    @staticmethod
+    def missed(version: int, limit: int = 500) -> dict:
+        """
+        Änderungen seit `version` für einen Client (Reconnect/Lücke)
+        reset=True: ein Teil des Bereichs ist schon gelöscht - Client lädt komplett neu
+        """
+        latest = ChangeFeed.latest_version()
+        if version == latest:
+            return {'version': latest, 'changes': [], 'reset': False, 'has_more': False}
+        # Version aus einer anderen/zurückgesetzten DB oder Bereich schon gelöscht
+        if version > latest or version + 1 < ChangeFeed.oldest_version():
+            return {'version': latest, 'changes': [], 'reset': True, 'has_more': False}
+        changes = ChangeFeed.since(version, limit=limit)
+        return {'version': latest, 'changes': changes, 'reset': False, 'has_more': len(changes) == limit}
+
+    @staticmethod
+    def prune(max_age_seconds: int = 86400) -> int:
+        """
+        Löscht alte Änderungen (die neueste bleibt als Versionsstand erhalten) -
+        Clients, die länger offline waren, laden danach komplett neu
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=max_age_seconds)
+        count = ChangeEvent.query.filter(
+            ChangeEvent.created_at < cutoff,
+            ChangeEvent.id < ChangeFeed.max_version()
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return count
@@ -3,24 +3,26 @@
 CloudScraper approach for Revolico.com - specifically designed to bypass Cloudflare
 """
 
-import cloudscraper
 import json
 import time
 import random
 import re
 import gzip
-import brotli
 import io
-from bs4 import BeautifulSoup
 from typing import List, Dict, Any
 import logging
 
+from http_cache import HttpCache
+from utils import configure_logging
+
 # Setup logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+configure_logging()
 logger = logging.getLogger(__name__)
 
 class CloudScraperRevolico:
     def __init__(self):
+        import cloudscraper
+
         # CloudScraper automatically handles Cloudflare challenges
         self.scraper = cloudscraper.create_scraper(
             browser={
@@ -31,6 +33,9 @@ class CloudScraperRevolico:
             delay=10  # Wait between requests
         )
         
+        # Shared on-disk cache for homepage and listing pages
+        self.http_cache = HttpCache.from_config()
+        
         # Add logger attribute for web app compatibility
         self.logger = logger
         
@@ -50,7 +55,11 @@ class CloudScraperRevolico:
         """Get listing links from homepage using CloudScraper"""
         try:
             logger.info("🌐 Loading revolico.com with CloudScraper...")
-            response = self.scraper.get('https://www.revolico.com', timeout=60)
+            if self.http_cache:
+                # TTL + Revalidierung halten die Homepage aktuell; offline nur aus dem Cache
+                response = self.http_cache.get(self.scraper, 'https://www.revolico.com', timeout=60)
+            else:
+                response = self.scraper.get('https://www.revolico.com', timeout=60)
             
             logger.info(f"✅ Homepage response: {response.status_code}, {len(response.content)} bytes")
             logger.info(f"Content-Type: {response.headers.get('content-type', 'unknown')}")
@@ -63,6 +72,7 @@ class CloudScraperRevolico:
                 
                 if content_encoding == 'br':
                     try:
+                        import brotli
                         decompressed = brotli.decompress(response.content)
                         content_text = decompressed.decode('utf-8')
                         logger.info(f"✅ Brotli decompression successful: {len(content_text)} chars")
@@ -97,6 +107,7 @@ class CloudScraperRevolico:
                 f.write(content_text)
             logger.info("💾 Saved homepage to homepage_debug.html")
             
+            from bs4 import BeautifulSoup
             soup = BeautifulSoup(content_text, 'html.parser')
             
             # Find listing links
@@ -160,11 +171,17 @@ class CloudScraperRevolico:
         try:
             logger.info(f"📄 Visiting: {url}")
             
-            # Random delay
-            time.sleep(random.uniform(3, 7))
-            
-            response = self.scraper.get(url, timeout=60)
-            logger.info(f"Page loaded: {response.status_code}, {len(response.text)} chars")
+            if self.http_cache:
+                # Random delay (not needed when the page is served from cache)
+                if not self.http_cache.is_fresh(url):
+                    time.sleep(random.uniform(3, 7))
+                response = self.http_cache.get(self.scraper, url, timeout=60)
+            else:
+                # Random delay
+                time.sleep(random.uniform(3, 7))
+                response = self.scraper.get(url, timeout=60)
+            logger.info(f"Page loaded: {response.status_code}, {len(response.text)} chars"
+                        f"{' (cached)' if getattr(response, 'from_cache', False) else ''}")
             
             if 'just a moment' in response.text.lower():
                 logger.warning("Got challenge page, retrying...")
@@ -172,6 +189,7 @@ class CloudScraperRevolico:
                 response = self.scraper.get(url, timeout=60)
                 logger.info(f"Retry: {response.status_code}, {len(response.text)} chars")
             
+            from bs4 import BeautifulSoup
             soup = BeautifulSoup(response.text, 'html.parser')
             found_phones = []
             
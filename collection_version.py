@@ -0,0 +1,82 @@
+"""
+Collection Version
+Schwache ETags für Collection-Endpoints (/api/customers, /api/scraped-listings,
+/api/whatsapp/accounts). Die Version einer Tabelle ist count(*) + max(updated_at)
+- ein einziger Aggregat-Query über den updated_at-Index. Jede Änderung über das
+ORM setzt updated_at (onupdate), Inserts/Deletes ändern zusätzlich den count.
+
+Stimmt If-None-Match, antwortet der Endpoint mit 304, ohne Zeilen zu laden
+oder zu serialisieren. Browser revalidieren dank Cache-Control: no-cache
+automatisch, auch fetch() im Dashboard.
+
+Verwendung:
+    @bp.route('/api/customers')
+    @conditional_collection(CollectionVersion.listings)
+    def get_customers(): ...
+"""
+import hashlib
+import os
+import time
+from functools import wraps
+
+from flask import make_response, request
+
+from models import db, ScrapedListing, WhatsAppAccount
+
+# Neuer Prozess = neue ETags (das Antwortformat kann sich mit dem Code ändern)
+_PROCESS_TOKEN = f'{os.getpid()}-{time.time()}'
+
+
+class CollectionVersion:
+    """Versions-Strings pro Tabelle (braucht einen aktiven App-Context)"""
+
+    @staticmethod
+    def of(model) -> str:
+        count, last_update = db.session.query(
+            db.func.count(model.id), db.func.max(model.updated_at)
+        ).one()
+        return f'{count}:{last_update}'
+
+    @staticmethod
+    def listings() -> str:
+        return CollectionVersion.of(ScrapedListing)
+
+    @staticmethod
+    def accounts() -> str:
+        return CollectionVersion.of(WhatsAppAccount)
+
+
+def collection_etag(version: str) -> str:
+    """ETag-Wert aus Version, Pfad und Query-String (limit/exported ändern die Antwort)"""
+    key = f'{_PROCESS_TOKEN}|{request.path}|{request.query_string.decode("latin-1")}|{version}'
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:24]
+
+
+def conditional_collection(version_fn):
+    """
+    Decorator: weak ETag + 304 bei passendem If-None-Match
+    Die Version wird vor dem Laden der Zeilen bestimmt - eine Änderung währenddessen
+    führt schlimmstenfalls zu einem unnötigen 200 beim nächsten Poll, nie zu einem falschen 304.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                etag = collection_etag(version_fn())
+            except Exception:
+                # Ohne Version einfach normal antworten (Fehlerbehandlung macht der View)
+                db.session.rollback()
+                return view(*args, **kwargs)
+            if request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            # Immer revalidieren (keine heuristische Cache-Dauer im Browser)
+            response.headers['Cache-Control'] = 'no-cache'
+            response.vary.add('Accept-Encoding')
+            return response
+        return wrapper
+    return decorator
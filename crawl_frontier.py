@@ -0,0 +1,168 @@
+"""
+Crawl Frontier
+Persistenter Crawl-Status (crawl_frontier Tabelle), damit ein abgebrochener
+Scraping-Lauf dort weitermachen kann, wo er aufgehört hat
+"""
+from contextlib import nullcontext
+from datetime import datetime
+
+from models import db, CrawlFrontierEntry
+
+
+class CrawlFrontier:
+    """Verwaltet die persistente Frontier der zu scrapenden Listing-URLs"""
+
+    PENDING = 'pending'
+    IN_PROGRESS = 'in_progress'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    DEFAULT_SCOPE = 'home'
+
+    def __init__(self, app=None, max_attempts=3, scope=None):
+        """
+        Args:
+            app: Flask App (für App-Context aus Scraper-Threads)
+            max_attempts: Versuche pro URL bevor sie als 'failed' markiert wird
+            scope: Crawl-Bereich (Kategorie-Slug oder 'home'); parallele Jobs mit
+                   verschiedenen Bereichen teilen sich keine offenen URLs.
+                   None = alle Bereiche (Übersicht/Löschen)
+        """
+        self.app = app
+        self.max_attempts = max_attempts
+        self.scope = scope
+
+    def _context(self):
+        return self.app.app_context() if self.app else nullcontext()
+
+    def _get(self, url):
+        """Eintrag der URL im eigenen Bereich (andere Bereiche haben eigene Einträge)"""
+        return self._query().filter_by(url=url).first()
+
+    def _query(self):
+        """Query auf die Einträge des eigenen Bereichs"""
+        if self.scope is None:
+            return CrawlFrontierEntry.query
+        return CrawlFrontierEntry.query.filter_by(scope=self.scope)
+
+    def discover(self, listings):
+        """
+        Trägt neu entdeckte URLs als 'pending' ein (bekannte URLs bleiben unverändert)
+
+        Args:
+            listings: Liste von {'url': ..., 'title': ...}
+
+        Returns:
+            Anzahl neu eingetragener URLs
+        """
+        added = 0
+        with self._context():
+            for listing in listings:
+                url = listing.get('url')
+                if not url or self._get(url):
+                    continue
+                db.session.add(CrawlFrontierEntry(
+                    url=url,
+                    title=(listing.get('title') or '')[:300],
+                    scope=self.scope or self.DEFAULT_SCOPE,
+                    state=self.PENDING
+                ))
+                added += 1
+            db.session.commit()
+        return added
+
+    def is_done(self, url):
+        """True wenn die URL bereits erfolgreich verarbeitet wurde"""
+        with self._context():
+            entry = self._get(url)
+            return bool(entry and entry.state == self.DONE)
+
+    def has_pending(self):
+        """True wenn noch offene URLs in der Frontier liegen"""
+        with self._context():
+            return self._query().filter(
+                CrawlFrontierEntry.state.in_([self.PENDING, self.IN_PROGRESS])
+            ).first() is not None
+
+    def reset_stale(self):
+        """
+        Setzt 'in_progress' URLs (abgestürzter/gestoppter Lauf) zurück auf 'pending'
+        Returns: Anzahl zurückgesetzter URLs
+        """
+        with self._context():
+            count = self._query().filter_by(state=self.IN_PROGRESS).update(
+                {'state': self.PENDING}, synchronize_session=False
+            )
+            db.session.commit()
+            return count
+
+    def pending(self, limit):
+        """Gibt bis zu `limit` offene URLs (älteste zuerst) zurück"""
+        with self._context():
+            entries = self._query().filter_by(state=self.PENDING) \
+                .order_by(CrawlFrontierEntry.discovered_at, CrawlFrontierEntry.id) \
+                .limit(limit).all()
+            return [{'url': e.url, 'title': e.title or 'No title'} for e in entries]
+
+    def mark_in_progress(self, url):
+        """Markiert URL als in Bearbeitung und zählt den Versuch"""
+        with self._context():
+            entry = self._get(url)
+            if not entry:
+                entry = CrawlFrontierEntry(url=url, attempts=0, scope=self.scope or self.DEFAULT_SCOPE)
+                db.session.add(entry)
+            entry.state = self.IN_PROGRESS
+            entry.attempts = (entry.attempts or 0) + 1
+            db.session.commit()
+
+    def mark_done(self, url):
+        """Markiert URL als erfolgreich verarbeitet"""
+        with self._context():
+            entry = self._get(url)
+            if entry:
+                entry.state = self.DONE
+                entry.last_error = None
+                entry.completed_at = datetime.utcnow()
+                db.session.commit()
+
+    def mark_failed(self, url, error):
+        """
+        Speichert den Fehler; nach max_attempts Versuchen wird die URL
+        endgültig als 'failed' markiert, sonst erneut eingeplant
+        """
+        with self._context():
+            entry = self._get(url)
+            if entry:
+                entry.last_error = str(error)[:2000]
+                entry.state = self.FAILED if entry.attempts >= self.max_attempts else self.PENDING
+                db.session.commit()
+
+    def release(self, url):
+        """Gibt eine URL nach Benutzer-Stopp ohne Fehlversuch wieder frei"""
+        with self._context():
+            entry = self._get(url)
+            if entry and entry.state == self.IN_PROGRESS:
+                entry.state = self.PENDING
+                entry.attempts = max((entry.attempts or 1) - 1, 0)
+                db.session.commit()
+
+    def summary(self):
+        """Anzahl URLs pro Status"""
+        from sqlalchemy import func
+
+        with self._context():
+            query = db.session.query(CrawlFrontierEntry.state, func.count(CrawlFrontierEntry.id))
+            if self.scope is not None:
+                query = query.filter(CrawlFrontierEntry.scope == self.scope)
+            rows = query.group_by(CrawlFrontierEntry.state).all()
+            counts = {self.PENDING: 0, self.IN_PROGRESS: 0, self.DONE: 0, self.FAILED: 0}
+            counts.update({state: count for state, count in rows})
+            counts['total'] = sum(count for _, count in rows)
+            return counts
+
+    def clear(self):
+        """Löscht die komplette Frontier (nächster Lauf startet von der Startseite)"""
+        with self._context():
+            count = self._query().delete()
+            db.session.commit()
+            return count
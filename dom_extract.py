@@ -0,0 +1,238 @@
+"""
+DOM Extract
+Injizierte JavaScript-Bündel für Selenium: statt hunderter einzelner
+WebDriver-Aufrufe (find_elements, get_attribute, .text pro Element) sammelt
+ein execute_script-Aufruf alle benötigten Daten einer Seite und liefert sie
+als ein JSON-Objekt zurück.
+
+- collect_links(driver, ...)    Listing-Links der Start-/Kategorieseite
+- collect_listing(driver, ...)  Profil-WhatsApp-Links, Titel, Beschreibung,
+                                Verkäufer, Profilbild, Preis, Galerie,
+                                Breadcrumbs, Ort, Zustand
+
+Die Auswertung (Preis-Format, Bildqualität, Kategorie) bleibt in Python.
+"""
+import re
+import time
+
+ITEM_LINK_SELECTORS = [
+    'a[href*="/item/"]:not([href*="/item/publish"])',  # Product links but not publish
+    'a[href*="/item/"][href*="-"]',                    # Item links with dashes (product names)
+    'a[href*="/item/"]',                               # All item links
+]
+
+PROFILE_SELECTORS = [
+    'div[class*="sc-7ea21534"]',
+    'div[class*="sc-2a048850"]',
+    'div[class*="kMsUxE"]',
+    '[data-cy="adUser"]',
+    'div[class*="sc-3b03e06d"]',
+    '.user-profile',
+    '.contact-info',
+    '.seller-contact',
+]
+
+AVATAR_SELECTORS = [
+    '[data-cy="user-avatar"] img',                    # data-cy is most stable
+    '.AvatarImage__Wrapper-sc-c54cfbd7-0 img',        # Specific avatar wrapper class
+    'div.avatar[data-cy="user-avatar"] img',          # Combined selector
+    '.AdOwner__Wrapper img[alt="Avatar"]',            # Specific class + alt
+    '.avatar img',                                    # Generic avatar class
+    'a[data-cy="adUser"] img',                        # Within user link
+]
+
+BREADCRUMB_SELECTORS = [
+    'nav[aria-label="breadcrumb"]',
+    '.breadcrumb',
+    '[data-cy="breadcrumb"]',
+]
+
+LINKS_SCRIPT = """
+const [selectors, perSelector, genericLimit] = arguments;
+const pick = a => ({href: a.href || '', text: (a.innerText || '').trim()});
+const all = sel => { try { return Array.from(document.querySelectorAll(sel)); } catch (e) { return []; } };
+return {
+    bySelector: selectors.map(sel => all(sel).slice(0, perSelector).map(pick)),
+    generic: Array.from(document.getElementsByTagName('a')).slice(0, genericLimit).map(pick)
+};
+"""
+
+LISTING_SCRIPT = """
+const cfg = arguments[0];
+const all = (sel, root) => { try { return Array.from((root || document).querySelectorAll(sel)); } catch (e) { return []; } };
+const one = (sel, root) => all(sel, root)[0] || null;
+const text = sel => { const el = one(sel); return el ? (el.innerText || '').trim() : null; };
+
+const profileLinks = [];
+cfg.profileSelectors.forEach(sel => all(sel).forEach(area =>
+    all('a[href*="wa.me"], a[href*="whatsapp"]', area).forEach(a => profileLinks.push(a.href))));
+
+let profilePicture = null;
+for (const sel of cfg.avatarSelectors) {
+    const img = one(sel);
+    if (img && img.src) { profilePicture = img.src; break; }
+}
+
+const gallery = one('[data-cy="adImages"]');
+const slides = gallery ? all('.swiper-slide', gallery).map(slide => ({
+    zoom: all('.swiper-zoom-container img', slide).map(img => img.src || ''),
+    sources: all('source', slide).map(source => source.getAttribute('srcset') || ''),
+    img: (one('img', slide) || {}).src || null
+})) : null;
+
+const breadcrumbs = cfg.breadcrumbSelectors.map(sel => { const el = one(sel); return el ? el.innerText : null; });
+
+const html = document.documentElement.outerHTML;
+const lower = html.toLowerCase();
+const sellerName = text('[data-cy="userFullname"]');
+const nextData = document.getElementById('__NEXT_DATA__');
+
+return {
+    url: location.href,
+    pageTitle: document.title,
+    ready: !!(one('[data-cy="adTitle"]') && one('[data-cy="adDescription"]') && one('[data-cy="adLocation"]')),
+    errorPage: html.includes('Ha ocurrido un error'),
+    title: text('[data-cy="adTitle"]'),
+    description: text('[data-cy="adDescription"]'),
+    sellerName: sellerName,
+    nextData: sellerName ? null : (nextData ? nextData.textContent : null),
+    profileLinks: profileLinks,
+    profilePicture: profilePicture,
+    price: text('[data-cy="adPrice"]'),
+    slides: slides,
+    breadcrumbs: breadcrumbs,
+    location: text('[data-cy="adLocation"]'),
+    condition: (lower.includes('nuevo') || lower.includes('new')) ? 'new'
+        : (lower.includes('usado') || lower.includes('used')) ? 'used' : null
+};
+"""
+
+LISTING_CONFIG = {
+    'profileSelectors': PROFILE_SELECTORS,
+    'avatarSelectors': AVATAR_SELECTORS,
+    'breadcrumbSelectors': BREADCRUMB_SELECTORS,
+}
+
+
+def collect_links(driver, selectors=ITEM_LINK_SELECTORS, per_selector=10, generic_limit=100):
+    """
+    Alle Link-Kandidaten einer Übersichtsseite in einem Aufruf
+
+    Returns:
+        {'bySelector': [[{href, text}, ...] pro Selektor], 'generic': [{href, text}, ...]}
+    """
+    return driver.execute_script(LINKS_SCRIPT, list(selectors), per_selector, generic_limit)
+
+
+def collect_listing(driver, timeout=15.0, poll=0.5, sleep=time.sleep):
+    """
+    Daten einer Listing-Detailseite in einem Aufruf
+    Wiederholt den Aufruf (ein Round-Trip pro Versuch), bis Titel, Beschreibung
+    und Ort da sind - höchstens `timeout` Sekunden, danach zählt der letzte Stand
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        data = driver.execute_script(LISTING_SCRIPT, LISTING_CONFIG)
+        if data.get('ready') or data.get('errorPage') or time.monotonic() >= deadline:
+            return data
+        sleep(poll)
+
+
+def parse_price_text(price_text):
+    """
+    Preis und Währung aus dem adPrice-Text ("8.000 CUP", "400 USD", "1.200,50 USD")
+
+    Returns: (price oder None, currency)
+    """
+    price_match = re.search(r'([\d.,]+)\s*(CUP|USD|EUR|MLC)', price_text or '', re.IGNORECASE)
+    if not price_match:
+        return None, 'USD'
+
+    price_str = price_match.group(1)
+    currency = price_match.group(2).upper()
+
+    # "1,300" / "10,000" - comma is thousand separator
+    if re.match(r'^[\d.,]+,\d{3}$', price_str):
+        price_clean = price_str.replace(',', '').replace('.', '')
+    # "1.200,50" - period is thousand, comma is decimal
+    elif re.match(r'^[\d.,]+,\d{1,2}$', price_str):
+        price_clean = price_str.replace('.', '').replace(',', '.')
+    # "1,300.50" - comma is thousand, period is decimal
+    elif re.match(r'^[\d.,]+\.\d{1,2}$', price_str):
+        price_clean = price_str.replace(',', '')
+    # "8.000" or "100" - remove thousand separators
+    else:
+        price_clean = price_str.replace('.', '').replace(',', '')
+
+    try:
+        return float(price_clean), currency
+    except ValueError:
+        return None, 'USD'
+
+
+def gallery_images(slides, limit=10):
+    """
+    Bild-URLs aus den Galerie-Slides, jeweils in höchster Qualität (_high.jpg)
+    Reihenfolge pro Slide: Zoom-Bild (_high.jpg) > <source> (Desktop bevorzugt) > <img>
+    Galerie-Reihenfolge bleibt erhalten, damit bei mehr als `limit` Bildern immer
+    dieselben ausgewählt werden (wie im Refresh-Pfad, listing_parser)
+    """
+    found_images = []
+    for slide in slides or []:
+        high = [src for src in slide.get('zoom', []) if src and '_high.jpg' in src and 'revolico' in src]
+        if high:
+            found_images.extend(high)
+            continue
+
+        best_url = None
+        for srcset in slide.get('sources', []):
+            if not srcset:
+                continue
+            url = srcset.split(',')[0].strip().split(' ')[0]
+            if '_detail_desktop.jpg' in url:
+                best_url = url
+                break
+            if not best_url:
+                best_url = url
+        if best_url:
+            found_images.append(best_url)
+            continue
+
+        src = slide.get('img')
+        if src and 'revolico' in src:
+            found_images.append(src)
+
+    high_quality_images = []
+    for img_url in found_images:
+        if 'pic.revolico.com/pics/' in img_url:
+            img_url = re.sub(r'(https://pic\.revolico\.com/pics/[a-f0-9]+)_.*?\.jpg', r'\1_high.jpg', img_url)
+        high_quality_images.append(img_url)
+    # Geordnetes Dedupe (ein set() wählt pro Prozess zufällig andere Bilder aus)
+    return list(dict.fromkeys(high_quality_images))[:limit]
+
+
+def category_from_breadcrumbs(breadcrumbs):
+    """Kategorie aus dem ersten Breadcrumb der Form "Home > Kategorie > Unterkategorie" """
+    for text in breadcrumbs or []:
+        if not text:
+            continue
+        parts = [p.strip() for p in text.split('>')]
+        if len(parts) > 1:
+            return parts[-1] if len(parts) > 2 else parts[1]
+    return ''
+
+
+def whatsapp_phones_from_links(hrefs):
+    """Kubanische Nummern (+53xxxxxxxx) aus wa.me/whatsapp.com-Links"""
+    phones = []
+    for href in hrefs or []:
+        if not href or ('wa.me' not in href and 'whatsapp.com' not in href):
+            continue
+        phone_match = re.search(r'(?:wa\.me/|phone=)(\+?53\d{8})\b', href)
+        if phone_match:
+            phone = phone_match.group(1)
+            if not phone.startswith('+'):
+                phone = '+' + phone
+            if phone not in phones:
+                phones.append(phone)
+    return phones
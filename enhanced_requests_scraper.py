@@ -15,9 +15,9 @@ from typing import List, Dict, Optional, Tuple
 import logging
 from urllib.parse import urljoin, urlparse
 
-from bs4 import BeautifulSoup
 from phone_parser import PhoneNumberParser
 from utils import setup_logging, save_to_json
+from http_cache import HttpCache
 
 class AdvancedRequestsScraper:
     """Advanced requests-based scraper with enhanced anti-detection"""
@@ -26,6 +26,7 @@ class AdvancedRequestsScraper:
         self.logger = setup_logging()
         self.phone_parser = PhoneNumberParser()
         self.session = requests.Session()
+        self.http_cache = HttpCache.from_config()
         self.cookies_file = "session_cookies.json"
         
         # Enhanced configuration
@@ -265,15 +266,18 @@ class AdvancedRequestsScraper:
         
         return protection
     
-    def make_enhanced_request(self, url: str, max_retries: int = 3) -> Tuple[bool, Dict]:
-        """Make request with enhanced anti-detection"""
+    def make_enhanced_request(self, url: str, max_retries: int = 3, use_cache: bool = True) -> Tuple[bool, Dict]:
+        """Make request with enhanced anti-detection (über den HTTP-Cache, auch für die Homepage)"""
+        cache = self.http_cache if use_cache else None
         
         for attempt in range(max_retries):
             try:
                 self.logger.info(f"Requesting {url} (attempt {attempt + 1}/{max_retries})")
                 
                 # Add delay with exponential backoff
-                if attempt > 0:
+                if cache and attempt == 0 and cache.is_fresh(url):
+                    self.logger.info("Serving from cache, no delay needed")
+                elif attempt > 0:
                     backoff_delay = self.config['delays']['retry_backoff'] * (2 ** (attempt - 1))
                     jitter = random.uniform(-self.config['delays']['jitter'], 
                                           self.config['delays']['jitter'])
@@ -294,7 +298,10 @@ class AdvancedRequestsScraper:
                 self.randomize_headers()
                 
                 # Make the request
-                response = self.session.get(url, timeout=20, allow_redirects=True)
+                if cache:
+                    response = cache.get(self.session, url, timeout=20, allow_redirects=True)
+                else:
+                    response = self.session.get(url, timeout=20, allow_redirects=True)
                 
                 # Analyze response
                 protection = self.detect_protection(response)
@@ -417,6 +424,7 @@ class AdvancedRequestsScraper:
         listings = []
         
         try:
+            from bs4 import BeautifulSoup
             soup = BeautifulSoup(html_content, 'html.parser')
             
             # Multiple selectors for different site layouts
@@ -512,7 +520,10 @@ class AdvancedRequestsScraper:
                 }
             
             # Extract phone numbers from page
-            response = self.session.get(listing['url'])  # Get fresh response
+            if self.http_cache:
+                response = self.http_cache.get(self.session, listing['url'])  # Cached by the request above
+            else:
+                response = self.session.get(listing['url'])  # Get fresh response
             phone_numbers = self.phone_parser.extract_phone_numbers(response.text)
             
             # Remove duplicates
@@ -567,8 +578,11 @@ class AdvancedRequestsScraper:
             if not working_url:
                 raise Exception("No working URL found - all strategies failed")
             
-            # Get homepage content
-            response = self.session.get(working_url)
+            # Get homepage content (cached by find_working_url)
+            if self.http_cache:
+                response = self.http_cache.get(self.session, working_url)
+            else:
+                response = self.session.get(working_url)
             
             # Extract listings
             listings = self.extract_listings_from_html(response.text, working_url)
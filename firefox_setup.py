@@ -0,0 +1,229 @@
+"""
+Firefox Setup
+Gemeinsamer, einmal pro Prozess aufgelöster Firefox-Start für Scraper und
+WhatsApp-Bots:
+
+- Firefox-Binary und geckodriver werden einmal gesucht (kein
+  GeckoDriverManager-Netzwerkcheck pro Driver)
+- Scraping-Sessions starten aus einer vorgewärmten Profil-Vorlage, die pro
+  Session nach tmpfs (/dev/shm) kopiert wird - kein kalter Profilaufbau
+- Scraping-Profile laden keine Bilder/Webfonts und senden keine Telemetrie
+
+Die Vorlage liegt unter FIREFOX_TEMPLATE_DIR (Standard: temp-Verzeichnis) und
+wird bei geänderten Prefs automatisch neu gebaut.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from typing import Optional
+
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+FIREFOX_PATHS = [
+    '/usr/bin/firefox-esr',               # Firefox ESR (apt install)
+    '/usr/lib/firefox-esr/firefox-esr',   # Firefox ESR (Debian/Ubuntu)
+    '/usr/bin/firefox',                   # Standard Firefox
+    '/snap/bin/firefox',                  # Snap installation (Ubuntu 22.04+)
+]
+
+GECKODRIVER_PATHS = [
+    '/usr/local/bin/xvfb-geckodriver',    # xvfb wrapper for headless display
+    '/usr/local/bin/geckodriver',
+]
+
+TEMPLATE_BASE_DIR = os.environ.get('FIREFOX_TEMPLATE_DIR', os.path.join(tempfile.gettempdir(), 'revolico-firefox'))
+PROFILE_TMPFS = os.environ.get('FIREFOX_PROFILE_TMPFS', '/dev/shm')
+TEMPLATE_WARMUP = os.environ.get('FIREFOX_TEMPLATE_WARMUP', '1') == '1'
+
+# Für alle Profile: keine Telemetrie, Updates, Safebrowsing-Downloads, Startseiten
+BASE_PREFS = {
+    'dom.webdriver.enabled': False,
+    'useAutomationExtension': False,
+    'toolkit.telemetry.enabled': False,
+    'toolkit.telemetry.unified': False,
+    'toolkit.telemetry.archive.enabled': False,
+    'datareporting.healthreport.uploadEnabled': False,
+    'datareporting.policy.dataSubmissionEnabled': False,
+    'app.shield.optoutstudies.enabled': False,
+    'app.normandy.enabled': False,
+    'app.update.auto': False,
+    'app.update.enabled': False,
+    'extensions.update.enabled': False,
+    'browser.shell.checkDefaultBrowser': False,
+    'browser.safebrowsing.malware.enabled': False,
+    'browser.safebrowsing.phishing.enabled': False,
+    'browser.safebrowsing.downloads.enabled': False,
+    'browser.startup.homepage_override.mstone': 'ignore',
+    'browser.newtabpage.enabled': False,
+    'browser.aboutwelcome.enabled': False,
+    'network.prefetch-next': False,
+}
+
+# Zusätzlich für Scraping: keine Bilder/Webfonts laden (URLs bleiben im DOM)
+SCRAPE_PREFS = dict(BASE_PREFS, **{
+    'permissions.default.image': 2,
+    'browser.display.use_document_fonts': 0,
+    'gfx.downloadable_fonts.enabled': False,
+    'media.autoplay.default': 5,
+    'general.useragent.override': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0',
+})
+
+# Dateien, die nicht in eine Session-Kopie gehören
+_PROFILE_IGNORE = shutil.ignore_patterns('lock', '.parentlock', 'parent.lock', 'cache2', 'crashes', 'minidumps')
+
+_template_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def firefox_binary() -> Optional[str]:
+    """Pfad zum Firefox-Binary (einmal pro Prozess gesucht) oder None = Systemstandard"""
+    for path in FIREFOX_PATHS:
+        if os.path.exists(path):
+            logger.info(f"Found Firefox binary at: {path}")
+            return path
+    logger.warning("Firefox binary not found, using system default")
+    return None
+
+
+@lru_cache(maxsize=1)
+def geckodriver_path() -> str:
+    """Pfad zu geckodriver (lokal bevorzugt, sonst einmalig per webdriver-manager)"""
+    for path in GECKODRIVER_PATHS:
+        if os.path.exists(path):
+            logger.info(f"Using geckodriver: {path}")
+            return path
+    path = shutil.which('geckodriver')
+    if path:
+        logger.info(f"Using geckodriver from PATH: {path}")
+        return path
+
+    from webdriver_manager.firefox import GeckoDriverManager
+
+    logger.info("Using webdriver-manager for geckodriver")
+    return GeckoDriverManager().install()
+
+
+def _write_user_js(profile_dir, prefs):
+    with open(os.path.join(profile_dir, 'user.js'), 'w') as f:
+        for name, value in sorted(prefs.items()):
+            f.write(f'user_pref({json.dumps(name)}, {json.dumps(value)});\n')
+
+
+def _warm_up(profile_dir):
+    """Startet Firefox einmal mit dem Profil, damit Zertifikats-DB, startupCache usw. existieren"""
+    from selenium import webdriver
+    from selenium.webdriver.firefox.options import Options as FirefoxOptions
+    from selenium.webdriver.firefox.service import Service as FirefoxService
+
+    options = FirefoxOptions()
+    if firefox_binary():
+        options.binary_location = firefox_binary()
+    options.add_argument('--headless')
+    options.add_argument('-profile')
+    options.add_argument(profile_dir)
+    driver = webdriver.Firefox(service=FirefoxService(geckodriver_path()), options=options)
+    try:
+        driver.get('about:blank')
+    finally:
+        driver.quit()
+
+
+def profile_template(prefs=None) -> str:
+    """
+    Vorgewärmte Profil-Vorlage für die gegebenen Prefs (Standard: SCRAPE_PREFS)
+    Wird einmal gebaut und von allen Prozessen wiederverwendet
+    """
+    prefs = SCRAPE_PREFS if prefs is None else prefs
+    digest = hashlib.sha1(json.dumps([prefs, firefox_binary()], sort_keys=True).encode()).hexdigest()[:12]
+    template_dir = os.path.join(TEMPLATE_BASE_DIR, f'template-{digest}')
+
+    with _template_lock:
+        if os.path.isdir(template_dir):
+            return template_dir
+
+        build_start = time.perf_counter()
+        os.makedirs(TEMPLATE_BASE_DIR, exist_ok=True)
+        build_dir = tempfile.mkdtemp(prefix='build-', dir=TEMPLATE_BASE_DIR)
+        _write_user_js(build_dir, prefs)
+        if TEMPLATE_WARMUP:
+            try:
+                _warm_up(build_dir)
+            except Exception as e:
+                logger.warning(f"Firefox profile warm-up failed, using cold template: {e}")
+            _write_user_js(build_dir, prefs)  # geckodriver ergänzt user.js beim Start
+
+        try:
+            os.rename(build_dir, template_dir)
+        except OSError:
+            # Ein anderer Prozess war schneller
+            shutil.rmtree(build_dir, ignore_errors=True)
+        logger.info(f"🦊 Firefox profile template ready in {time.perf_counter() - build_start:.2f}s: {template_dir}")
+        return template_dir
+
+
+def session_profile(prefs=None) -> str:
+    """Kopiert die Profil-Vorlage für eine neue Session nach tmpfs (bzw. temp)"""
+    base = PROFILE_TMPFS if os.path.isdir(PROFILE_TMPFS) and os.access(PROFILE_TMPFS, os.W_OK) else None
+    session_dir = tempfile.mkdtemp(prefix='revolico-ff-', dir=base)
+    shutil.copytree(profile_template(prefs), session_dir, ignore=_PROFILE_IGNORE, dirs_exist_ok=True)
+    return session_dir
+
+
+def remove_session_profile(driver):
+    """Löscht die Session-Kopie eines mit launch_firefox(session=True) gestarteten Drivers"""
+    session_dir = getattr(driver, 'session_profile_dir', None)
+    if session_dir:
+        shutil.rmtree(session_dir, ignore_errors=True)
+
+
+def launch_firefox(arguments=(), prefs=None, profile_dir=None, session=False, name='scraper'):
+    """
+    Startet Firefox mit gecachtem Binary/geckodriver und misst die Startzeit
+
+    Args:
+        arguments: Firefox-Argumente (headless, Fenstergröße, ...)
+        prefs: zusätzliche Prefs (Session-Profile haben SCRAPE_PREFS schon in user.js)
+        profile_dir: festes Profil (z.B. WhatsApp-Session), wird direkt benutzt
+        session: True = frische Kopie der vorgewärmten Scraping-Vorlage (tmpfs)
+        name: Label für Metriken ('scraper', 'whatsapp')
+
+    Returns: WebDriver (mit .session_profile_dir bei session=True)
+    """
+    from selenium import webdriver
+    from selenium.webdriver.firefox.options import Options as FirefoxOptions
+    from selenium.webdriver.firefox.service import Service as FirefoxService
+
+    start = time.perf_counter()
+    options = FirefoxOptions()
+    if firefox_binary():
+        options.binary_location = firefox_binary()
+    for argument in arguments:
+        options.add_argument(argument)
+    for pref, value in (prefs or {}).items():
+        options.set_preference(pref, value)
+
+    session_dir = session_profile() if session else None
+    if session_dir or profile_dir:
+        options.add_argument('-profile')
+        options.add_argument(session_dir or profile_dir)
+
+    try:
+        driver = webdriver.Firefox(service=FirefoxService(geckodriver_path()), options=options)
+    except Exception:
+        if session_dir:
+            shutil.rmtree(session_dir, ignore_errors=True)
+        raise
+    driver.session_profile_dir = session_dir
+
+    duration = time.perf_counter() - start
+    metrics.observe('browser_startup_seconds', duration, browser=name)
+    logger.info(f"🦊 Firefox ({name}) started in {duration:.2f}s")
+    return driver
@@ -0,0 +1,274 @@
+"""
+Fixture Record & Replay
+Zeichnet abgerufene Seiten (URL, Status, Header, Body) in ein versioniertes
+Fixture-Archiv (.tar.gz) auf und spielt sie über einen lokalen HTTP-Server
+wieder ab - für reproduzierbare Offline-Benchmarks ohne Live-Seite.
+
+Verwendung:
+    python fixtures.py import fixtures/revolico.tar.gz debug_page_*.html homepage_debug.html
+    python fixtures.py record fixtures/revolico.tar.gz --max-listings 10
+    python fixtures.py serve fixtures/revolico.tar.gz --port 8765
+"""
+import argparse
+import io
+import json
+import re
+import tarfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+# Erhöhen wenn sich das Archiv-Layout ändert
+FIXTURE_FORMAT_VERSION = 1
+
+MANIFEST_NAME = 'manifest.json'
+
+# Header die beim Abspielen nicht mehr zum (bereits dekodierten) Body passen
+DROPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding', 'connection')
+
+CANONICAL_PATTERN = re.compile(r'<link rel="canonical" href="([^"]+)"')
+
+
+def fixture_key(url):
+    """Schlüssel einer Seite im Archiv: Pfad + Query (Host wird ignoriert)"""
+    parts = urlsplit(url)
+    path = parts.path or '/'
+    return f'{path}?{parts.query}' if parts.query else path
+
+
+class FixtureRecorder:
+    """Sammelt Seiten und schreibt sie als Fixture-Archiv"""
+
+    def __init__(self, source='live'):
+        self.source = source
+        self.pages = {}
+        self._lock = threading.Lock()
+
+    def record(self, url, body, status=200, headers=None, elapsed=None):
+        """Speichert eine Seite (spätere Aufnahmen derselben URL überschreiben)"""
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        headers = {k: v for k, v in (headers or {}).items() if k.lower() not in DROPPED_HEADERS}
+        headers.setdefault('Content-Type', 'text/html; charset=utf-8')
+        with self._lock:
+            self.pages[fixture_key(url)] = {
+                'url': url,
+                'status': status,
+                'headers': headers,
+                'body': body,
+                'elapsed': elapsed,
+            }
+
+    def _response_hook(self, response, *args, **kwargs):
+        self.record(
+            response.url,
+            response.content,
+            status=response.status_code,
+            headers=dict(response.headers),
+            elapsed=response.elapsed.total_seconds() if response.elapsed else None
+        )
+        return response
+
+    def attach(self, session):
+        """Zeichnet jede Antwort einer requests.Session (oder cloudscraper) auf"""
+        session.hooks['response'].append(self._response_hook)
+        return session
+
+    def record_page_source(self, driver):
+        """Zeichnet die aktuell im Selenium-Browser geladene Seite auf"""
+        self.record(driver.current_url, driver.page_source)
+
+    def import_html_dump(self, path, url=None):
+        """
+        Importiert eine gespeicherte HTML-Datei (z.B. debug_page_1.html)
+        Ohne url wird die canonical URL aus der Seite verwendet
+        """
+        with open(path, 'rb') as f:
+            body = f.read()
+        if url is None:
+            match = CANONICAL_PATTERN.search(body.decode('utf-8', errors='ignore'))
+            if not match:
+                raise ValueError(f'No canonical URL in {path}, pass url explicitly')
+            url = match.group(1)
+        self.record(url, body)
+        return url
+
+    def save(self, path):
+        """Schreibt das Archiv (manifest.json + pages/NNNN.html)"""
+        manifest = {
+            'version': FIXTURE_FORMAT_VERSION,
+            'created_at': datetime.utcnow().isoformat(),
+            'source': self.source,
+            'pages': []
+        }
+        with tarfile.open(path, 'w:gz') as archive:
+            for index, (key, page) in enumerate(sorted(self.pages.items())):
+                name = f'pages/{index:04d}.html'
+                manifest['pages'].append({
+                    'key': key,
+                    'url': page['url'],
+                    'status': page['status'],
+                    'headers': page['headers'],
+                    'elapsed': page['elapsed'],
+                    'file': name,
+                })
+                _add_bytes(archive, name, page['body'])
+            _add_bytes(archive, MANIFEST_NAME, json.dumps(manifest, indent=2).encode('utf-8'))
+        return len(manifest['pages'])
+
+
+def _add_bytes(archive, name, data):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mtime = int(time.time())
+    archive.addfile(info, io.BytesIO(data))
+
+
+class FixtureArchive:
+    """Gelesenes Fixture-Archiv (key -> Seite)"""
+
+    def __init__(self, pages, manifest):
+        self.pages = pages
+        self.manifest = manifest
+
+    @classmethod
+    def load(cls, path):
+        with tarfile.open(path, 'r:gz') as archive:
+            manifest = json.loads(archive.extractfile(MANIFEST_NAME).read())
+            if manifest.get('version') != FIXTURE_FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported fixture version {manifest.get('version')} "
+                    f"(expected {FIXTURE_FORMAT_VERSION})"
+                )
+            pages = {}
+            for entry in manifest['pages']:
+                page = dict(entry)
+                page['body'] = archive.extractfile(entry['file']).read()
+                pages[entry['key']] = page
+        return cls(pages, manifest)
+
+    def get(self, url):
+        return self.pages.get(fixture_key(url))
+
+    def listing_urls(self):
+        """Alle archivierten Listing-Detailseiten"""
+        return [page['url'] for key, page in self.pages.items() if key.startswith('/item/')]
+
+
+class ReplayServer:
+    """
+    Lokaler HTTP-Server, der ein Fixture-Archiv abspielt
+
+    Args:
+        archive: FixtureArchive
+        latency: künstliche Verzögerung pro Anfrage (Sekunden)
+    """
+
+    def __init__(self, archive, host='127.0.0.1', port=0, latency=0.0):
+        self.archive = archive
+        self.latency = latency
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                page = server.archive.pages.get(fixture_key(self.path))
+                if page is None:
+                    self.send_error(404, 'Not recorded')
+                    return
+                self.send_response(page['status'])
+                for name, value in page['headers'].items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(page['body'])))
+                self.end_headers()
+                self.wfile.write(page['body'])
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def url_for(self, url):
+        """Übersetzt eine Original-URL in die entsprechende Replay-URL"""
+        return self.base_url + fixture_key(url)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def record_live(path, max_listings):
+    """Nimmt einen Live-Lauf des requests-Scrapers auf"""
+    from simple_requests_scraper import SimpleRevolicoScraper
+
+    recorder = FixtureRecorder(source='simple_requests_scraper')
+    scraper = SimpleRevolicoScraper()
+    scraper.http_cache = None  # jede Seite muss wirklich abgerufen werden
+    recorder.attach(scraper.session)
+    scraper.scrape(max_listings=max_listings)
+    return recorder.save(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record and replay scraper fixtures')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    import_cmd = sub.add_parser('import', help='Import saved HTML dumps')
+    import_cmd.add_argument('archive')
+    import_cmd.add_argument('files', nargs='+')
+
+    record_cmd = sub.add_parser('record', help='Record a live scraping run')
+    record_cmd.add_argument('archive')
+    record_cmd.add_argument('--max-listings', type=int, default=3)
+
+    serve_cmd = sub.add_parser('serve', help='Serve an archive over HTTP')
+    serve_cmd.add_argument('archive')
+    serve_cmd.add_argument('--port', type=int, default=8765)
+    serve_cmd.add_argument('--latency', type=float, default=0.0)
+
+    args = parser.parse_args()
+
+    if args.command == 'import':
+        recorder = FixtureRecorder(source='html-dumps')
+        for path in args.files:
+            print(f"📄 {path} -> {recorder.import_html_dump(path)}")
+        print(f"✅ Saved {recorder.save(args.archive)} pages to {args.archive}")
+
+    elif args.command == 'record':
+        print(f"✅ Recorded {record_live(args.archive, args.max_listings)} pages to {args.archive}")
+
+    elif args.command == 'serve':
+        archive = FixtureArchive.load(args.archive)
+        server = ReplayServer(archive, port=args.port, latency=args.latency)
+        print(f"🎬 Serving {len(archive.pages)} pages on {server.base_url}")
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            server.stop()
+
+
+if __name__ == '__main__':
+    main()
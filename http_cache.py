@@ -0,0 +1,201 @@
+"""
+HTTP Response Cache
+Gemeinsamer On-Disk Cache (SQLite) für die requests-basierten Scraper.
+- TTL: frische Einträge werden ohne Netzwerkzugriff ausgeliefert
+- Revalidierung abgelaufener Einträge per ETag / Last-Modified (304)
+- Bodies werden zlib-komprimiert gespeichert
+- Offline-Modus (HTTP_CACHE_OFFLINE=1): nur aus dem Cache, nie ins Netz
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from scraper_config import ScraperConfig
+
+logger = logging.getLogger(__name__)
+
+# Challenge-/Blockierungsseiten dürfen nie gecacht werden
+UNCACHEABLE_MARKERS = ('just a moment', 'challenge-platform', 'cf-browser-verification')
+
+# Header die nach dem Dekomprimieren nicht mehr zum gespeicherten Body passen
+DROPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+
+class HttpCache:
+    """URL-basierter HTTP Cache mit TTL und bedingter Revalidierung"""
+
+    def __init__(self, path=None, ttl=None, offline=None):
+        self.path = path or ScraperConfig.HTTP_CACHE_PATH
+        self.ttl = ScraperConfig.HTTP_CACHE_TTL if ttl is None else ttl
+        self.offline = ScraperConfig.HTTP_CACHE_OFFLINE if offline is None else offline
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL
+            )
+        ''')
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls):
+        """Cache mit Einstellungen aus ScraperConfig (oder None wenn deaktiviert)"""
+        if not ScraperConfig.HTTP_CACHE_ENABLED:
+            return None
+        return cls()
+
+    def _load(self, url):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status, headers, body, etag, last_modified, fetched_at FROM http_cache WHERE url = ?',
+                (url,)
+            ).fetchone()
+        if not row:
+            return None
+        status, headers, body, etag, last_modified, fetched_at = row
+        return {
+            'status': status,
+            'headers': json.loads(headers),
+            'body': zlib.decompress(body),
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': fetched_at,
+        }
+
+    def _store(self, url, response):
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS}
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO http_cache (url, status, headers, body, etag, last_modified, fetched_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (
+                    url,
+                    response.status_code,
+                    json.dumps(headers),
+                    zlib.compress(response.content, 6),
+                    response.headers.get('ETag'),
+                    response.headers.get('Last-Modified'),
+                    time.time(),
+                )
+            )
+            self._conn.commit()
+
+    def _touch(self, url, response):
+        """Nach 304: Frische zurücksetzen (und ggf. neuen Validator übernehmen)"""
+        with self._lock:
+            self._conn.execute(
+                'UPDATE http_cache SET fetched_at = ?, etag = COALESCE(?, etag), '
+                'last_modified = COALESCE(?, last_modified) WHERE url = ?',
+                (time.time(), response.headers.get('ETag'), response.headers.get('Last-Modified'), url)
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def _is_cacheable(response):
+        if response.status_code != 200:
+            return False
+        content_type = response.headers.get('Content-Type', '')
+        if 'text' in content_type or 'html' in content_type:
+            text = response.text[:20000].lower()
+            return not any(marker in text for marker in UNCACHEABLE_MARKERS)
+        return True
+
+    @staticmethod
+    def _build_response(url, entry):
+        response = requests.models.Response()
+        response.status_code = entry['status']
+        response.reason = 'OK' if entry['status'] == 200 else ''
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = entry['body']
+        response.url = url
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or 'utf-8'
+        response.from_cache = True
+        return response
+
+    def is_fresh(self, url):
+        """True wenn die URL ohne Netzwerkzugriff beantwortet werden kann"""
+        with self._lock:
+            row = self._conn.execute('SELECT fetched_at FROM http_cache WHERE url = ?', (url,)).fetchone()
+        if not row:
+            return False
+        return self.offline or (time.time() - row[0]) < self.ttl
+
+    def get(self, session, url, refresh=False, **kwargs):
+        """
+        GET über den Cache
+
+        Args:
+            session: requests.Session (oder cloudscraper) für den Netzwerkabruf
+            url: Ziel-URL
+            refresh: Cache-Frische ignorieren (Revalidierung trotzdem möglich)
+            **kwargs: weitere Argumente für session.get (timeout, headers, ...)
+
+        Returns:
+            requests.Response (response.from_cache=True wenn aus dem Cache)
+        """
+        entry = self._load(url)
+
+        if self.offline:
+            if entry:
+                self.hits += 1
+                return self._build_response(url, entry)
+            self.misses += 1
+            logger.warning(f"Offline cache miss: {url}")
+            response = requests.models.Response()
+            response.status_code = 504
+            response.reason = 'Offline cache miss'
+            response._content = b''
+            response.url = url
+            response.from_cache = True
+            return response
+
+        if entry and not refresh and (time.time() - entry['fetched_at']) < self.ttl:
+            self.hits += 1
+            return self._build_response(url, entry)
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = session.get(url, headers=headers or None, **kwargs)
+
+        if response.status_code == 304 and entry:
+            self.revalidated += 1
+            self._touch(url, response)
+            return self._build_response(url, entry)
+
+        self.misses += 1
+        response.from_cache = False
+        if self._is_cacheable(response):
+            self._store(url, response)
+        return response
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'revalidated': self.revalidated}
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM http_cache')
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,156 @@
+"""
+Image Backoff
+Negativ-Cache für den Image Proxy: fehlgeschlagene Upstream-Abrufe werden pro
+ImageProxy-Zeile und pro Bild-Host gespeichert, damit tote URLs nicht bei
+jedem Request erneut einen 10-Sekunden-Timeout kosten.
+
+- Pro Bild: exponentielles Retry-Fenster (fail_count/retry_after). 401/403/404/410
+  (z.B. abgelaufene pic.revolico.com/users Tokens) starten mit 1 h, Timeouts
+  und 5xx mit 1 min; max. 7 Tage
+- Pro Host: Circuit Breaker (image_origins). Nach HOST_FAILURE_THRESHOLD
+  Timeouts/Verbindungsfehlern/5xx in Folge ist der Host für ein exponentiell
+  wachsendes Fenster gesperrt; danach darf genau ein Probe-Request durch
+  (half-open). Jede Antwort des Hosts (auch 404) schließt den Breaker wieder.
+
+Innerhalb der Fenster liefert /api/image-proxy lokal den Platzhalter aus.
+
+Verwendung (Request-Pfad, vor dem Upstream-Abruf):
+    blocked = ImageBackoff.blocked_for(proxy)
+    if blocked:
+        return placeholder_image(max_age=blocked)
+"""
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import Optional
+from urllib.parse import urlsplit
+
+from sqlalchemy.exc import IntegrityError
+
+from metrics import metrics
+from models import db, ImageOrigin, ImageProxy
+
+logger = logging.getLogger(__name__)
+
+RETRY_BASE_SECONDS = 60
+MISSING_RETRY_BASE_SECONDS = 3600
+MAX_RETRY_SECONDS = 7 * 86400
+# Bild existiert nicht (mehr) bzw. Token abgelaufen
+MISSING_STATUSES = {401, 403, 404, 410}
+
+HOST_FAILURE_THRESHOLD = 5
+HOST_OPEN_BASE_SECONDS = 30
+HOST_OPEN_MAX_SECONDS = 3600
+# Half-open: so lange gehört der Host dem Probe-Request (connect + read Timeout)
+PROBE_SECONDS = 15
+
+
+def origin_host(url: str) -> str:
+    return (urlsplit(url).hostname or '').lower()
+
+
+def is_host_failure(status_code: Optional[int]) -> bool:
+    """Timeouts/Verbindungsfehler (kein Status), 5xx und 429 sprechen gegen den ganzen Host"""
+    return status_code is None or status_code >= 500 or status_code == 429
+
+
+def retry_seconds(fail_count: int, status_code: Optional[int]) -> int:
+    """Exponentielles Retry-Fenster für ein einzelnes Bild"""
+    base = MISSING_RETRY_BASE_SECONDS if status_code in MISSING_STATUSES else RETRY_BASE_SECONDS
+    return min(MAX_RETRY_SECONDS, base * 2 ** max(0, fail_count - 1))
+
+
+def _remaining(until: datetime, now: datetime) -> int:
+    return max(1, math.ceil((until - now).total_seconds()))
+
+
+class ImageBackoff:
+    """Service für Negativ-Cache und Host-Circuit-Breaker (braucht einen aktiven App-Context)"""
+
+    @staticmethod
+    def blocked_for(proxy: ImageProxy) -> int:
+        """
+        Sekunden, die für dieses Bild noch kein Upstream-Abruf stattfinden soll
+        Returns: 0 = Abruf erlaubt
+        """
+        now = datetime.utcnow()
+        if proxy.retry_after and proxy.retry_after > now:
+            metrics.inc('image_proxy_total', result='negative_cached')
+            return _remaining(proxy.retry_after, now)
+
+        origin = ImageOrigin.query.filter_by(host=origin_host(proxy.original_url)).first()
+        if not origin or origin.consecutive_failures < HOST_FAILURE_THRESHOLD:
+            return 0
+        if origin.opened_until and origin.opened_until > now:
+            metrics.inc('image_proxy_total', result='circuit_open')
+            return _remaining(origin.opened_until, now)
+
+        # Fenster abgelaufen: nur ein Request (wer das Update gewinnt) testet den Host
+        claimed = ImageOrigin.query.filter(
+            ImageOrigin.id == origin.id,
+            db.or_(ImageOrigin.opened_until.is_(None), ImageOrigin.opened_until <= now)
+        ).update({'opened_until': now + timedelta(seconds=PROBE_SECONDS)}, synchronize_session=False)
+        db.session.commit()
+        if claimed:
+            metrics.inc('image_proxy_total', result='circuit_probe')
+            return 0
+        metrics.inc('image_proxy_total', result='circuit_open')
+        return PROBE_SECONDS
+
+    @staticmethod
+    def record_success(url: str) -> None:
+        """Host hat geantwortet: Breaker schließen (die Bild-Zeile setzt image_fetcher zurück)"""
+        now = datetime.utcnow()
+        ImageOrigin.query.filter(
+            ImageOrigin.host == origin_host(url),
+            db.or_(ImageOrigin.consecutive_failures > 0, ImageOrigin.open_count > 0)
+        ).update({'consecutive_failures': 0, 'open_count': 0, 'opened_until': None,
+                  'last_success_at': now}, synchronize_session=False)
+        db.session.commit()
+
+    @staticmethod
+    def record_failure(image_hash: str, url: str, status_code: Optional[int] = None,
+                       error: Optional[str] = None) -> None:
+        """
+        Fehlgeschlagener Abruf: Retry-Fenster des Bildes verlängern und bei
+        Host-Fehlern den Breaker-Zähler erhöhen
+        status_code None = Timeout/Verbindungsfehler
+        """
+        now = datetime.utcnow()
+        proxy = ImageProxy.query.filter_by(image_hash=image_hash).first()
+        if proxy:
+            proxy.fail_count = (proxy.fail_count or 0) + 1
+            proxy.last_status = status_code
+            proxy.last_failure_at = now
+            proxy.retry_after = now + timedelta(seconds=retry_seconds(proxy.fail_count, status_code))
+        db.session.commit()
+
+        if not is_host_failure(status_code):
+            # Der Host lebt, nur dieses Bild fehlt
+            ImageBackoff.record_success(url)
+            return
+
+        host = origin_host(url)
+        origin = ImageOrigin.query.filter_by(host=host).first()
+        if not origin:
+            origin = ImageOrigin(host=host, consecutive_failures=0, open_count=0)
+            db.session.add(origin)
+            try:
+                db.session.flush()
+            except IntegrityError:
+                # Parallel von einem anderen Download angelegt
+                db.session.rollback()
+                origin = ImageOrigin.query.filter_by(host=host).first()
+
+        origin.consecutive_failures += 1
+        origin.last_failure_at = now
+        origin.last_error = (error or f'HTTP {status_code}')[:200]
+        # Nachzügler aus gerade geöffnetem Fenster verlängern es nicht (nur ein Probe-Fehlschlag tut das)
+        already_open = origin.opened_until and origin.opened_until > now + timedelta(seconds=PROBE_SECONDS)
+        if origin.consecutive_failures >= HOST_FAILURE_THRESHOLD and not already_open:
+            origin.open_count += 1
+            window = min(HOST_OPEN_MAX_SECONDS, HOST_OPEN_BASE_SECONDS * 2 ** (origin.open_count - 1))
+            origin.opened_until = now + timedelta(seconds=window)
+            logger.warning(f"Image origin {host} failing ({origin.consecutive_failures} in a row): "
+                           f"circuit open for {window}s")
+        db.session.commit()
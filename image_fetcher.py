@@ -0,0 +1,243 @@
+"""
+Image Fetcher
+Upstream-Backend für /api/image-proxy bei Cache-Miss:
+
+- Eine gemeinsame requests.Session mit Connection-Pool pro Host
+  (keine neue TCP/TLS-Verbindung pro Bild)
+- Single-Flight: gleichzeitige Misses für denselben image_hash teilen sich
+  einen Upstream-Download
+- Tee-to-Cache: der Download läuft in einem eigenen Thread und schreibt
+  chunkweise nach cached_images/<hash>.<ext>.part; alle wartenden Clients
+  lesen die wachsende Datei mit und bekommen das Bild gestreamt. Nach dem
+  letzten Chunk wird die Datei umbenannt und ImageProxy.cached gesetzt,
+  spätere Requests gehen direkt über send_file.
+
+Verwendung:
+    from image_fetcher import image_fetcher
+
+    flight = image_fetcher.fetch(app, proxy.image_hash, proxy.original_url)
+    if flight.wait_ready() and flight.ok:
+        return Response(flight.stream(), mimetype=flight.content_type)   # FlightFailed -> Platzhalter
+"""
+import base64
+import logging
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = 'cached_images'
+CHUNK_SIZE = 64 * 1024
+# (connect, read) - read gilt pro Chunk, nicht für das ganze Bild
+TIMEOUT = (5, 10)
+POOL_MAXSIZE = 16
+
+# 1x1 transparentes PNG statt kaputter Bild-Icons in der UI
+PLACEHOLDER_PNG = base64.b64decode(
+    'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=='
+)
+
+
+def upstream_headers(url: str) -> dict:
+    """Browser-ähnliche Header (Hotlinking-Schutz von Revolico/Google)"""
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0',
+        'Accept': 'image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'DNT': '1',
+        'Sec-Fetch-Dest': 'image',
+        'Sec-Fetch-Mode': 'no-cors',
+        'Sec-Fetch-Site': 'cross-site',
+    }
+    if 'lh3.googleusercontent.com' in url:
+        headers['Referer'] = 'https://www.google.com/'
+    elif 'revolico.com' in url:
+        headers['Referer'] = 'https://www.revolico.com/'
+    return headers
+
+
+def extension_for(content_type: str) -> str:
+    """Dateiendung für den Cache anhand des Content-Type"""
+    content_type = content_type or ''
+    for ext in ('png', 'webp', 'gif'):
+        if ext in content_type:
+            return ext
+    return 'jpg'
+
+
+class FlightFailed(Exception):
+    """Download abgebrochen oder hängt - die Antwort darf nicht als vollständiges Bild enden"""
+
+
+class Flight:
+    """Ein laufender (oder abgeschlossener) Upstream-Download"""
+
+    def __init__(self, image_hash: str):
+        self.image_hash = image_hash
+        self.condition = threading.Condition()
+        self.ready = False          # Status/Header von Upstream bekannt
+        self.ok = False
+        self.status_code = None
+        self.content_type = None
+        self.part_path = None
+        self.cache_path = None
+        self.size = 0               # bisher geschriebene Bytes
+        self.done = False
+        self.error = None
+
+    def wait_ready(self, timeout: float = sum(TIMEOUT) + 1) -> bool:
+        """Wartet, bis Upstream geantwortet hat (oder gescheitert ist)"""
+        with self.condition:
+            return self.condition.wait_for(lambda: self.ready, timeout=timeout)
+
+    def stream(self):
+        """
+        Öffnet die (wachsende) Cache-Datei und liefert einen Generator darüber -
+        für beliebig viele Clients
+
+        Raises:
+            FlightFailed: Download schon gescheitert (sofort) bzw. Abbruch/Stillstand
+                          während des Streamens (bricht die Verbindung ab, statt ein
+                          abgeschnittenes Bild mit langer max-age auszuliefern)
+        """
+        with self.condition:
+            # Unter dem Lock öffnen: das Umbenennen .part -> fertige Datei passiert ebenfalls unter dem Lock
+            if self.error or not self.ok:
+                raise FlightFailed(self.error or f'HTTP {self.status_code}')
+            try:
+                f = open(self.cache_path if self.done else self.part_path, 'rb')
+            except OSError as e:
+                raise FlightFailed(str(e))
+        return self._read(f)
+
+    def _read(self, f):
+        with f:
+            position = 0
+            while True:
+                with self.condition:
+                    self.condition.wait_for(
+                        lambda: self.size > position or self.done or self.error, timeout=TIMEOUT[1])
+                    available, done, error = self.size, self.done, self.error
+                if error:
+                    raise FlightFailed(error)
+                if available > position:
+                    data = f.read(min(available - position, CHUNK_SIZE))
+                    position += len(data)
+                    yield data
+                elif done:
+                    return
+                else:
+                    raise FlightFailed(f'no data for {TIMEOUT[1]}s')
+
+    def _update(self, **fields):
+        with self.condition:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.condition.notify_all()
+
+
+class ImageFetcher:
+    """Gepoolte Session + Single-Flight-Registry (ein Objekt pro Prozess)"""
+
+    def __init__(self, cache_dir: str = CACHE_DIR, pool_maxsize: int = POOL_MAXSIZE):
+        self.cache_dir = cache_dir
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, app, image_hash: str, url: str) -> Flight:
+        """
+        Startet den Download oder hängt sich an einen laufenden an
+        Returns: Flight (mit wait_ready() auf die Upstream-Antwort warten)
+        """
+        with self._lock:
+            flight = self._flights.get(image_hash)
+            if flight is not None:
+                metrics.inc('image_proxy_total', result='fetch_shared')
+                return flight
+            flight = Flight(image_hash)
+            self._flights[image_hash] = flight
+
+        metrics.inc('image_proxy_total', result='fetch_upstream')
+        threading.Thread(target=self._download, args=(app, flight, url),
+                         name=f'image-fetch-{image_hash[:8]}', daemon=True).start()
+        return flight
+
+    def _download(self, app, flight: Flight, url: str) -> None:
+        try:
+            with metrics.timer('image_proxy_seconds', operation='upstream_fetch'):
+                self._stream_to_cache(flight, url)
+        except Exception as e:
+            logger.warning(f"Image fetch failed for {flight.image_hash[:12]}: {e}")
+            # Erst den Fehler setzen, dann löschen: neue Leser öffnen die Datei nicht mehr
+            flight._update(ready=True, done=True, error=str(e))
+            if flight.part_path and os.path.exists(flight.part_path):
+                os.remove(flight.part_path)
+
+        try:
+            self._record_outcome(app, flight, url)
+        except Exception as e:
+            logger.warning(f"Could not record image fetch outcome for {flight.image_hash[:12]}: {e}")
+        finally:
+            with self._lock:
+                self._flights.pop(flight.image_hash, None)
+
+    def _stream_to_cache(self, flight: Flight, url: str) -> None:
+        with self.session.get(url, headers=upstream_headers(url), timeout=TIMEOUT, stream=True) as response:
+            metrics.inc('image_proxy_total', result=f'download_{response.status_code}')
+            if response.status_code != 200:
+                flight._update(ready=True, done=True, status_code=response.status_code)
+                return
+
+            content_type = response.headers.get('Content-Type', 'image/jpeg')
+            os.makedirs(self.cache_dir, exist_ok=True)
+            cache_path = os.path.join(self.cache_dir, f"{flight.image_hash}.{extension_for(content_type)}")
+            part_path = f'{cache_path}.{threading.get_ident()}.part'
+
+            with open(part_path, 'wb') as f:
+                # Clients dürfen ab jetzt lesen
+                flight._update(ready=True, ok=True, status_code=200, content_type=content_type,
+                               part_path=part_path, cache_path=cache_path)
+                size = 0
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    if not chunk:
+                        continue
+                    f.write(chunk)
+                    f.flush()
+                    size += len(chunk)
+                    flight._update(size=size)
+
+            with flight.condition:
+                os.replace(part_path, cache_path)
+                flight.done = True
+                flight.condition.notify_all()
+
+    @staticmethod
+    def _record_outcome(app, flight: Flight, url: str) -> None:
+        """Erfolg: Cache-Eintrag setzen; Fehler: Negativ-Cache/Circuit Breaker (image_backoff.py)"""
+        from image_backoff import ImageBackoff
+        from models import db, ImageProxy
+
+        with app.app_context():
+            if flight.ok and not flight.error:
+                ImageProxy.query.filter_by(image_hash=flight.image_hash).update({
+                    'cached': True, 'cache_path': flight.cache_path,
+                    'fail_count': 0, 'last_status': 200, 'retry_after': None,
+                }, synchronize_session=False)
+                db.session.commit()
+                ImageBackoff.record_success(url)
+            else:
+                # Abbruch mitten im Body zählt wie ein Timeout
+                status_code = None if flight.error else flight.status_code
+                ImageBackoff.record_failure(flight.image_hash, url, status_code=status_code, error=flight.error)
+
+
+image_fetcher = ImageFetcher()
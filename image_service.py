@@ -4,8 +4,9 @@ Verwaltet Image-URLs und erstellt Hash-basierte IDs
 """
 import hashlib
 import os
-import requests
 from models import db, ImageProxy
+from image_fetcher import extension_for, image_fetcher, upstream_headers
+from metrics import metrics
 
 
 class ImageProxyService:
@@ -24,19 +25,22 @@ class ImageProxyService:
         """
         image_hash = ImageProxyService.create_hash(url)
 
-        # Check if already exists
-        existing = ImageProxy.query.filter_by(image_hash=image_hash).first()
-        if existing:
-            return existing.image_hash
+        with metrics.timer('image_proxy_seconds', operation='get_or_create'):
+            # Check if already exists
+            existing = ImageProxy.query.filter_by(image_hash=image_hash).first()
+            if existing:
+                metrics.inc('image_proxy_total', result='existing')
+                return existing.image_hash
 
-        # Create new proxy entry
-        proxy = ImageProxy(
-            image_hash=image_hash,
-            original_url=url
-        )
-        db.session.add(proxy)
-        db.session.commit()
+            # Create new proxy entry
+            proxy = ImageProxy(
+                image_hash=image_hash,
+                original_url=url
+            )
+            db.session.add(proxy)
+            db.session.commit()
 
+        metrics.inc('image_proxy_total', result='created')
         return proxy.image_hash
 
     @staticmethod
@@ -87,27 +91,16 @@ class ImageProxyService:
                 print(f"Image already cached: {existing.cache_path}")
                 return existing.image_hash
 
-            # Download image with browser headers (for Revolico)
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0',
-                'Accept': 'image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
-                'Referer': 'https://www.revolico.com/' if 'revolico.com' in url else None
-            }
-
-            response = requests.get(url, headers=headers, timeout=10)
+            # Download image with browser headers (gemeinsame, gepoolte Session)
+            with metrics.timer('image_proxy_seconds', operation='download'):
+                response = image_fetcher.session.get(url, headers=upstream_headers(url), timeout=10)
+            metrics.inc('image_proxy_total', result=f'download_{response.status_code}')
             if response.status_code != 200:
                 print(f"Failed to download image from {url}: HTTP {response.status_code}")
                 return None
 
             # Determine file extension from content type
-            content_type = response.headers.get('Content-Type', 'image/jpeg')
-            ext = 'jpg'
-            if 'png' in content_type:
-                ext = 'png'
-            elif 'webp' in content_type:
-                ext = 'webp'
-            elif 'gif' in content_type:
-                ext = 'gif'
+            ext = extension_for(response.headers.get('Content-Type', 'image/jpeg'))
 
             # Save to cache directory
             cache_filename = f"{image_hash}.{ext}"
@@ -0,0 +1,260 @@
+"""
+Job Queue
+Persistente Warteschlange für Scraping-Jobs (scrape_jobs Tabelle, SQLite oder
+Postgres). Die Web-App legt Jobs an, scrape_worker.py holt sie ab und meldet
+Fortschritt über scrape_job_events zurück. Alle Methoden brauchen einen
+aktiven App-Context.
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from models import db, ScrapeJob, ScrapeJobEvent
+
+# Postgres: Advisory-Lock, der claim() über alle Worker serialisiert (max_running)
+CLAIM_LOCK_KEY = 0x5c4a0b
+
+
+class JobQueue:
+    """Service für Anlegen, Abholen und Abschließen von Scraping-Jobs"""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    ACTIVE = (QUEUED, RUNNING)
+    FINISHED = (COMPLETED, FAILED, CANCELLED)
+
+    KINDS = ('scrape', 'refresh')
+
+    @staticmethod
+    def scope_for(kind: str, params: dict) -> str:
+        """
+        Crawl-Bereich eines Jobs: Kategorie-Slug bzw. 'home' für Scraping,
+        'refresh' für den Refresh-Modus. Pro Bereich läuft höchstens ein Job
+        """
+        if kind == 'refresh':
+            return 'refresh'
+        return params.get('category') or 'home'
+
+    @staticmethod
+    def enqueue(kind: str, params: dict = None, priority: int = 0) -> ScrapeJob:
+        """
+        Legt einen neuen Job mit Status 'queued' an
+
+        Raises:
+            ValueError: unbekannter Job-Typ oder unbekannte Kategorie
+        """
+        from scraper_config import ScraperConfig
+
+        params = dict(params or {})
+        if kind not in JobQueue.KINDS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        category = params.get('category')
+        if category and category not in ScraperConfig.CATEGORY_START_URLS:
+            raise ValueError(f"Unknown category: {category}")
+
+        job = ScrapeJob(
+            kind=kind,
+            params=params,
+            priority=int(priority or 0),
+            scope=JobQueue.scope_for(kind, params),
+            status=JobQueue.QUEUED
+        )
+        db.session.add(job)
+        db.session.commit()
+        return job
+
+    @staticmethod
+    def get(job_id: int) -> Optional[ScrapeJob]:
+        return db.session.get(ScrapeJob, job_id)
+
+    @staticmethod
+    def claim(worker_id: str, max_running: int = 0) -> Optional[ScrapeJob]:
+        """
+        Holt den wartenden Job mit der höchsten Priorität (bei Gleichstand den
+        ältesten) und markiert ihn als 'running'. Jobs, deren Bereich gerade
+        schon bearbeitet wird, warten. Alle Bedingungen (status='queued', kein
+        laufender Job im selben Bereich, max_running) stehen im UPDATE selbst,
+        zusätzlich erzwingt ux_scrape_jobs_running_scope einen laufenden Job pro Bereich
+
+        Args:
+            worker_id: Name des Workers
+            max_running: max. gleichzeitig laufende Jobs über alle Worker (0 = unbegrenzt)
+
+        Returns:
+            ScrapeJob oder None wenn nichts Passendes wartet
+        """
+        # Vorfilter ohne Lock - entschieden wird im UPDATE
+        running = ScrapeJob.query.filter_by(status=JobQueue.RUNNING).with_entities(ScrapeJob.scope).all()
+        if max_running and len(running) >= max_running:
+            return None
+        busy_scopes = {scope for (scope,) in running if scope}
+
+        candidates = ScrapeJob.query.filter_by(status=JobQueue.QUEUED) \
+            .order_by(ScrapeJob.priority.desc(), ScrapeJob.id) \
+            .with_entities(ScrapeJob.id, ScrapeJob.scope).limit(20).all()
+
+        other = db.aliased(ScrapeJob)
+        for job_id, scope in candidates:
+            if scope in busy_scopes:
+                continue
+            conditions = [ScrapeJob.id == job_id, ScrapeJob.status == JobQueue.QUEUED]
+            if scope:
+                conditions.append(~db.exists().where(other.scope == scope, other.status == JobQueue.RUNNING))
+            if max_running:
+                running_count = db.select(db.func.count(other.id)) \
+                    .where(other.status == JobQueue.RUNNING).scalar_subquery()
+                conditions.append(running_count < max_running)
+
+            now = datetime.utcnow()
+            try:
+                JobQueue._lock_claims()
+                claimed = ScrapeJob.query.filter(*conditions).update({
+                    'status': JobQueue.RUNNING,
+                    'worker_id': worker_id,
+                    'started_at': now,
+                    'heartbeat_at': now,
+                }, synchronize_session=False)
+                db.session.commit()
+            except IntegrityError:
+                # Ein anderer Worker hat den Bereich gleichzeitig übernommen
+                db.session.rollback()
+                continue
+            if claimed:
+                return db.session.get(ScrapeJob, job_id)
+        return None
+
+    @staticmethod
+    def _lock_claims() -> None:
+        """
+        Postgres (READ COMMITTED) wertet die Unterabfragen im UPDATE auf einem
+        Snapshot aus - ohne Lock könnten zwei Worker gleichzeitig unter max_running
+        bleiben. SQLite serialisiert Schreibzugriffe ohnehin. Freigabe beim Commit
+        """
+        if db.engine.dialect.name == 'postgresql':
+            db.session.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': CLAIM_LOCK_KEY})
+
+    @staticmethod
+    def heartbeat(job_id: int, progress: dict = None) -> bool:
+        """
+        Aktualisiert das Lebenszeichen (und den Zwischenstand) eines laufenden Jobs
+        Returns: True wenn der Job abgebrochen werden soll
+        """
+        job = db.session.get(ScrapeJob, job_id)
+        if not job:
+            return True
+        db.session.refresh(job)
+        job.heartbeat_at = datetime.utcnow()
+        if progress is not None:
+            job.progress = dict(progress)
+        db.session.commit()
+        return bool(job.cancel_requested)
+
+    @staticmethod
+    def finish(job_id: int, status: str, result=None, error: str = None,
+               progress: dict = None) -> Optional[ScrapeJob]:
+        """Schließt einen Job ab (completed/failed/cancelled)"""
+        job = db.session.get(ScrapeJob, job_id)
+        if not job:
+            return None
+        job.status = status
+        if progress is not None:
+            job.progress = dict(progress)
+        job.result = result
+        job.error = error[:4000] if error else None
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+        return job
+
+    @staticmethod
+    def cancel(job_id: int = None) -> int:
+        """
+        Bricht einen Job (oder alle aktiven Jobs) ab
+        Wartende Jobs werden sofort storniert, laufende bekommen cancel_requested
+        und werden vom Worker beim nächsten Heartbeat beendet
+
+        Returns: Anzahl betroffener Jobs
+        """
+        query = ScrapeJob.query.filter(ScrapeJob.status.in_(JobQueue.ACTIVE))
+        if job_id is not None:
+            query = query.filter(ScrapeJob.id == job_id)
+
+        count = 0
+        for job in query.all():
+            if job.status == JobQueue.QUEUED:
+                job.status = JobQueue.CANCELLED
+                job.finished_at = datetime.utcnow()
+            else:
+                job.cancel_requested = True
+            count += 1
+        db.session.commit()
+        return count
+
+    @staticmethod
+    def active_jobs(kind: str = None) -> List[ScrapeJob]:
+        """Wartende und laufende Jobs (höchste Priorität, dann älteste zuerst)"""
+        query = ScrapeJob.query.filter(ScrapeJob.status.in_(JobQueue.ACTIVE))
+        if kind:
+            query = query.filter_by(kind=kind)
+        return query.order_by(ScrapeJob.priority.desc(), ScrapeJob.id).all()
+
+    @staticmethod
+    def latest_finished() -> Optional[ScrapeJob]:
+        """Zuletzt abgeschlossener Job"""
+        return ScrapeJob.query.filter(ScrapeJob.status.in_(JobQueue.FINISHED)) \
+            .order_by(ScrapeJob.finished_at.desc(), ScrapeJob.id.desc()).first()
+
+    @staticmethod
+    def requeue_stale(timeout_seconds: int = 120) -> int:
+        """
+        Setzt laufende Jobs ohne Heartbeat (abgestürzter Worker) zurück auf 'queued'
+        Returns: Anzahl zurückgesetzter Jobs
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=timeout_seconds)
+        count = ScrapeJob.query.filter(
+            ScrapeJob.status == JobQueue.RUNNING,
+            ScrapeJob.heartbeat_at < cutoff
+        ).update({'status': JobQueue.QUEUED, 'worker_id': None}, synchronize_session=False)
+        db.session.commit()
+        return count
+
+    # ===== Events (Worker -> Web-App) =====
+
+    @staticmethod
+    def add_events(events) -> None:
+        """
+        Speichert Fortschritts-Events
+
+        Args:
+            events: Liste von (job_id, event, payload)
+        """
+        if not events:
+            return
+        db.session.execute(ScrapeJobEvent.__table__.insert(), [
+            {'job_id': job_id, 'event': event, 'payload': payload, 'created_at': datetime.utcnow()}
+            for job_id, event, payload in events
+        ])
+        db.session.commit()
+
+    @staticmethod
+    def last_event_id() -> int:
+        return db.session.query(db.func.max(ScrapeJobEvent.id)).scalar() or 0
+
+    @staticmethod
+    def events_since(last_id: int, limit: int = 500) -> List[ScrapeJobEvent]:
+        """Events mit id > last_id (älteste zuerst)"""
+        return ScrapeJobEvent.query.filter(ScrapeJobEvent.id > last_id) \
+            .order_by(ScrapeJobEvent.id).limit(limit).all()
+
+    @staticmethod
+    def prune_events(max_age_seconds: int = 3600) -> int:
+        """Löscht alte Events (die Web-UI braucht nur die jüngsten)"""
+        cutoff = datetime.utcnow() - timedelta(seconds=max_age_seconds)
+        count = ScrapeJobEvent.query.filter(ScrapeJobEvent.created_at < cutoff).delete(synchronize_session=False)
+        db.session.commit()
+        return count
@@ -0,0 +1,61 @@
+"""
+JSON Provider
+Schneller JSON-Provider für Flask (jsonify, request.get_json) auf Basis von
+orjson. datetime/date werden nativ als ISO-8601 serialisiert, to_dict()
+kann also datetime-Objekte direkt zurückgeben.
+
+Ohne orjson (optionale Abhängigkeit) fällt der Provider auf die
+Standardbibliothek zurück - mit demselben ISO-8601-Format für Datumswerte
+(statt Flasks HTTP-Datumsformat).
+
+Verwendung (in create_app):
+    app.json = FastJSONProvider(app)
+"""
+import json
+from datetime import date, datetime
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ist optional
+    orjson = None
+
+# Nicht-String-Keys (z.B. int-ids in Statistik-Dicts) wie json.dumps erlauben
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    orjson-basierter Provider (kompakte Ausgabe, Keys in Einfügereihenfolge)
+    Nicht native Typen (Decimal, UUID, dataclasses, ...) laufen über default()
+    """
+
+    sort_keys = False
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, (datetime, date)):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs) -> str:
+        if orjson is None or kwargs:
+            kwargs.setdefault('default', self.default)
+            kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+            kwargs.setdefault('sort_keys', self.sort_keys)
+            return json.dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if orjson is None:
+            return super().response(obj)
+        # Bytes direkt in die Response (kein Umweg über str)
+        return self._app.response_class(orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS),
+                                        mimetype=self.mimetype)
@@ -0,0 +1,138 @@
+"""
+Listing Parser
+Liest die Listing-Daten direkt aus dem eingebetteten __NEXT_DATA__ JSON
+einer Revolico Detailseite (ohne Browser / DOM-Zugriffe)
+"""
+import json
+import re
+
+NEXT_DATA_PATTERN = re.compile(
+    r'<script id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL
+)
+
+IMAGE_BASE_URL = 'https://pic.revolico.com/'
+
+# Footer patterns to cut off (these appear at the end of descriptions)
+FOOTER_CUTOFF_PATTERNS = [
+    'teléfono',
+    'más información por whatsapp',
+    'puntos de venta',
+    'llama al',
+    'contacta por',
+    'escríbenos',
+    'para más información'
+]
+
+
+def clean_description(text):
+    """Entfernt Kontakt-Footer (Telefon, WhatsApp, ...) am Ende einer Beschreibung"""
+    if not text:
+        return ''
+
+    text = text.strip()
+    text_lower = text.lower()
+    for pattern in FOOTER_CUTOFF_PATTERNS:
+        # Find where the footer pattern starts
+        pattern_pos = text_lower.find(pattern)
+        if pattern_pos > 50:  # Only cut if there's content before it
+            # Cut off everything from this pattern onwards
+            text = text[:pattern_pos].strip()
+            text_lower = text.lower()
+
+    return text
+
+
+def extract_next_data(html):
+    """
+    Extrahiert das __NEXT_DATA__ JSON aus einer Seite
+    Returns: dict oder None
+    """
+    if not html:
+        return None
+
+    match = NEXT_DATA_PATTERN.search(html)
+    if not match:
+        return None
+
+    try:
+        return json.loads(match.group(1))
+    except ValueError:
+        return None
+
+
+def extract_revolico_id(url):
+    """Revolico ID aus URL (z.B. /item/titulo-123456)"""
+    id_match = re.search(r'/item/[^/?#]+-(\d+)', url or '')
+    return id_match.group(1) if id_match else ''
+
+
+def parse_listing_page(html, url=''):
+    """
+    Parst eine Listing-Detailseite
+
+    Returns:
+        dict mit revolico_id, title, description, price, currency, images,
+        seller_name, category, location, phone_numbers, status, gone
+        oder None wenn die Seite kein __NEXT_DATA__ enthält (z.B. Challenge-Seite)
+    """
+    next_data = extract_next_data(html)
+    if next_data is None:
+        return None
+
+    apollo_state = next_data.get('props', {}).get('pageProps', {}).get('__APOLLO_STATE__', {}) or {}
+    revolico_id = extract_revolico_id(url)
+
+    ad = apollo_state.get(f'AdType:{revolico_id}') if revolico_id else None
+    if ad is None:
+        ad = next((value for key, value in apollo_state.items()
+                   if key.startswith('AdType:') and isinstance(value, dict)), None)
+
+    if not ad:
+        # Seite geladen, aber Anzeige existiert nicht mehr
+        return {'revolico_id': revolico_id, 'url': url, 'gone': True}
+
+    def resolve(ref):
+        if isinstance(ref, dict) and '__ref' in ref:
+            return apollo_state.get(ref['__ref'], {}) or {}
+        return ref or {}
+
+    images = []
+    for image_ref in ad.get('readyImages') or []:
+        gcs_key = resolve(image_ref).get('gcsKey')
+        if gcs_key:
+            images.append(f"{IMAGE_BASE_URL}{gcs_key}_high.jpg")
+
+    phone_numbers = []
+    phone_info = ad.get('phoneInfo') or {}
+    for key in ('firstPhone', 'secondPhone'):
+        phone = phone_info.get(key) or {}
+        if phone.get('number'):
+            digits = re.sub(r'\D', '', f"{phone.get('prefix') or '+53'}{phone['number']}")
+            if digits.startswith('53') and len(digits) == 10:
+                phone_numbers.append(f'+{digits}')
+
+    price = ad.get('price')
+    try:
+        price = float(price) if price is not None else None
+    except (TypeError, ValueError):
+        price = None
+
+    province = resolve(ad.get('province')).get('name', '')
+    municipality = resolve(ad.get('municipality')).get('name', '')
+    status = ad.get('status') or ''
+
+    return {
+        'revolico_id': str(ad.get('id') or revolico_id),
+        'url': url,
+        'title': (ad.get('title') or '').strip(),
+        'description': clean_description(ad.get('description') or ''),
+        'price': price,
+        'currency': (ad.get('currency') or 'USD').upper(),
+        'images': list(dict.fromkeys(images))[:10],
+        'seller_name': ad.get('name'),
+        'category': resolve(ad.get('subcategory')).get('title', ''),
+        'location': ', '.join(part for part in (municipality, province) if part),
+        'phone_numbers': phone_numbers,
+        'status': status,
+        'gone': bool(status) and status != 'PUBLISHED',
+    }
@@ -0,0 +1,66 @@
+"""
+Listing Refresh
+Lädt bekannte Listings leichtgewichtig nach (einfacher HTTP-Abruf + __NEXT_DATA__,
+kein Browser), damit Preis- und Inhaltsänderungen günstig erkannt werden
+"""
+import random
+import time
+
+import requests
+
+from listing_parser import parse_listing_page
+from scraper_config import ScraperConfig
+
+
+class ListingRefresher:
+    """Holt die leichtgewichtigen Daten (Titel, Beschreibung, Preis, Bilder) eines Listings"""
+
+    def __init__(self, session=None, min_delay=None, max_delay=None, http_cache=None):
+        self.config = ScraperConfig()
+        self.session = session or requests.Session()
+        self.http_cache = http_cache
+        self.min_delay = self.config.MIN_DELAY if min_delay is None else min_delay
+        self.max_delay = self.config.MAX_DELAY if max_delay is None else max_delay
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'es-ES,es;q=0.9,en;q=0.8',
+            'Referer': 'https://www.revolico.com/',
+        })
+
+    def wait(self):
+        """Politeness-Delay zwischen zwei Abrufen"""
+        if self.max_delay > 0:
+            time.sleep(random.uniform(self.min_delay, self.max_delay))
+
+    def fetch(self, url):
+        """
+        Lädt ein Listing und parst die leichtgewichtigen Daten
+
+        Returns:
+            Tuple (status, data) mit status 'ok', 'gone' oder 'error'
+        """
+        try:
+            if self.http_cache:
+                # Immer revalidieren: unveränderte Seiten kommen als 304 zurück
+                response = self.http_cache.get(self.session, url, refresh=True, timeout=self.config.TIMEOUT)
+            else:
+                response = self.session.get(url, timeout=self.config.TIMEOUT)
+        except requests.RequestException as e:
+            return 'error', str(e)
+
+        if response.status_code in (404, 410):
+            return 'gone', None
+
+        if response.status_code != 200:
+            return 'error', f'HTTP {response.status_code}'
+
+        data = parse_listing_page(response.text, url)
+        if data is None:
+            # Kein __NEXT_DATA__ - vermutlich Challenge/Blockierung, nicht "gone"
+            return 'error', 'No listing data in page (blocked?)'
+
+        if data.get('gone'):
+            return 'gone', data
+
+        return 'ok', data
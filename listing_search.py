@@ -0,0 +1,214 @@
+"""
+Listing Search
+Volltextsuche über Titel und Beschreibung der ScrapedListings.
+
+- SQLite: FTS5-Tabelle listings_fts (external content auf scraped_listings),
+  per Trigger synchron gehalten - auch bei Bulk-Inserts und query.delete()
+- Postgres: generierte tsvector-Spalte search_vector mit GIN-Index
+
+Ranking per bm25 (SQLite) bzw. ts_rank_cd (Postgres), Titel zählt stärker als
+Beschreibung. Seiten per Keyset-Cursor (score, id) statt OFFSET, damit auch
+tiefe Seiten nur die Treffer ab dem Cursor sortieren müssen.
+"""
+import base64
+import html
+import re
+from typing import Optional
+
+from sqlalchemy import text
+
+from models import db, ScrapedListing
+
+# Steuerzeichen als Snippet-Marker, damit der Listing-Text vor dem Einsetzen von <mark> escaped werden kann
+_MARK_START = '\x02'
+_MARK_END = '\x03'
+
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+SQLITE_SETUP = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS listings_fts USING fts5(
+        title, description,
+        content='scraped_listings', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS listings_fts_ai AFTER INSERT ON scraped_listings BEGIN
+        INSERT INTO listings_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS listings_fts_ad AFTER DELETE ON scraped_listings BEGIN
+        INSERT INTO listings_fts(listings_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    # Nur bei echten Text-Änderungen neu indizieren (UPDATE OF feuert auch, wenn der Wert gleich bleibt)
+    """CREATE TRIGGER IF NOT EXISTS listings_fts_au AFTER UPDATE OF title, description ON scraped_listings
+    WHEN old.title IS NOT new.title OR old.description IS NOT new.description BEGIN
+        INSERT INTO listings_fts(listings_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO listings_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+]
+
+POSTGRES_SETUP = [
+    """ALTER TABLE scraped_listings ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('spanish', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('spanish', coalesce(description, '')), 'B')
+        ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_scraped_listings_search_vector ON scraped_listings USING GIN (search_vector)",
+]
+
+# Aufsteigender score = besser; Snippets nur für die Treffer der aktuellen Seite (zweite Abfrage)
+SQLITE_QUERY = """
+    SELECT id, score FROM (
+        SELECT rowid AS id, bm25(listings_fts, 10.0, 1.0) AS score
+        FROM listings_fts WHERE listings_fts MATCH :query
+    )
+    WHERE :after_score IS NULL OR score > :after_score OR (score = :after_score AND id > :after_id)
+    ORDER BY score, id
+    LIMIT :limit
+"""
+
+SQLITE_SNIPPETS = f"""
+    SELECT rowid AS id, snippet(listings_fts, -1, '{_MARK_START}', '{_MARK_END}', '…', 16) AS snippet
+    FROM listings_fts WHERE listings_fts MATCH :query AND rowid IN ({{ids}})
+"""
+
+POSTGRES_QUERY = """
+    SELECT id, score FROM (
+        SELECT id, -ts_rank_cd(search_vector, to_tsquery('spanish', :query)) AS score
+        FROM scraped_listings WHERE search_vector @@ to_tsquery('spanish', :query)
+    ) AS hits
+    WHERE CAST(:after_score AS double precision) IS NULL OR score > :after_score
+          OR (score = :after_score AND id > :after_id)
+    ORDER BY score, id
+    LIMIT :limit
+"""
+
+POSTGRES_SNIPPETS = f"""
+    SELECT id, ts_headline('spanish', coalesce(description, ''), to_tsquery('spanish', :query),
+                           'StartSel={_MARK_START}, StopSel={_MARK_END}, MaxWords=16, MinWords=6') AS snippet
+    FROM scraped_listings WHERE id IN ({{ids}})
+"""
+
+
+class ListingSearch:
+    """Service für die Volltextsuche (braucht einen aktiven App-Context)"""
+
+    @staticmethod
+    def dialect() -> str:
+        return db.engine.dialect.name
+
+    @staticmethod
+    def setup() -> bool:
+        """
+        Legt Index und Sync (Trigger bzw. generierte Spalte) an, falls sie fehlen
+        Returns: True wenn der Index neu angelegt und befüllt wurde
+        """
+        dialect = ListingSearch.dialect()
+        if dialect == 'sqlite':
+            created = not db.inspect(db.engine).has_table('listings_fts')
+            update_trigger = db.session.execute(text(
+                "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'listings_fts_au'"
+            )).scalar()
+            if update_trigger and 'WHEN' not in update_trigger:
+                # Ältere Version ohne WHEN-Bedingung ersetzen
+                db.session.execute(text("DROP TRIGGER listings_fts_au"))
+            for statement in SQLITE_SETUP:
+                db.session.execute(text(statement))
+            if created:
+                db.session.execute(text("INSERT INTO listings_fts(listings_fts) VALUES ('rebuild')"))
+        elif dialect == 'postgresql':
+            columns = [col['name'] for col in db.inspect(db.engine).get_columns('scraped_listings')]
+            created = 'search_vector' not in columns
+            for statement in POSTGRES_SETUP:
+                db.session.execute(text(statement))
+        else:
+            return False
+        db.session.commit()
+        return created
+
+    @staticmethod
+    def rebuild() -> None:
+        """Baut den Suchindex komplett neu auf (SQLite; Postgres rechnet die Spalte selbst)"""
+        if ListingSearch.dialect() == 'sqlite':
+            db.session.execute(text("INSERT INTO listings_fts(listings_fts) VALUES ('rebuild')"))
+            db.session.commit()
+
+    @staticmethod
+    def terms(query: str) -> list:
+        """Suchbegriffe aus der Nutzereingabe (nur Wortzeichen, keine Such-Syntax)"""
+        return _TERM_RE.findall(query or '')[:10]
+
+    @staticmethod
+    def match_expression(terms, dialect: str) -> str:
+        """Alle Begriffe müssen vorkommen, der letzte auch als Präfix (Suche während der Eingabe)"""
+        if dialect == 'postgresql':
+            return ' & '.join(terms[:-1] + [f"{terms[-1]}:*"])
+        return ' '.join([f'"{term}"' for term in terms[:-1]] + [f'"{terms[-1]}"*'])
+
+    @staticmethod
+    def encode_cursor(score: float, listing_id: int) -> str:
+        return base64.urlsafe_b64encode(f'{score!r}:{listing_id}'.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor: str):
+        """Returns: (score, id) - ValueError bei ungültigem Cursor"""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            score, listing_id = base64.urlsafe_b64decode(padded.encode()).decode().split(':')
+            return float(score), int(listing_id)
+        except Exception:
+            raise ValueError('Invalid cursor')
+
+    @staticmethod
+    def highlight(snippet: Optional[str]) -> Optional[str]:
+        """Snippet HTML-escapen und Treffer mit <mark> markieren"""
+        if snippet is None:
+            return None
+        escaped = html.escape(snippet)
+        return escaped.replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>')
+
+    @staticmethod
+    def search(query: str, limit: int = 20, cursor: Optional[str] = None) -> dict:
+        """
+        Volltextsuche mit Ranking, Snippets und Keyset-Paging
+
+        Returns:
+            {'results': [(ScrapedListing, score, snippet_html), ...], 'next_cursor': str oder None}
+        Raises:
+            ValueError: leere Suche, ungültiger Cursor oder nicht unterstützte Datenbank
+        """
+        terms = ListingSearch.terms(query)
+        if not terms:
+            raise ValueError('Search query must contain at least one word')
+
+        dialect = ListingSearch.dialect()
+        if dialect == 'sqlite':
+            sql, snippet_sql = SQLITE_QUERY, SQLITE_SNIPPETS
+        elif dialect == 'postgresql':
+            sql, snippet_sql = POSTGRES_QUERY, POSTGRES_SNIPPETS
+        else:
+            raise ValueError(f'Full-text search is not supported on {dialect}')
+
+        match = ListingSearch.match_expression(terms, dialect)
+        after_score, after_id = ListingSearch.decode_cursor(cursor) if cursor else (None, None)
+        rows = db.session.execute(text(sql), {
+            'query': match,
+            'after_score': after_score,
+            'after_id': after_id,
+            'limit': limit + 1,
+        }).fetchall()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        ids = [int(row.id) for row in rows]
+
+        snippets = {}
+        if ids:
+            snippets = dict(db.session.execute(
+                text(snippet_sql.format(ids=', '.join(str(i) for i in ids))), {'query': match}
+            ).fetchall())
+
+        listings = {l.id: l for l in ScrapedListing.query.filter(ScrapedListing.id.in_(ids)).all()}
+        results = [(listings[row.id], row.score, ListingSearch.highlight(snippets.get(row.id)))
+                   for row in rows if row.id in listings]
+
+        next_cursor = ListingSearch.encode_cursor(rows[-1].score, rows[-1].id) if has_more else None
+        return {'results': results, 'next_cursor': next_cursor}
@@ -0,0 +1,192 @@
+"""
+Listing Stats
+Pflegt die Rollup-Tabelle listing_stats: Zähler pro Dimension (Gesamt,
+Kategorie, Währung, Tag, exportiert, kontaktiert). Jede Änderung an einem
+Listing verschiebt die Zähler im selben Commit, /api/stats liest nur diese
+paar Zeilen statt scraped_listings zu scannen.
+
+added()/move() sammeln die Deltas pro Session im Speicher; erst beim Commit
+werden sie mit einem einzigen Upsert (count = count + delta, eine Zeile pro
+Schlüssel) geschrieben. Ein Rollback verwirft sie.
+
+Verwendung im Schreibpfad (ohne Commit):
+    before = ListingStats.keys(listing)
+    listing.whatsapp_contacted = True
+    ListingStats.move(before, listing)
+    db.session.commit()
+
+Reparatur bei Drift (z.B. nach manuellen SQL-Änderungen):
+    python listing_stats.py --rebuild
+"""
+import argparse
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import event
+
+from models import db, ListingStat, ScrapedListing
+
+DIMENSIONS = ('total', 'category', 'currency', 'day', 'exported', 'contacted')
+
+# session.info-Schlüssel für die noch nicht geschriebenen Deltas
+_PENDING = 'listing_stats_pending'
+
+
+def _flag(value) -> str:
+    return 'true' if value else 'false'
+
+
+class ListingStats:
+    """Service für listing_stats (braucht einen aktiven App-Context)"""
+
+    @staticmethod
+    def keys(listing: ScrapedListing) -> tuple:
+        """(dimension, key)-Paare, zu denen ein Listing zählt"""
+        created = listing.created_at or datetime.utcnow()
+        return (
+            ('total', ''),
+            ('category', (listing.category or '')[:200]),
+            ('currency', listing.currency or ''),
+            ('day', created.strftime('%Y-%m-%d')),
+            ('exported', _flag(listing.exported)),
+            ('contacted', _flag(listing.whatsapp_contacted)),
+        )
+
+    @staticmethod
+    def apply(deltas) -> None:
+        """Merkt {(dimension, key): delta} für den nächsten Commit vor"""
+        pending = db.session.info.setdefault(_PENDING, Counter())
+        pending.update(deltas)
+
+    @staticmethod
+    def flush(session) -> None:
+        """Schreibt die vorgemerkten Deltas (before_commit, ohne Commit)"""
+        pending = session.info.pop(_PENDING, None)
+        deltas = sorted((key, delta) for key, delta in (pending or {}).items() if delta)
+        if not deltas:
+            return
+
+        dialect = session.get_bind().dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            if dialect == 'sqlite':
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert
+            table = ListingStat.__table__
+            statement = insert(table).values([
+                {'dimension': dimension, 'key': key, 'count': delta}
+                for (dimension, key), delta in deltas
+            ])
+            session.execute(statement.on_conflict_do_update(
+                index_elements=['dimension', 'key'],
+                set_={'count': table.c.count + statement.excluded.count}
+            ))
+            return
+
+        for (dimension, key), delta in deltas:
+            updated = session.query(ListingStat).filter_by(dimension=dimension, key=key) \
+                .update({ListingStat.count: ListingStat.count + delta}, synchronize_session=False)
+            if not updated:
+                session.add(ListingStat(dimension=dimension, key=key, count=delta))
+
+    @staticmethod
+    def discard(session) -> None:
+        session.info.pop(_PENDING, None)
+
+    @staticmethod
+    def added(listing: ScrapedListing) -> None:
+        """Neues Listing zählen"""
+        ListingStats.apply({key: 1 for key in ListingStats.keys(listing)})
+
+    @staticmethod
+    def move(before, listing: ScrapedListing) -> None:
+        """Zähler von den alten keys() auf den aktuellen Stand des Listings umbuchen"""
+        deltas = Counter()
+        for key in before:
+            deltas[key] -= 1
+        for key in ListingStats.keys(listing):
+            deltas[key] += 1
+        ListingStats.apply(deltas)
+
+    @staticmethod
+    def clear() -> None:
+        """Alle Zähler löschen (zusammen mit scraped_listings, ohne Commit)"""
+        ListingStats.discard(db.session)
+        ListingStat.query.delete()
+
+    @staticmethod
+    def rebuild() -> int:
+        """
+        Zähler komplett aus scraped_listings neu berechnen (GROUP BY pro Dimension)
+        Returns: Anzahl Listings
+        """
+        day = db.func.date(ScrapedListing.created_at) if db.engine.dialect.name == 'sqlite' \
+            else db.func.to_char(ScrapedListing.created_at, 'YYYY-MM-DD')
+        columns = {
+            'total': db.literal(''),
+            'category': db.func.coalesce(ScrapedListing.category, ''),
+            'currency': db.func.coalesce(ScrapedListing.currency, ''),
+            'day': day,
+            'exported': ScrapedListing.exported,
+            'contacted': ScrapedListing.whatsapp_contacted,
+        }
+
+        merged = Counter()
+        for dimension, column in columns.items():
+            for key, count in db.session.query(column, db.func.count(ScrapedListing.id)).group_by(column).all():
+                if dimension in ('exported', 'contacted'):
+                    key = _flag(key)
+                merged[(dimension, (key or '')[:200])] += count
+
+        ListingStats.discard(db.session)
+        ListingStat.query.delete()
+        if merged:
+            db.session.execute(ListingStat.__table__.insert(), [
+                {'dimension': dimension, 'key': key, 'count': count}
+                for (dimension, key), count in merged.items()
+            ])
+        db.session.commit()
+        return merged.get(('total', ''), 0)
+
+    @staticmethod
+    def summary() -> dict:
+        """Alle Zähler als verschachteltes Dictionary für /api/stats"""
+        by_dimension = {dimension: {} for dimension in DIMENSIONS}
+        for stat in ListingStat.query.filter(ListingStat.count != 0).all():
+            by_dimension.setdefault(stat.dimension, {})[stat.key] = stat.count
+
+        return {
+            'total_count': by_dimension['total'].get('', 0),
+            'contacted_count': by_dimension['contacted'].get('true', 0),
+            'pending_count': by_dimension['contacted'].get('false', 0),
+            'exported_count': by_dimension['exported'].get('true', 0),
+            'unexported_count': by_dimension['exported'].get('false', 0),
+            'by_category': by_dimension['category'],
+            'by_currency': by_dimension['currency'],
+            'by_day': by_dimension['day'],
+        }
+
+
+event.listen(db.session, 'before_commit', ListingStats.flush)
+event.listen(db.session, 'after_soft_rollback', lambda session, previous_transaction: ListingStats.discard(session))
+
+
+def main():
+    from models import create_db_app
+
+    parser = argparse.ArgumentParser(description='Dashboard statistics rollups (listing_stats)')
+    parser.add_argument('--rebuild', action='store_true', help='Recompute all counters from scraped_listings')
+    args = parser.parse_args()
+
+    app = create_db_app()
+    with app.app_context():
+        if args.rebuild:
+            count = ListingStats.rebuild()
+            print(f"✅ listing_stats rebuilt from {count} listings")
+        summary = ListingStats.summary()
+        print(f"📊 {summary['total_count']} listings, {summary['contacted_count']} contacted, "
+              f"{summary['exported_count']} exported, {len(summary['by_category'])} categories")
+
+
+if __name__ == '__main__':
+    main()
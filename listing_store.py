@@ -0,0 +1,149 @@
+"""
+Listing Store
+Persistiert Scraping-Ergebnisse als ScrapedListing (Upsert per revolico_id mit
+Fingerprint-Vergleich). Wird von der Web-App und von scrape_worker.py genutzt
+und braucht einen aktiven App-Context.
+"""
+from datetime import datetime
+
+from change_feed import ChangeFeed, LISTING_INSERTED, LISTING_UPDATED
+from image_service import ImageProxyService
+from metrics import metrics
+from listing_stats import ListingStats
+from models import db, ScrapedListing
+from phone_index import PhoneIndex
+
+
+def listing_fingerprint(data) -> str:
+    """Fingerprint eines Scraping-Ergebnisses (Titel, Beschreibung, Preis, Bilder)"""
+    return ScrapedListing.compute_fingerprint(
+        data.get('title', ''),
+        data.get('description', ''),
+        data.get('price'),
+        data.get('images', [])
+    )
+
+def phones_changed(listing, phones) -> bool:
+    """Neue Telefonnummern? (leere Ergebnisse überschreiben nichts, Vergleich normalisiert)"""
+    if not phones or list(phones) == list(listing.phone_numbers or []):
+        return False
+    return PhoneIndex.normalize_all(phones) != PhoneIndex.normalize_all(listing.phone_numbers)
+
+def apply_listing_changes(listing, data, fingerprint) -> bool:
+    """
+    Übernimmt geänderte Inhalte in ein bestehendes Listing (ohne Commit)
+    Bilder werden nur bei geändertem Fingerprint neu verarbeitet, Telefonnummern
+    und Kategorie werden separat verglichen (nicht Teil des Fingerprints)
+    Returns: True wenn sich das Listing geändert hat
+    """
+    content_changed = listing.fingerprint != fingerprint
+    new_phones = phones_changed(listing, data.get('phone_numbers'))
+    category = data.get('category')
+    new_category = bool(category) and category != listing.category
+    if not (content_changed or new_phones or new_category):
+        return False
+
+    stats_before = ListingStats.keys(listing)
+    if content_changed:
+        listing.title = data.get('title') or listing.title
+        listing.description = data.get('description', listing.description)
+        listing.price = data.get('price')
+        if data.get('currency'):
+            listing.currency = data['currency']
+        listing.image_ids = ImageProxyService.process_image_urls(data.get('images', []))
+        listing.fingerprint = fingerprint
+    if new_phones:
+        listing.phone_numbers = list(data['phone_numbers'])
+        PhoneIndex.sync(listing)
+    if new_category:
+        listing.category = category
+    listing.scraped_at = datetime.utcnow()
+    ListingStats.move(stats_before, listing)
+    ChangeFeed.listing(LISTING_UPDATED, listing)
+    return True
+
+def save_scraped_listing(result, logger=None) -> str:
+    """
+    Speichert ein einzelnes Scraping-Ergebnis als ScrapedListing
+
+    Args:
+        result: Scraping-Ergebnis (dict)
+        logger: optionaler Logger mit log(level, message) für die Web-UI
+
+    Returns: 'created', 'updated', 'unchanged' oder 'skipped' (ohne revolico_id)
+    """
+    with metrics.timer('listing_save_seconds'):
+        outcome = _save_scraped_listing(result, logger)
+    metrics.inc('listings_saved_total', outcome=outcome)
+    return outcome
+
+def _save_scraped_listing(result, logger) -> str:
+    if not result.get('revolico_id'):
+        return 'skipped'
+
+    fingerprint = listing_fingerprint(result)
+
+    # Check if listing already exists
+    existing_listing = ScrapedListing.query.filter_by(
+        revolico_id=result['revolico_id']
+    ).first()
+
+    if existing_listing:
+        # Wieder aufgetaucht: wieder in den Refresh aufnehmen
+        reappeared = existing_listing.gone_at is not None
+        existing_listing.gone_at = None
+        if not apply_listing_changes(existing_listing, result, fingerprint):
+            if reappeared:
+                db.session.commit()
+            return 'unchanged'
+        db.session.commit()
+        return 'updated'
+
+    # Process images through proxy service
+    image_ids = ImageProxyService.process_image_urls(
+        result.get('images', [])
+    )
+
+    # Process profile picture through proxy service
+    profile_picture_id = None
+    if result.get('profile_picture_url'):
+        profile_url = result['profile_picture_url']
+
+        # Revolico profile pictures: Use direct URL (no proxy/caching)
+        # They are time-limited tokens that expire quickly, so caching doesn't help
+        if 'pic.revolico.com/users' in profile_url:
+            profile_picture_id = profile_url  # Direct URL as ID
+            if logger:
+                logger.log('INFO', f"📸 Revolico profile pic (direct): {profile_url[:80]}...")
+        else:
+            # Google profile pictures: Use proxy (they don't expire)
+            profile_picture_id = ImageProxyService.get_or_create_proxy(profile_url)
+            if logger:
+                logger.log('INFO', f"📸 Saved profile picture: {profile_picture_id}")
+
+    # Create new listing
+    listing = ScrapedListing(
+        revolico_id=result['revolico_id'],
+        title=result.get('title', ''),
+        description=result.get('description', ''),
+        url=result.get('url', ''),
+        price=result.get('price'),
+        currency=result.get('currency', 'USD'),
+        phone_numbers=result.get('phone_numbers', []),
+        seller_name=result.get('seller_name'),
+        profile_picture_id=profile_picture_id,
+        image_ids=image_ids,
+        category=result.get('category', ''),
+        location=result.get('location', ''),
+        condition=result.get('condition', 'used'),
+        fingerprint=fingerprint,
+        exported=False,
+        whatsapp_contacted=False
+    )
+    db.session.add(listing)
+    db.session.flush()
+    PhoneIndex.sync(listing)
+    ListingStats.added(listing)
+    ChangeFeed.listing(LISTING_INSERTED, listing)
+    db.session.commit()
+    return 'created'
@@ -0,0 +1,98 @@
+"""
+Log Broadcaster
+Sammelt Log-Zeilen für die Web-UI und sendet sie gebündelt ('log_batch') in
+kurzen Intervallen statt einzeln pro Zeile. DEBUG-Meldungen werden unter Last
+gesampelt, ein begrenzter Ringpuffer erlaubt später verbundenen Clients das
+Nachladen der letzten Zeilen (/api/logs/recent).
+"""
+import itertools
+import threading
+from collections import deque
+from datetime import datetime
+
+
+class LogBroadcaster:
+    """Gepufferte, rate-limitierte Log-Verteilung über SocketIO"""
+
+    def __init__(self, socketio, interval=0.25, max_batch=200, buffer_size=500,
+                 debug_high_water=50, debug_sample_every=10):
+        """
+        Args:
+            socketio: Flask-SocketIO Instanz
+            interval: Sekunden zwischen zwei Batch-Emits
+            max_batch: max. Einträge pro Emit (Rest folgt im nächsten Intervall)
+            buffer_size: Größe des Ringpuffers für /api/logs/recent
+            debug_high_water: ab so vielen wartenden Einträgen wird DEBUG gesampelt
+            debug_sample_every: unter Last wird nur jede n-te DEBUG-Meldung behalten
+        """
+        self.socketio = socketio
+        self.interval = interval
+        self.max_batch = max_batch
+        self.debug_high_water = debug_high_water
+        self.debug_sample_every = debug_sample_every
+        self.recent_entries = deque(maxlen=buffer_size)
+        self._pending = deque()
+        self._dropped = 0
+        self._debug_seen = 0
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+        self._flusher_started = False
+
+    def publish(self, level, message):
+        """Reiht eine Log-Zeile zum Versand ein (nicht blockierend)"""
+        level = level.upper()
+        with self._lock:
+            if level == 'DEBUG' and len(self._pending) >= self.debug_high_water:
+                self._debug_seen += 1
+                if self._debug_seen % self.debug_sample_every:
+                    self._dropped += 1
+                    return
+            entry = {
+                'seq': next(self._seq),
+                'level': level,
+                'message': message,
+                'timestamp': datetime.now().strftime('%H:%M:%S')
+            }
+            self._pending.append(entry)
+            self.recent_entries.append(entry)
+            start_flusher = not self._flusher_started
+            self._flusher_started = True
+
+        if start_flusher:
+            self.socketio.start_background_task(self._run)
+
+    def _take_batch(self):
+        with self._lock:
+            count = min(len(self._pending), self.max_batch)
+            entries = [self._pending.popleft() for _ in range(count)]
+            dropped, self._dropped = self._dropped, 0
+        return entries, dropped
+
+    def flush(self):
+        """Sendet alle wartenden Einträge sofort"""
+        while True:
+            entries, dropped = self._take_batch()
+            if not entries and not dropped:
+                return
+            self.socketio.emit('log_batch', {'entries': entries, 'dropped': dropped})
+
+    def _run(self):
+        while True:
+            self.socketio.sleep(self.interval)
+            entries, dropped = self._take_batch()
+            if entries or dropped:
+                self.socketio.emit('log_batch', {'entries': entries, 'dropped': dropped})
+
+    def recent(self, limit=200, since=None):
+        """
+        Letzte Einträge aus dem Ringpuffer
+
+        Args:
+            limit: max. Anzahl (neueste)
+            since: nur Einträge mit seq > since
+        """
+        with self._lock:
+            entries = list(self.recent_entries)
+        if since is not None:
+            entries = [e for e in entries if e['seq'] > since]
+        return entries[-limit:] if limit else entries
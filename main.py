@@ -5,7 +5,6 @@ Educational/Testing purposes only - respects website terms
 """
 
 import requests
-from bs4 import BeautifulSoup
 import re
 import json
 import time
@@ -20,6 +19,7 @@ from phone_parser import PhoneNumberParser
 from utils import setup_logging, save_to_json, get_random_user_agent
 from proxy_manager import ProxyManager
 from bypass_detector import BypassDetector
+from http_cache import HttpCache
 
 class RevolicoScraper:
     def __init__(self, use_proxy: bool = False):
@@ -31,6 +31,7 @@ class RevolicoScraper:
         self.use_proxy = use_proxy
         self.proxy_manager = ProxyManager() if use_proxy else None
         self.bypass_detector = BypassDetector()
+        self.http_cache = HttpCache.from_config()
         
         # Setup logging
         self.logger = setup_logging()
@@ -54,8 +55,15 @@ class RevolicoScraper:
             'sec-ch-ua-platform': '"Windows"'
         })
 
-    def make_request(self, url: str, timeout: int = 20, retries: int = 3) -> Optional[requests.Response]:
-        """Make a HTTP request with enhanced anti-detection and retry logic"""
+    def make_request(self, url: str, timeout: int = 20, retries: int = 3, use_cache: bool = True) -> Optional[requests.Response]:
+        """Make a HTTP request with enhanced anti-detection and retry logic
+        Homepage und Listings laufen über den HTTP-Cache (TTL + ETag/Last-Modified Revalidierung)"""
+        cache = self.http_cache if use_cache else None
+        
+        # Fresh cached pages need neither the politeness delay nor a request
+        if cache and cache.is_fresh(url):
+            self.logger.info(f"Cache hit: {url}")
+            return cache.get(self.session, url)
         
         for attempt in range(retries):
             try:
@@ -85,7 +93,10 @@ class RevolicoScraper:
                     if proxies:
                         self.logger.info(f"Using proxy: {proxies['http']}")
                 
-                response = self.session.get(url, timeout=timeout, allow_redirects=True, proxies=proxies)
+                if cache:
+                    response = cache.get(self.session, url, timeout=timeout, allow_redirects=True, proxies=proxies)
+                else:
+                    response = self.session.get(url, timeout=timeout, allow_redirects=True, proxies=proxies)
                 
                 # Check for captcha or blocking
                 if self.is_blocked_response(response):
@@ -242,6 +253,7 @@ class RevolicoScraper:
             self.logger.error("All URLs failed")
             return []
             
+        from bs4 import BeautifulSoup
         soup = BeautifulSoup(response.content, 'html.parser')
         listings = []
         
@@ -332,6 +344,7 @@ class RevolicoScraper:
                 'error': 'Failed to fetch page'
             }
         
+        from bs4 import BeautifulSoup
         soup = BeautifulSoup(response.content, 'html.parser')
         
         # Extract phone numbers from the page
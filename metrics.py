@@ -0,0 +1,159 @@
+"""
+Metrics
+Leichtgewichtige Instrumentierung (Timer, Counter, Histogramme) ohne externe
+Abhängigkeiten. Export im Prometheus Text-Format (/metrics) und als
+Snapshot-Dict für SocketIO.
+
+Verwendung:
+    from metrics import metrics
+
+    with metrics.timer('scraper_stage_seconds', stage='page_load'):
+        driver.get(url)
+    metrics.inc('listings_saved_total', outcome='created')
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+# Histogramm-Buckets in Sekunden (von DB-Commits bis Browser-Start)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+METRIC_PREFIX = 'revolico_'
+
+DESCRIPTIONS = {
+    'scraper_stage_seconds': 'Time spent per scraper stage (browser_startup, page_load, sleep, extraction, ...)',
+    'scraper_listings_total': 'Listings processed by the scraper by outcome',
+    'image_proxy_seconds': 'Time spent in ImageProxyService operations',
+    'image_proxy_total': 'Image proxy lookups by result',
+    'listing_save_seconds': 'Time to persist one scraped listing',
+    'listings_saved_total': 'Persisted listings by outcome (created/updated/unchanged/skipped)',
+    'whatsapp_send_seconds': 'Duration of SimpleWhatsAppBot.send_message',
+    'whatsapp_messages_total': 'WhatsApp messages by status',
+    'browser_startup_seconds': 'Firefox launch time per browser (scraper/whatsapp), including recycles',
+    'browser_recycles_total': 'Browser restarts by the lifecycle manager by reason (pages/memory)',
+    'browser_recycle_seconds': 'Time to quit and relaunch a recycled browser',
+}
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(label_key, extra=None):
+    pairs = list(label_key) + (extra or [])
+    if not pairs:
+        return ''
+    body = ','.join(f'{k}="{_escape(v)}"' for k, v in pairs)
+    return '{' + body + '}'
+
+
+class Metrics:
+    """Thread-sichere Registry für Counter und Histogramme"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        """Erhöht einen Counter"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """Trägt einen Messwert (Sekunden) in ein Histogramm ein"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {
+                    'buckets': [0] * len(self.buckets),
+                    'sum': 0.0,
+                    'count': 0,
+                }
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram['buckets'][index] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Misst die Dauer des with-Blocks (auch bei Exceptions)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self):
+        """
+        Kompakte Sicht für die Web-UI / SocketIO
+
+        Returns:
+            {'counters': {...}, 'histograms': {name: [{labels, count, sum, avg}]}}
+        """
+        with self._lock:
+            counters = {}
+            for (name, label_key), value in self._counters.items():
+                counters.setdefault(name, []).append({'labels': dict(label_key), 'value': value})
+            histograms = {}
+            for (name, label_key), histogram in self._histograms.items():
+                count = histogram['count']
+                histograms.setdefault(name, []).append({
+                    'labels': dict(label_key),
+                    'count': count,
+                    'sum': round(histogram['sum'], 4),
+                    'avg': round(histogram['sum'] / count, 4) if count else 0.0,
+                })
+        return {'counters': counters, 'histograms': histograms}
+
+    def render_prometheus(self):
+        """Alle Metriken im Prometheus Text-Exposition-Format"""
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                (key, {'buckets': list(h['buckets']), 'sum': h['sum'], 'count': h['count']})
+                for key, h in self._histograms.items()
+            )
+
+        described = set()
+
+        def header(name, metric_type):
+            if name in described:
+                return
+            described.add(name)
+            if name in DESCRIPTIONS:
+                lines.append(f'# HELP {METRIC_PREFIX}{name} {DESCRIPTIONS[name]}')
+            lines.append(f'# TYPE {METRIC_PREFIX}{name} {metric_type}')
+
+        for (name, label_key), value in counters:
+            header(name, 'counter')
+            lines.append(f'{METRIC_PREFIX}{name}{_format_labels(label_key)} {value}')
+
+        for (name, label_key), histogram in histograms:
+            header(name, 'histogram')
+            full_name = METRIC_PREFIX + name
+            for bound, count in zip(self.buckets, histogram['buckets']):
+                lines.append(f'{full_name}_bucket{_format_labels(label_key, [("le", bound)])} {count}')
+            lines.append(f'{full_name}_bucket{_format_labels(label_key, [("le", "+Inf")])} {histogram["count"]}')
+            lines.append(f'{full_name}_sum{_format_labels(label_key)} {histogram["sum"]:.6f}')
+            lines.append(f'{full_name}_count{_format_labels(label_key)} {histogram["count"]}')
+
+        return '\n'.join(lines) + '\n'
+
+
+# Prozessweite Registry
+metrics = Metrics()
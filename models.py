@@ -2,6 +2,8 @@
 Datenbank-Modelle für den Revolico Scraper
 """
 import os
+import hashlib
+import json
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import DeclarativeBase
@@ -85,6 +87,12 @@ class ScrapedListing(db.Model):
     location = db.Column(db.String(200), nullable=True)
     condition = db.Column(db.String(50), nullable=True, default='used')
 
+    # Change detection (hash über Titel, Beschreibung, Preis und Bilder)
+    fingerprint = db.Column(db.String(64), nullable=True, comment='Content-Fingerprint für Änderungserkennung')
+    # Refresh-Modus: zuletzt geprüft (auch bei gone/error) und ob das Listing entfernt wurde
+    last_checked_at = db.Column(db.DateTime, nullable=True, comment='Letzter Refresh-Versuch')
+    gone_at = db.Column(db.DateTime, nullable=True, comment='Auf Revolico entfernt/abgelaufen seit')
+
     # Status
     exported = db.Column(db.Boolean, default=False, comment='Bereits zu Rico-Cuba exportiert?')
     exported_at = db.Column(db.DateTime, nullable=True)
@@ -99,13 +107,32 @@ class ScrapedListing(db.Model):
     # Timestamps
     scraped_at = db.Column(db.DateTime, default=datetime.utcnow)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Index: max(updated_at) ist Teil der Collection-Version (ETags, collection_version.py)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     def __repr__(self):
         return f'<ScrapedListing {self.revolico_id}: {self.title[:50]}>'
 
+    @staticmethod
+    def compute_fingerprint(title, description, price, image_urls):
+        """
+        Berechnet einen SHA256 Fingerprint über die änderbaren Inhalte eines Listings
+        (Whitespace-normalisiert, Bilder sortiert - unabhängig von der Extraktionsmethode)
+        """
+        normalized = {
+            'title': ' '.join((title or '').split()),
+            'description': ' '.join((description or '').split()),
+            'price': None if price is None else f'{float(price):.2f}',
+            'images': sorted(image_urls or []),
+        }
+        payload = json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
     def to_dict(self):
-        """Konvertiert Listing zu Dictionary für JSON/API"""
+        """
+        Konvertiert Listing zu Dictionary für JSON/API
+        Datumsfelder bleiben datetime - der JSON-Provider serialisiert sie als ISO-8601
+        """
         # Format price: show as int if no decimal places, otherwise keep decimals
         formatted_price = None
         if self.price is not None:
@@ -130,17 +157,59 @@ class ScrapedListing(db.Model):
             'location': self.location,
             'condition': self.condition,
             'exported': self.exported,
-            'exported_at': self.exported_at.isoformat() if self.exported_at else None,
+            'exported_at': self.exported_at,
             'whatsapp_contacted': self.whatsapp_contacted,
-            'whatsapp_contacted_at': self.whatsapp_contacted_at.isoformat() if self.whatsapp_contacted_at else None,
+            'whatsapp_contacted_at': self.whatsapp_contacted_at,
             'whatsapp_notes': self.whatsapp_notes,
             'whatsapp_status': self.whatsapp_status,
-            'scraped_at': self.scraped_at.isoformat() if self.scraped_at else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'gone_at': self.gone_at,
+            'scraped_at': self.scraped_at,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
         }
 
 
+class ListingPhone(db.Model):
+    """
+    Normalisierte Telefonnummern der Listings (E.164, z.B. +5351234567)
+    Eine Zeile pro (Listing, Nummer) - für Verkäufer-Suche und Kampagnen-Filter per Index
+    statt JSON-Scan über scraped_listings.phone_numbers
+    """
+    __tablename__ = 'listing_phones'
+    __table_args__ = (
+        db.UniqueConstraint('phone', 'listing_id', name='uq_listing_phones_phone_listing'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    phone = db.Column(db.String(20), nullable=False, comment='Telefonnummer im E.164-Format')
+    listing_id = db.Column(db.Integer, db.ForeignKey('scraped_listings.id', ondelete='CASCADE'),
+                           nullable=False, index=True)
+    position = db.Column(db.Integer, nullable=False, default=0, comment='Reihenfolge im Listing (0 = Hauptnummer)')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ListingPhone {self.phone} -> {self.listing_id}>'
+
+
+class ListingStat(db.Model):
+    """
+    Vorberechnete Zähler über scraped_listings (eine Zeile pro Dimension und Wert)
+    Wird im selben Commit wie die Listing-Änderung gepflegt (siehe listing_stats.py)
+    """
+    __tablename__ = 'listing_stats'
+    __table_args__ = (
+        db.UniqueConstraint('dimension', 'key', name='uq_listing_stats_dimension_key'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    dimension = db.Column(db.String(30), nullable=False, comment='total/category/currency/day/exported/contacted')
+    key = db.Column(db.String(200), nullable=False, default='', comment='Wert der Dimension (z.B. USD, 2024-01-31)')
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<ListingStat {self.dimension}={self.key}: {self.count}>'
+
+
 class ImageProxy(db.Model):
     """Image Proxy Mapping - versteckt Revolico URLs"""
     __tablename__ = 'image_proxy'
@@ -154,6 +223,12 @@ class ImageProxy(db.Model):
     cached = db.Column(db.Boolean, default=False)
     cache_path = db.Column(db.String(500), nullable=True)
 
+    # Negativ-Cache: fehlgeschlagene Upstream-Abrufe (image_backoff.py)
+    fail_count = db.Column(db.Integer, default=0, nullable=False, comment='Fehlgeschlagene Abrufe in Folge')
+    last_status = db.Column(db.Integer, nullable=True, comment='Letzter HTTP-Status (leer = Timeout/Verbindungsfehler)')
+    last_failure_at = db.Column(db.DateTime, nullable=True)
+    retry_after = db.Column(db.DateTime, nullable=True, comment='Bis dahin nur Platzhalter ausliefern')
+
     def __repr__(self):
         return f'<ImageProxy {self.image_hash}>'
 
@@ -165,6 +240,67 @@ class ImageProxy(db.Model):
         }
 
 
+class ImageOrigin(db.Model):
+    """Circuit Breaker pro Bild-Host (z.B. pic.revolico.com) für den Image Proxy"""
+    __tablename__ = 'image_origins'
+
+    id = db.Column(db.Integer, primary_key=True)
+    host = db.Column(db.String(255), unique=True, nullable=False, comment='Hostname des Bild-Servers')
+    consecutive_failures = db.Column(db.Integer, default=0, nullable=False,
+                                     comment='Timeouts/Verbindungsfehler/5xx in Folge')
+    open_count = db.Column(db.Integer, default=0, nullable=False,
+                           comment='Wie oft der Breaker in Folge geöffnet wurde (exponentielles Fenster)')
+    opened_until = db.Column(db.DateTime, nullable=True, comment='Bis dahin keine Upstream-Abrufe')
+    last_error = db.Column(db.String(200), nullable=True)
+    last_failure_at = db.Column(db.DateTime, nullable=True)
+    last_success_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<ImageOrigin {self.host} failures={self.consecutive_failures}>'
+
+
+class CrawlFrontierEntry(db.Model):
+    """Persistente Crawl-Frontier - Status jeder entdeckten Listing-URL (für Resume)"""
+    __tablename__ = 'crawl_frontier'
+    __table_args__ = (
+        # Dieselbe URL kann auf der Startseite und in einer Kategorie auftauchen - ein Eintrag pro Bereich
+        db.UniqueConstraint('scope', 'url', name='uq_crawl_frontier_scope_url'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    url = db.Column(db.String(500), nullable=False, comment='Listing URL')
+    title = db.Column(db.String(300), nullable=True, comment='Titel von der Übersichtsseite')
+
+    scope = db.Column(db.String(100), nullable=True, index=True, comment='Crawl-Bereich (Kategorie-Slug, leer = Startseite)')
+
+    # Status: pending / in_progress / done / failed
+    state = db.Column(db.String(20), nullable=False, default='pending', index=True, comment='Crawl-Status der URL')
+    attempts = db.Column(db.Integer, default=0, nullable=False, comment='Anzahl Abrufversuche')
+    last_error = db.Column(db.Text, nullable=True, comment='Letzte Fehlermeldung')
+
+    # Timestamps
+    discovered_at = db.Column(db.DateTime, default=datetime.utcnow)
+    completed_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<CrawlFrontierEntry {self.state}: {self.url}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'url': self.url,
+            'title': self.title,
+            'scope': self.scope,
+            'state': self.state,
+            'attempts': self.attempts,
+            'last_error': self.last_error,
+            'discovered_at': self.discovered_at.isoformat() if self.discovered_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+
 class WhatsAppAccount(db.Model):
     """WhatsApp Account Management für Multi-Account Support"""
     __tablename__ = 'whatsapp_accounts'
@@ -232,6 +368,171 @@ class WhatsAppAccount(db.Model):
     
 
 
+class ScrapeJob(db.Model):
+    """Scraping-Job Warteschlange - wird von scrape_worker.py abgearbeitet"""
+    __tablename__ = 'scrape_jobs'
+    __table_args__ = (
+        # Pro Bereich höchstens ein laufender Job - auch bei gleichzeitigen claim()-Aufrufen
+        db.Index('ux_scrape_jobs_running_scope', 'scope', unique=True,
+                 sqlite_where=db.text("status = 'running'"),
+                 postgresql_where=db.text("status = 'running'")),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False, default='scrape', comment='Job-Typ (scrape/refresh)')
+    params = db.Column(db.JSON, nullable=True, comment='Job-Parameter (max_listings, resume, limit, ...)')
+    priority = db.Column(db.Integer, default=0, nullable=False, comment='Höhere Priorität wird zuerst abgearbeitet')
+    scope = db.Column(db.String(100), nullable=True, index=True, comment='Crawl-Bereich (Kategorie-Slug); pro Bereich läuft max. ein Job')
+
+    # Status: queued / running / completed / failed / cancelled
+    status = db.Column(db.String(20), nullable=False, default='queued', index=True, comment='Job-Status')
+    cancel_requested = db.Column(db.Boolean, default=False, nullable=False, comment='Abbruch angefordert?')
+    worker_id = db.Column(db.String(100), nullable=True, comment='Worker, der den Job bearbeitet')
+    result = db.Column(db.JSON, nullable=True, comment='Ergebnis (Zähler, gescrapte Listings)')
+    progress = db.Column(db.JSON, nullable=True, comment='Zwischenstand (Zähler), per Heartbeat aktualisiert')
+    error = db.Column(db.Text, nullable=True, comment='Fehlermeldung')
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True, comment='Letztes Lebenszeichen des Workers')
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<ScrapeJob {self.id} {self.kind} {self.status}>'
+
+    def to_dict(self, include_result=True):
+        data = {
+            'id': self.id,
+            'kind': self.kind,
+            'params': self.params or {},
+            'priority': self.priority,
+            'scope': self.scope,
+            'status': self.status,
+            'progress': self.progress or {},
+            'cancel_requested': self.cancel_requested,
+            'worker_id': self.worker_id,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'heartbeat_at': self.heartbeat_at.isoformat() if self.heartbeat_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+        if include_result:
+            data['result'] = self.result
+        return data
+
+
+class ScrapeJobEvent(db.Model):
+    """Fortschritts-Events der Worker (Logs, Status) für die Web-UI"""
+    __tablename__ = 'scrape_job_events'
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, nullable=True, index=True, comment='Zugehöriger ScrapeJob')
+    event = db.Column(db.String(50), nullable=False, comment='Event-Name (log, job_update, ...)')
+    payload = db.Column(db.JSON, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f'<ScrapeJobEvent {self.id} {self.event}>'
+
+
+class ChangeEvent(db.Model):
+    """Versionierte Änderungen für die Web-UI (id = monotone Version, siehe change_feed.py)"""
+    __tablename__ = 'change_events'
+    # AUTOINCREMENT: Versionen werden auch nach dem Löschen alter Zeilen nie wiederverwendet
+    __table_args__ = {'sqlite_autoincrement': True}
+
+    id = db.Column(db.Integer, primary_key=True)
+    type = db.Column(db.String(50), nullable=False, comment='Event-Typ (listing_inserted, account_updated, ...)')
+    entity_id = db.Column(db.Integer, nullable=True, comment='ID des geänderten Listings/Accounts')
+    payload = db.Column(db.JSON, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f'<ChangeEvent {self.id} {self.type}>'
+
+
+class ScrapeSchedule(db.Model):
+    """Wiederkehrender Scraping-Job (z.B. Móviles stündlich, Muebles täglich)"""
+    __tablename__ = 'scrape_schedules'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False, unique=True, comment='Eindeutiger Name')
+    kind = db.Column(db.String(20), nullable=False, default='scrape', comment='Job-Typ (scrape/refresh)')
+    category = db.Column(db.String(100), nullable=True, comment='Kategorie-Slug (leer = Startseite)')
+    params = db.Column(db.JSON, nullable=True, comment='Zusätzliche Job-Parameter (max_listings, limit, ...)')
+    priority = db.Column(db.Integer, default=0, nullable=False, comment='Priorität der erzeugten Jobs')
+
+    interval_minutes = db.Column(db.Integer, nullable=False, comment='Abstand zwischen zwei Läufen')
+    jitter_seconds = db.Column(db.Integer, default=0, nullable=False, comment='Zufälliger Versatz pro Lauf')
+    enabled = db.Column(db.Boolean, default=True, nullable=False, comment='Schedule aktiv?')
+
+    next_run_at = db.Column(db.DateTime, nullable=True, index=True, comment='Nächster geplanter Lauf')
+    last_run_at = db.Column(db.DateTime, nullable=True, comment='Letzter ausgelöster Lauf')
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ScrapeSchedule {self.name} every {self.interval_minutes}m>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'kind': self.kind,
+            'category': self.category,
+            'params': self.params or {},
+            'priority': self.priority,
+            'interval_minutes': self.interval_minutes,
+            'jitter_seconds': self.jitter_seconds,
+            'enabled': self.enabled,
+            'next_run_at': self.next_run_at.isoformat() if self.next_run_at else None,
+            'last_run_at': self.last_run_at.isoformat() if self.last_run_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+
+class ScheduleRun(db.Model):
+    """Ausführungs-Historie eines Schedules (auch übersprungene Läufe)"""
+    __tablename__ = 'schedule_runs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    schedule_id = db.Column(db.Integer, nullable=False, index=True, comment='Zugehöriger ScrapeSchedule')
+    job_id = db.Column(db.Integer, nullable=True, index=True, comment='Erzeugter ScrapeJob (leer bei skipped)')
+
+    # Status: skipped / queued / running / completed / failed / cancelled
+    status = db.Column(db.String(20), nullable=False, default='queued', index=True)
+    reason = db.Column(db.String(300), nullable=True, comment='Grund für skipped/failed')
+    new_listings = db.Column(db.Integer, nullable=True, comment='Neu gespeicherte Listings')
+    updated_listings = db.Column(db.Integer, nullable=True, comment='Aktualisierte Listings')
+    duration_seconds = db.Column(db.Float, nullable=True, comment='Laufzeit des Jobs')
+
+    # Timestamps
+    triggered_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<ScheduleRun {self.schedule_id} {self.status}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'schedule_id': self.schedule_id,
+            'job_id': self.job_id,
+            'status': self.status,
+            'reason': self.reason,
+            'new_listings': self.new_listings,
+            'updated_listings': self.updated_listings,
+            'duration_seconds': self.duration_seconds,
+            'triggered_at': self.triggered_at.isoformat() if self.triggered_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
 def init_database(app):
     """Initialisiert die Datenbank mit der Flask App"""
     # Konfiguration - nur setzen wenn nicht bereits gesetzt
@@ -239,10 +540,17 @@ def init_database(app):
         app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL", "sqlite:///revolico_customers.db")
 
     if not app.config.get("SQLALCHEMY_ENGINE_OPTIONS"):
-        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-            "pool_recycle": 300,
-            "pool_pre_ping": True,
-        }
+        if app.config["SQLALCHEMY_DATABASE_URI"].startswith("sqlite"):
+            # Web-App und Worker-Prozesse teilen sich die Datei: Threads erlauben
+            # und bei gesperrter DB warten statt sofort "database is locked"
+            app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+                "connect_args": {"check_same_thread": False, "timeout": 30}
+            }
+        else:
+            app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+                "pool_recycle": 300,
+                "pool_pre_ping": True,
+            }
 
     if not app.config.get("SQLALCHEMY_TRACK_MODIFICATIONS"):
         app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
@@ -252,6 +560,13 @@ def init_database(app):
 
     # Tabellen erstellen
     with app.app_context():
+        from sqlalchemy import inspect as sa_inspect
+        # Neue listing_phones Tabelle: nach create_all aus den JSON-Arrays füllen
+        phones_backfill_needed = sa_inspect(db.engine).has_table('scraped_listings') and \
+            not sa_inspect(db.engine).has_table('listing_phones')
+        stats_backfill_needed = sa_inspect(db.engine).has_table('scraped_listings') and \
+            not sa_inspect(db.engine).has_table('listing_stats')
+
         db.create_all()
 
         # Manual migration: Add whatsapp_account_id column if missing
@@ -284,6 +599,150 @@ def init_database(app):
                 print("✅ Migration complete: profile_picture_id column added to scraped_listings")
                 migrations_run = True
 
+            if 'fingerprint' not in columns:
+                print("⚠️  Adding missing fingerprint column to scraped_listings...")
+                with db.engine.connect() as conn:
+                    conn.execute(text(
+                        "ALTER TABLE scraped_listings ADD COLUMN fingerprint VARCHAR(64)"
+                    ))
+                    conn.commit()
+                print("✅ Migration complete: fingerprint column added to scraped_listings")
+                migrations_run = True
+
+            for column in ('last_checked_at', 'gone_at'):
+                if column not in columns:
+                    print(f"⚠️  Adding missing {column} column to scraped_listings...")
+                    with db.engine.connect() as conn:
+                        conn.execute(text(f"ALTER TABLE scraped_listings ADD COLUMN {column} TIMESTAMP"))
+                        conn.commit()
+                    print(f"✅ Migration complete: {column} column added to scraped_listings")
+                    migrations_run = True
+
+            frontier_columns = [col['name'] for col in inspector.get_columns('crawl_frontier')]
+
+            if 'scope' not in frontier_columns:
+                print("⚠️  Adding missing scope column to crawl_frontier...")
+                with db.engine.connect() as conn:
+                    conn.execute(text(
+                        "ALTER TABLE crawl_frontier ADD COLUMN scope VARCHAR(100)"
+                    ))
+                    conn.commit()
+                    conn.execute(text(
+                        "UPDATE crawl_frontier SET scope = 'home' WHERE scope IS NULL"
+                    ))
+                    conn.commit()
+                print("✅ Migration complete: scope column added to crawl_frontier")
+                migrations_run = True
+
+            url_unique = [constraint for constraint in inspector.get_unique_constraints('crawl_frontier')
+                          if constraint['column_names'] == ['url']]
+            if url_unique:
+                print("⚠️  Changing crawl_frontier unique key from url to (scope, url)...")
+                frontier_indexes = [index['name'] for index in inspector.get_indexes('crawl_frontier')]
+                with db.engine.connect() as conn:
+                    if db.engine.dialect.name == 'sqlite':
+                        # SQLite kann Constraints nicht ändern: Tabelle neu anlegen und umkopieren
+                        copy_columns = ', '.join(CrawlFrontierEntry.__table__.columns.keys())
+                        conn.execute(text("ALTER TABLE crawl_frontier RENAME TO crawl_frontier_old"))
+                        for index_name in frontier_indexes:
+                            conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+                        CrawlFrontierEntry.__table__.create(conn)
+                        conn.execute(text(
+                            f"INSERT INTO crawl_frontier ({copy_columns}) "
+                            f"SELECT {copy_columns} FROM crawl_frontier_old"
+                        ))
+                        conn.execute(text("DROP TABLE crawl_frontier_old"))
+                    else:
+                        conn.execute(text(f"ALTER TABLE crawl_frontier DROP CONSTRAINT {url_unique[0]['name']}"))
+                        conn.execute(text(
+                            "ALTER TABLE crawl_frontier ADD CONSTRAINT uq_crawl_frontier_scope_url UNIQUE (scope, url)"
+                        ))
+                    conn.commit()
+                print("✅ Migration complete: crawl_frontier is unique per (scope, url)")
+                migrations_run = True
+
+            job_columns = [col['name'] for col in inspector.get_columns('scrape_jobs')]
+            job_migrations = [
+                ('priority', 'INTEGER NOT NULL DEFAULT 0'),
+                ('scope', 'VARCHAR(100)'),
+                ('progress', 'JSON'),
+            ]
+            for column, ddl in job_migrations:
+                if column not in job_columns:
+                    print(f"⚠️  Adding missing {column} column to scrape_jobs...")
+                    with db.engine.connect() as conn:
+                        conn.execute(text(f"ALTER TABLE scrape_jobs ADD COLUMN {column} {ddl}"))
+                        conn.commit()
+                    print(f"✅ Migration complete: {column} column added to scrape_jobs")
+                    migrations_run = True
+
+            job_indexes = [index['name'] for index in inspector.get_indexes('scrape_jobs')]
+
+            if 'ux_scrape_jobs_running_scope' not in job_indexes:
+                print("⚠️  Adding missing running-scope index to scrape_jobs...")
+                try:
+                    with db.engine.connect() as conn:
+                        conn.execute(text(
+                            "CREATE UNIQUE INDEX IF NOT EXISTS ux_scrape_jobs_running_scope "
+                            "ON scrape_jobs (scope) WHERE status = 'running'"
+                        ))
+                        conn.commit()
+                    print("✅ Migration complete: running-scope index added to scrape_jobs")
+                    migrations_run = True
+                except Exception as e:
+                    # Alte Daten mit zwei laufenden Jobs im selben Bereich - beim nächsten Start erneut
+                    print(f"⚠️  Could not add running-scope index to scrape_jobs: {e}")
+
+            if phones_backfill_needed:
+                from phone_index import PhoneIndex
+
+                print("⚠️  Backfilling listing_phones from scraped_listings.phone_numbers...")
+                count = PhoneIndex.backfill()
+                print(f"✅ Migration complete: {count} phone numbers indexed in listing_phones")
+                migrations_run = True
+
+            if stats_backfill_needed:
+                from listing_stats import ListingStats
+
+                print("⚠️  Building listing_stats rollups from scraped_listings...")
+                count = ListingStats.rebuild()
+                print(f"✅ Migration complete: listing_stats built from {count} listings")
+                migrations_run = True
+
+            image_proxy_columns = [col['name'] for col in inspector.get_columns('image_proxy')]
+            image_proxy_migrations = [
+                ('fail_count', 'INTEGER NOT NULL DEFAULT 0'),
+                ('last_status', 'INTEGER'),
+                ('last_failure_at', 'TIMESTAMP'),
+                ('retry_after', 'TIMESTAMP'),
+            ]
+            for column, ddl in image_proxy_migrations:
+                if column not in image_proxy_columns:
+                    print(f"⚠️  Adding missing {column} column to image_proxy...")
+                    with db.engine.connect() as conn:
+                        conn.execute(text(f"ALTER TABLE image_proxy ADD COLUMN {column} {ddl}"))
+                        conn.commit()
+                    print(f"✅ Migration complete: {column} column added to image_proxy")
+                    migrations_run = True
+
+            listing_indexes = [index['name'] for index in inspector.get_indexes('scraped_listings')]
+
+            if 'ix_scraped_listings_updated_at' not in listing_indexes:
+                print("⚠️  Adding missing updated_at index to scraped_listings...")
+                with db.engine.connect() as conn:
+                    conn.execute(text(
+                        "CREATE INDEX IF NOT EXISTS ix_scraped_listings_updated_at ON scraped_listings (updated_at)"
+                    ))
+                    conn.commit()
+                print("✅ Migration complete: updated_at index added to scraped_listings")
+                migrations_run = True
+
+            # Volltextsuche: FTS5-Tabelle + Trigger (SQLite) bzw. tsvector-Spalte (Postgres)
+            from listing_search import ListingSearch
+            if ListingSearch.setup():
+                print("✅ Migration complete: full-text search index created for scraped_listings")
+                migrations_run = True
+
             # Check customers table
             customer_columns = [col['name'] for col in inspector.get_columns('customers')]
 
@@ -311,4 +770,16 @@ def init_database(app):
                 print("✅ Datenbank-Tabellen erstellt/aktualisiert")
         except Exception as e:
             print(f"⚠️  Migration check/execution failed: {e}")
-            print("✅ Datenbank-Tabellen erstellt/aktualisiert")
\ No newline at end of file
+            print("✅ Datenbank-Tabellen erstellt/aktualisiert")
+
+
+def create_db_app():
+    """
+    Minimale Flask App nur mit der Datenbank (für Worker und CLI-Tools) -
+    ohne SocketIO, Selenium oder WhatsApp Session-Wiederherstellung
+    """
+    from flask import Flask
+
+    db_app = Flask(__name__)
+    init_database(db_app)
+    return db_app
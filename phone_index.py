@@ -0,0 +1,152 @@
+"""
+Phone Index
+Pflegt die Tabelle listing_phones (eine Zeile pro Listing und Telefonnummer,
+E.164-normalisiert) und bietet die darauf basierenden Abfragen: Listings einer
+Nummer, Verkäufer-Übersicht und Kampagnen-Ziele. Alle Methoden brauchen einen
+aktiven App-Context.
+"""
+import re
+from typing import List, Optional
+
+from models import db, ListingPhone, ScrapedListing
+from phone_parser import PhoneNumberParser
+
+_parser = PhoneNumberParser()
+
+
+class PhoneIndex:
+    """Service für listing_phones"""
+
+    @staticmethod
+    def normalize(phone) -> Optional[str]:
+        """Kubanische Nummer -> E.164 (+53XXXXXXXX), ungültige Nummern -> None"""
+        cleaned = _parser.clean_phone_number(str(phone or ''))
+        if not _parser.is_valid_cuban_number(cleaned):
+            return None
+        digits = re.sub(r'\D', '', cleaned)
+        return f'+{digits}' if len(digits) == 10 else None
+
+    @staticmethod
+    def normalize_all(phones) -> List[str]:
+        """Normalisiert eine Liste (Reihenfolge bleibt, Duplikate und Ungültige fallen weg)"""
+        result = []
+        for phone in phones or []:
+            normalized = PhoneIndex.normalize(phone)
+            if normalized and normalized not in result:
+                result.append(normalized)
+        return result
+
+    @staticmethod
+    def sync(listing: ScrapedListing) -> None:
+        """
+        Gleicht listing_phones mit listing.phone_numbers ab (ohne Commit)
+        Das Listing muss bereits eine id haben (nach add() ggf. flush())
+        """
+        ListingPhone.query.filter_by(listing_id=listing.id).delete(synchronize_session=False)
+        for position, phone in enumerate(PhoneIndex.normalize_all(listing.phone_numbers)):
+            db.session.add(ListingPhone(phone=phone, listing_id=listing.id, position=position))
+
+    @staticmethod
+    def backfill(batch_size: int = 1000) -> int:
+        """
+        Füllt listing_phones komplett neu aus scraped_listings.phone_numbers
+        Returns: Anzahl eingetragener Nummern
+        """
+        ListingPhone.query.delete(synchronize_session=False)
+        count = 0
+        last_id = 0
+        while True:
+            rows = db.session.query(ScrapedListing.id, ScrapedListing.phone_numbers) \
+                .filter(ScrapedListing.id > last_id) \
+                .order_by(ScrapedListing.id).limit(batch_size).all()
+            if not rows:
+                break
+            entries = [
+                {'phone': phone, 'listing_id': listing_id, 'position': position}
+                for listing_id, phones in rows
+                for position, phone in enumerate(PhoneIndex.normalize_all(phones))
+            ]
+            if entries:
+                db.session.execute(ListingPhone.__table__.insert(), entries)
+            count += len(entries)
+            last_id = rows[-1][0]
+        db.session.commit()
+        return count
+
+    @staticmethod
+    def has_phone():
+        """Filter-Ausdruck: Listing hat mindestens eine gültige Nummer"""
+        return db.session.query(ListingPhone.id) \
+            .filter(ListingPhone.listing_id == ScrapedListing.id).exists()
+
+    @staticmethod
+    def primary_phones(listing_ids) -> dict:
+        """listing_id -> Hauptnummer (position 0) für eine Liste von Listings"""
+        if not listing_ids:
+            return {}
+        rows = db.session.query(ListingPhone.listing_id, ListingPhone.phone).filter(
+            ListingPhone.listing_id.in_(list(listing_ids)),
+            ListingPhone.position == 0
+        ).all()
+        return dict(rows)
+
+    @staticmethod
+    def listings_for_phone(phone) -> List[ScrapedListing]:
+        """Alle Listings mit dieser Nummer (neueste zuerst)"""
+        normalized = PhoneIndex.normalize(phone)
+        if not normalized:
+            return []
+        return ScrapedListing.query.join(ListingPhone, ListingPhone.listing_id == ScrapedListing.id) \
+            .filter(ListingPhone.phone == normalized) \
+            .order_by(ScrapedListing.created_at.desc()).all()
+
+    @staticmethod
+    def sellers(limit: int = 100, offset: int = 0) -> List[dict]:
+        """
+        Verkäufer (eine Zeile pro Nummer) mit Anzahl Listings, letztem Listing
+        und ob die Nummer schon kontaktiert wurde - meiste Listings zuerst
+        """
+        listing_count = db.func.count(ListingPhone.listing_id)
+        rows = db.session.query(
+            ListingPhone.phone,
+            listing_count,
+            db.func.max(ScrapedListing.created_at),
+            db.func.max(db.case((ScrapedListing.whatsapp_contacted.is_(True), 1), else_=0)),
+        ).join(ScrapedListing, ScrapedListing.id == ListingPhone.listing_id) \
+            .group_by(ListingPhone.phone) \
+            .order_by(listing_count.desc(), ListingPhone.phone) \
+            .limit(limit).offset(offset).all()
+        return [{
+            'phone': phone,
+            'listing_count': count,
+            'last_listing_at': last_created.isoformat() if last_created else None,
+            'contacted': bool(contacted),
+        } for phone, count, last_created, contacted in rows]
+
+    @staticmethod
+    def campaign_targets(limit: int) -> List[tuple]:
+        """
+        Kampagnen-Ziele: nicht kontaktierte Listings mit Hauptnummer, ein Listing
+        pro Nummer (ältestes zuerst), ohne Nummern, die über ein anderes Listing
+        schon kontaktiert wurden
+
+        Returns: Liste von (ScrapedListing, phone) - bis zu `limit` Einträge
+        """
+        contacted_phones = db.session.query(ListingPhone.phone) \
+            .join(ScrapedListing, ScrapedListing.id == ListingPhone.listing_id) \
+            .filter(ScrapedListing.whatsapp_contacted.is_(True))
+
+        first_listing = db.func.min(ListingPhone.listing_id)
+        rows = db.session.query(ListingPhone.phone, first_listing) \
+            .join(ScrapedListing, ScrapedListing.id == ListingPhone.listing_id) \
+            .filter(
+                ScrapedListing.whatsapp_contacted.is_(False),
+                ListingPhone.position == 0,
+                ListingPhone.phone.notin_(contacted_phones)
+            ).group_by(ListingPhone.phone) \
+            .order_by(first_listing).limit(limit).all()
+
+        listings = {l.id: l for l in ScrapedListing.query.filter(
+            ScrapedListing.id.in_([listing_id for _, listing_id in rows])
+        ).all()}
+        return [(listings[listing_id], phone) for phone, listing_id in rows if listing_id in listings]
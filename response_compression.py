@@ -0,0 +1,142 @@
+"""
+Response Compression
+Komprimiert Antworten (JSON, HTML, JS, CSS, ...) mit Brotli oder gzip,
+ausgehandelt über Accept-Encoding (bei gleicher Gewichtung gewinnt br).
+
+- Antworten unter COMPRESS_MIN_SIZE Bytes bleiben unkomprimiert
+  (Header-Overhead und CPU lohnen sich dort nicht)
+- Gestreamte Antworten (Generatoren, send_file) werden chunkweise
+  komprimiert, ohne sie im Speicher zu sammeln; Generator-Chunks werden
+  sofort geflusht, damit Streams beim Client ankommen (COMPRESS_STREAMS)
+- Bilder/bereits kodierte Antworten und 206/304 bleiben unverändert
+
+Verwendung (in create_app):
+    init_compression(app)
+"""
+import zlib
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dann nur gzip
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+    'text/css',
+    'text/csv',
+    'text/html',
+    'text/javascript',
+    'text/plain',
+    'text/xml',
+}
+
+ENCODINGS = ('br', 'gzip') if brotli else ('gzip',)
+
+
+class _StreamCompressor:
+    """Inkrementeller Kompressor mit einheitlicher Schnittstelle für br/gzip"""
+
+    def __init__(self, encoding: str, config):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(mode=brotli.MODE_TEXT,
+                                                 quality=config['COMPRESS_BR_QUALITY'])
+        else:
+            # wbits=31: gzip-Header und -Trailer
+            self._compressor = zlib.compressobj(config['COMPRESS_GZIP_LEVEL'], zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == 'br':
+            return self._compressor.process(data)
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        """Bisherige Daten ausgeben, ohne den Stream zu beenden"""
+        if self.encoding == 'br':
+            return self._compressor.flush()
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+def compress_bytes(data: bytes, encoding: str, config) -> bytes:
+    """Komprimiert einen kompletten Body"""
+    if encoding == 'br':
+        return brotli.compress(data, mode=brotli.MODE_TEXT, quality=config['COMPRESS_BR_QUALITY'])
+    compressor = _StreamCompressor(encoding, config)
+    return compressor.compress(data) + compressor.finish()
+
+
+def _compress_stream(chunks, compressor: _StreamCompressor, flush_chunks: bool):
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = compressor.compress(chunk)
+        if flush_chunks:
+            data += compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def compress_response(response):
+    """after_request-Hook: komprimiert die Antwort, falls Client und Inhalt passen"""
+    config = current_app.config
+    if not config['COMPRESS_ENABLED']:
+        return response
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return response
+    if 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+
+    # Die Antwort hängt ab jetzt vom Accept-Encoding ab (auch für Caches)
+    response.vary.add('Accept-Encoding')
+    encoding = request.accept_encodings.best_match(ENCODINGS)
+    if not encoding or request.method == 'HEAD':
+        return response
+
+    if response.is_streamed:
+        if not config['COMPRESS_STREAMS']:
+            return response
+        # send_file: Datei-Wrapper; Generatoren sollen Chunk für Chunk ankommen
+        passthrough = response.direct_passthrough
+        chunks = response.response
+        if hasattr(chunks, 'close'):
+            response.call_on_close(chunks.close)
+        response.response = _compress_stream(chunks, _StreamCompressor(encoding, config),
+                                             flush_chunks=not passthrough)
+        response.direct_passthrough = False
+        response.headers.pop('Content-Length', None)
+        # Byte-Ranges beziehen sich auf die unkomprimierte Datei
+        response.headers.pop('Accept-Ranges', None)
+    else:
+        data = response.get_data()
+        if len(data) < config['COMPRESS_MIN_SIZE']:
+            return response
+        response.set_data(compress_bytes(data, encoding, config))
+
+    response.headers['Content-Encoding'] = encoding
+    # Starke ETags gelten nur für die unkomprimierte Darstellung
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app) -> None:
+    """Registriert den Hook; Defaults lassen sich über app.config überschreiben"""
+    app.config.setdefault('COMPRESS_ENABLED', True)
+    app.config.setdefault('COMPRESS_MIN_SIZE', 500)
+    # Brotli 4 / gzip 6: guter Kompromiss aus Größe und CPU für dynamische Antworten
+    app.config.setdefault('COMPRESS_BR_QUALITY', 4)
+    app.config.setdefault('COMPRESS_GZIP_LEVEL', 6)
+    app.config.setdefault('COMPRESS_STREAMS', True)
+    app.after_request(compress_response)
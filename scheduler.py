@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Scheduler
+Löst wiederkehrende Scraping-Jobs aus den gespeicherten Schedules
+(scrape_schedules) aus. Läufe werden übersprungen, solange der vorherige Job
+desselben Bereichs noch wartet oder läuft; ein zufälliger Versatz (Jitter)
+verteilt die Startzeiten. Jeder Lauf landet mit Dauer und Anzahl neuer
+Listings in schedule_runs.
+
+Verwendung:
+    python scheduler.py                  # eigenständig (ohne Web-App)
+    python scheduler.py --once           # einmal prüfen und beenden
+
+Die Web-App startet den Scheduler selbst (SCHEDULER_ENABLED=1, Standard).
+"""
+import argparse
+import logging
+import random
+import threading
+from datetime import datetime, timedelta
+
+from job_queue import JobQueue
+from models import db, ScrapeJob, ScrapeSchedule, ScheduleRun
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduleService:
+    """Anlegen/Ändern von Schedules (braucht App-Context)"""
+
+    EDITABLE_FIELDS = ('name', 'kind', 'category', 'params', 'priority',
+                       'interval_minutes', 'jitter_seconds', 'enabled')
+
+    @staticmethod
+    def first_run_at(schedule, now=None):
+        """Erster Lauf zufällig innerhalb des ersten Intervalls (kein gleichzeitiger Start aller Schedules)"""
+        now = now or datetime.utcnow()
+        return now + timedelta(seconds=random.uniform(0, schedule.interval_minutes * 60))
+
+    @staticmethod
+    def next_run_at(schedule, now=None):
+        """Nächster Lauf: Intervall plus zufälliger Jitter"""
+        now = now or datetime.utcnow()
+        jitter = random.uniform(0, schedule.jitter_seconds or 0)
+        return now + timedelta(minutes=schedule.interval_minutes, seconds=jitter)
+
+    @staticmethod
+    def apply(schedule, data):
+        """
+        Übernimmt Felder aus einem dict und prüft sie
+
+        Raises:
+            ValueError: ungültige Werte
+        """
+        from scraper_config import ScraperConfig
+
+        for field in ScheduleService.EDITABLE_FIELDS:
+            if field in data:
+                setattr(schedule, field, data[field])
+
+        if not schedule.name:
+            raise ValueError('name is required')
+        if schedule.kind not in JobQueue.KINDS:
+            raise ValueError(f'Unknown job kind: {schedule.kind}')
+        if schedule.category and schedule.category not in ScraperConfig.CATEGORY_START_URLS:
+            raise ValueError(f'Unknown category: {schedule.category}')
+        if not schedule.interval_minutes or int(schedule.interval_minutes) < 1:
+            raise ValueError('interval_minutes must be at least 1')
+        schedule.interval_minutes = int(schedule.interval_minutes)
+        schedule.jitter_seconds = max(int(schedule.jitter_seconds or 0), 0)
+        schedule.priority = int(schedule.priority or 0)
+        schedule.enabled = bool(schedule.enabled)
+        return schedule
+
+    @staticmethod
+    def create(data):
+        schedule = ScheduleService.apply(
+            ScrapeSchedule(kind='scrape', enabled=True, priority=0, jitter_seconds=0), data)
+        schedule.next_run_at = ScheduleService.first_run_at(schedule)
+        db.session.add(schedule)
+        db.session.commit()
+        return schedule
+
+    @staticmethod
+    def update(schedule, data):
+        interval_changed = 'interval_minutes' in data and int(data['interval_minutes'] or 0) != schedule.interval_minutes
+        ScheduleService.apply(schedule, data)
+        if interval_changed or not schedule.next_run_at:
+            schedule.next_run_at = ScheduleService.first_run_at(schedule)
+        db.session.commit()
+        return schedule
+
+    @staticmethod
+    def job_params(schedule):
+        params = dict(schedule.params or {})
+        if schedule.kind == 'scrape':
+            params.setdefault('resume', True)  # inkrementell über die Frontier
+            if schedule.category:
+                params['category'] = schedule.category
+        return params
+
+
+class Scheduler:
+    """Prüft in festen Abständen, welche Schedules fällig sind, und legt Jobs an"""
+
+    def __init__(self, app, tick_interval=30.0, on_job=None):
+        """
+        Args:
+            app: Flask App (für App-Context)
+            tick_interval: Sekunden zwischen zwei Prüfungen
+            on_job: optionales callable(job_dict) für neu angelegte Jobs (z.B. SocketIO)
+        """
+        self.app = app
+        self.tick_interval = tick_interval
+        self.on_job = on_job
+        self._stop = threading.Event()
+
+    def start(self) -> threading.Thread:
+        """Startet den Scheduler als Daemon-Thread"""
+        thread = threading.Thread(target=self.run, name='scrape-scheduler', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self, once=False):
+        logger.info("Scheduler started")
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"Scheduler tick failed: {e}")
+                with self.app.app_context():
+                    db.session.rollback()
+            if once:
+                break
+            self._stop.wait(self.tick_interval)
+        logger.info("Scheduler stopped")
+
+    def tick(self, now=None):
+        """
+        Ein Durchlauf: Historie nachtragen, fällige Schedules auslösen
+        Returns: Liste der ausgelösten ScheduleRun dicts
+        """
+        now = now or datetime.utcnow()
+        with self.app.app_context():
+            self.update_history()
+            due = ScrapeSchedule.query.filter(
+                ScrapeSchedule.enabled.is_(True),
+                ScrapeSchedule.next_run_at <= now
+            ).order_by(ScrapeSchedule.next_run_at).all()
+            return [run for run in (self.trigger(schedule, now) for schedule in due) if run]
+
+    def trigger(self, schedule, now=None, force=False):
+        """
+        Löst einen Schedule aus (Job anlegen oder als 'skipped' protokollieren)
+
+        Args:
+            force: manuell ausgelöst - next_run_at bleibt unverändert
+
+        Returns:
+            ScheduleRun dict oder None wenn ein anderer Prozess schneller war
+        """
+        now = now or datetime.utcnow()
+
+        if not force:
+            # Bedingtes UPDATE: nur ein Scheduler-Prozess übernimmt den fälligen Lauf
+            claimed = ScrapeSchedule.query.filter_by(id=schedule.id, next_run_at=schedule.next_run_at).update({
+                'next_run_at': ScheduleService.next_run_at(schedule, now),
+                'last_run_at': now,
+            }, synchronize_session=False)
+            db.session.commit()
+            if not claimed:
+                return None
+
+        params = ScheduleService.job_params(schedule)
+        scope = JobQueue.scope_for(schedule.kind, params)
+        busy = ScrapeJob.query.filter(
+            ScrapeJob.scope == scope,
+            ScrapeJob.status.in_(JobQueue.ACTIVE)
+        ).first()
+
+        if busy:
+            run = ScheduleRun(schedule_id=schedule.id, status='skipped', triggered_at=now,
+                              reason=f'Job #{busy.id} for {scope} is still {busy.status}')
+            logger.info(f"Schedule '{schedule.name}' skipped: {run.reason}")
+            db.session.add(run)
+            db.session.commit()
+            return run.to_dict()
+
+        job = JobQueue.enqueue(schedule.kind, params, priority=schedule.priority)
+        run = ScheduleRun(schedule_id=schedule.id, job_id=job.id, status=JobQueue.QUEUED, triggered_at=now)
+        db.session.add(run)
+        if force:
+            schedule.last_run_at = now
+        db.session.commit()
+        logger.info(f"Schedule '{schedule.name}' queued job #{job.id}")
+
+        if self.on_job:
+            self.on_job(job.to_dict(include_result=False))
+        return run.to_dict()
+
+    def update_history(self):
+        """Überträgt Status, Dauer und Zähler abgeschlossener Jobs in schedule_runs"""
+        open_runs = ScheduleRun.query.filter(ScheduleRun.status.in_(JobQueue.ACTIVE)).all()
+        if not open_runs:
+            return 0
+
+        jobs = {job.id: job for job in ScrapeJob.query.filter(
+            ScrapeJob.id.in_([run.job_id for run in open_runs])
+        ).all()}
+        for run in open_runs:
+            job = jobs.get(run.job_id)
+            if not job:
+                run.status = JobQueue.FAILED
+                run.reason = 'Job not found'
+                continue
+            run.status = job.status
+            if job.status in JobQueue.FINISHED:
+                counters = (job.result or {}).get('refresh') or job.result or job.progress or {}
+                run.new_listings = counters.get('saved', 0)
+                run.updated_listings = counters.get('updated', 0)
+                run.finished_at = job.finished_at
+                if job.started_at and job.finished_at:
+                    run.duration_seconds = round((job.finished_at - job.started_at).total_seconds(), 2)
+                if job.error:
+                    run.reason = job.error.splitlines()[0][:300]
+        db.session.commit()
+        return len(open_runs)
+
+
+def main():
+    from models import create_db_app
+    from utils import configure_logging
+
+    parser = argparse.ArgumentParser(description='Recurring scrape job scheduler')
+    parser.add_argument('--once', action='store_true', help='Check schedules once and exit')
+    parser.add_argument('--tick-interval', type=float, default=30.0, help='Seconds between schedule checks')
+    args = parser.parse_args()
+
+    configure_logging()
+    Scheduler(create_db_app(), tick_interval=args.tick_interval).run(once=args.once)
+
+
+if __name__ == '__main__':
+    main()
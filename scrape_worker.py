@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Scrape Worker
+Arbeitet Jobs aus der scrape_jobs Tabelle ab (Scraping mit Firefox, Refresh
+bekannter Listings) und meldet Logs und Status über scrape_job_events an die
+Web-App zurück. Mehrere Worker-Prozesse können parallel laufen.
+
+Verwendung:
+    python scrape_worker.py                 # Endlosschleife, pollt alle 2s
+    python scrape_worker.py --once          # genau einen Job abarbeiten
+    python scrape_worker.py --poll-interval 5 --worker-id box1-w1
+    python scrape_worker.py --max-running 4     # höchstens 4 Jobs gleichzeitig (alle Worker)
+
+Ohne separaten Prozess startet app.py einen eingebetteten Worker
+(SCRAPE_WORKER_MODE=embedded, Standard).
+"""
+import argparse
+import itertools
+import json
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+import traceback
+from datetime import datetime
+
+from job_queue import JobQueue
+from listing_store import apply_listing_changes, listing_fingerprint, save_scraped_listing
+from models import db, ScrapedListing, ScrapeJob
+
+logger = logging.getLogger(__name__)
+
+_worker_numbers = itertools.count(1)
+
+
+class JobEventWriter:
+    """Schreibt Worker-Events gepuffert in scrape_job_events (externer Worker-Prozess)"""
+
+    def __init__(self, app, max_buffer=100):
+        self.app = app
+        self.max_buffer = max_buffer
+        self._buffer = []
+        self._lock = threading.Lock()
+
+    def publish(self, job_id, event, payload):
+        with self._lock:
+            self._buffer.append((job_id, event, payload))
+            full = len(self._buffer) >= self.max_buffer
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            events, self._buffer = self._buffer, []
+        if not events:
+            return
+        try:
+            with self.app.app_context():
+                JobQueue.add_events(events)
+        except Exception as e:
+            logger.error(f"Failed to write {len(events)} job events: {e}")
+
+
+class JobLogger:
+    """Logger-Schnittstelle der Scraper (log/debug/info/...), leitet an die Job-Events weiter"""
+
+    def __init__(self, publish, job_id):
+        self.publish = publish
+        self.job_id = job_id
+
+    def log(self, level: str, message: str):
+        self.publish(self.job_id, 'log', {'level': level, 'message': message, 'job_id': self.job_id})
+        logger.log(logging.DEBUG if level == 'DEBUG' else logging.INFO, f"[job {self.job_id}] {message}")
+
+    def debug(self, message: str):
+        self.log('DEBUG', message)
+
+    def info(self, message: str):
+        self.log('INFO', message)
+
+    def warning(self, message: str):
+        self.log('WARNING', message)
+
+    def error(self, message: str):
+        self.log('ERROR', message)
+
+
+class ScrapeWorker:
+    """Holt Jobs aus der Warteschlange und führt sie nacheinander aus"""
+
+    def __init__(self, app, publish=None, worker_id=None, poll_interval=2.0,
+                 heartbeat_interval=5.0, stale_timeout=120, max_running=0):
+        """
+        Args:
+            app: Flask App (nur für App-Context/DB)
+            publish: callable(job_id, event, payload) - Standard: scrape_job_events Tabelle
+            worker_id: eindeutiger Name (Standard: host:pid:n)
+            poll_interval: Sekunden zwischen zwei Abfragen bei leerer Warteschlange
+            heartbeat_interval: Sekunden zwischen zwei Heartbeats eines laufenden Jobs
+            stale_timeout: laufende Jobs ohne Heartbeat werden danach neu eingeplant
+            max_running: max. gleichzeitig laufende Jobs über alle Worker (0 = unbegrenzt)
+        """
+        self.app = app
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{next(_worker_numbers)}"
+        self.event_writer = None if publish else JobEventWriter(app)
+        self.publish = publish or self.event_writer.publish
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_timeout = stale_timeout
+        self.max_running = max_running
+
+        self._stop = threading.Event()
+        self._cancel = threading.Event()
+        self._current_scraper = None
+        self._progress = {}
+
+    def start(self) -> threading.Thread:
+        """Startet den Worker als Daemon-Thread (eingebetteter Modus)"""
+        thread = threading.Thread(target=self.run, name=f'scrape-worker-{self.worker_id}', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        """Beendet die Schleife; ein laufender Job wird abgebrochen"""
+        self._stop.set()
+        self._cancel_current()
+
+    def run(self, once=False):
+        """
+        Hauptschleife
+
+        Args:
+            once: nach dem ersten Job (oder leerer Warteschlange) zurückkehren
+        """
+        logger.info(f"Scrape worker {self.worker_id} started")
+        while not self._stop.is_set():
+            try:
+                with self.app.app_context():
+                    requeued = JobQueue.requeue_stale(self.stale_timeout)
+                    if requeued:
+                        logger.warning(f"{requeued} stale jobs requeued")
+                    job = JobQueue.claim(self.worker_id, max_running=self.max_running)
+                    job_info = (job.id, job.kind, dict(job.params or {}), job.scope) if job else None
+            except Exception as e:
+                logger.error(f"Failed to claim job: {e}")
+                job_info = None
+
+            if job_info:
+                self.run_job(*job_info)
+            if once:
+                break
+            if not job_info:
+                self._stop.wait(self.poll_interval)
+        logger.info(f"Scrape worker {self.worker_id} stopped")
+
+    def _cancel_current(self):
+        self._cancel.set()
+        scraper = self._current_scraper
+        if scraper:
+            try:
+                scraper.stop()
+            except Exception as e:
+                logger.error(f"Error stopping scraper: {e}")
+
+    def _publish_job(self, job):
+        if job:
+            self.publish(job.id, 'job_update', job.to_dict(include_result=False))
+
+    def _monitor(self, job_id, done):
+        """Heartbeat + Abbruch-Prüfung, leert regelmäßig den Event-Puffer"""
+        last_heartbeat = time.monotonic()
+        while not done.wait(1.0):
+            if self.event_writer:
+                self.event_writer.flush()
+            if time.monotonic() - last_heartbeat < self.heartbeat_interval:
+                continue
+            last_heartbeat = time.monotonic()
+            try:
+                with self.app.app_context():
+                    if JobQueue.heartbeat(job_id, self._progress) and not self._cancel.is_set():
+                        logger.info(f"Cancel requested for job {job_id}")
+                        self._cancel_current()
+            except Exception as e:
+                logger.error(f"Heartbeat failed for job {job_id}: {e}")
+
+    def run_job(self, job_id, kind, params, scope=None):
+        """Führt einen übernommenen Job aus und schließt ihn ab"""
+        handlers = {
+            'scrape': self._run_scrape,
+            'refresh': self._run_refresh,
+        }
+        job_logger = JobLogger(self.publish, job_id)
+        self._cancel.clear()
+        self._progress = {}
+
+        with self.app.app_context():
+            self._publish_job(db.session.get(ScrapeJob, job_id))
+
+        done = threading.Event()
+        monitor = threading.Thread(target=self._monitor, args=(job_id, done), daemon=True)
+        monitor.start()
+
+        status, result, error = JobQueue.COMPLETED, None, None
+        try:
+            handler = handlers.get(kind)
+            if not handler:
+                raise ValueError(f"Unknown job kind: {kind}")
+            result = handler(job_id, params, job_logger, scope)
+            if self._cancel.is_set():
+                status = JobQueue.CANCELLED
+        except Exception as e:
+            error_trace = traceback.format_exc()
+            job_logger.log('ERROR', f'{kind.capitalize()} job failed: {str(e)}')
+            job_logger.log('ERROR', f'Full traceback: {error_trace}')
+            status, error = JobQueue.FAILED, f"{e}\n{error_trace}"
+        finally:
+            done.set()
+            monitor.join()
+            self._current_scraper = None
+
+        with self.app.app_context():
+            job = JobQueue.finish(job_id, status, result=_json_safe(result), error=error,
+                                 progress=self._progress)
+            self._publish_job(job)
+        if self.event_writer:
+            self.event_writer.flush()
+        return status
+
+    def _run_scrape(self, job_id, params, job_logger, scope=None):
+        """
+        Scraping mit Firefox (SeleniumBrowserScraper), Listings werden einzeln gespeichert
+        Mit params['category'] startet die Link-Suche auf der Kategorie-Seite und
+        nutzt einen eigenen Frontier-Bereich
+        """
+        from crawl_frontier import CrawlFrontier
+        from scraper_config import ScraperConfig
+        from selenium_browser_scraper import SeleniumBrowserScraper
+
+        max_listings = int(params.get('max_listings') or 3)
+        resume = bool(params.get('resume', True))
+        category = params.get('category')
+        start_url = ScraperConfig.CATEGORY_START_URLS.get(category) if category else None
+        counters = self._progress = {'saved': 0, 'updated': 0, 'unchanged': 0}
+
+        def on_result(result):
+            with self.app.app_context():
+                outcome = save_scraped_listing(result, job_logger)
+            if outcome == 'created':
+                counters['saved'] += 1
+            elif outcome in counters:
+                counters[outcome] += 1
+            self.publish(job_id, 'job_progress', {'job_id': job_id, 'outcome': outcome, **counters})
+
+        job_logger.log('INFO', 'Initializing scraper...')
+        scraper = SeleniumBrowserScraper(
+            job_logger,
+            frontier=CrawlFrontier(self.app, scope=scope or JobQueue.scope_for('scrape', params)),
+            on_result=on_result
+        )
+        self._current_scraper = scraper
+        if self._cancel.is_set():
+            scraper.stop()
+
+        try:
+            job_logger.log('INFO', 'Starting Firefox browser scraper'
+                                   + (f' (category: {category})...' if category else '...'))
+            results = scraper.scrape_revolico(max_listings=max_listings, resume=resume, start_url=start_url)
+        finally:
+            try:
+                scraper.close()
+            except Exception as close_error:
+                job_logger.log('WARNING', f'Error closing scraper: {str(close_error)}')
+
+        # Listings were persisted one by one via on_result
+        job_logger.log('SUCCESS', f"Saved {counters['saved']} new listings to database "
+                                  f"({counters['updated']} updated)")
+        job_logger.log('SUCCESS', 'Scraping completed successfully')
+        return {**counters, 'scrape': results}
+
+    def _run_refresh(self, job_id, params, job_logger, scope=None):
+        """Refresh-Modus: bekannte Listings leichtgewichtig nachladen"""
+        from http_cache import HttpCache
+        from listing_refresh import ListingRefresher
+
+        limit = int(params.get('limit') or 50)
+        with self.app.app_context():
+            # Nie geprüfte zuerst, danach die am längsten nicht geprüften; entfernte nicht mehr
+            known = ScrapedListing.query.filter(ScrapedListing.gone_at.is_(None)) \
+                .order_by(ScrapedListing.last_checked_at.asc().nullsfirst(), ScrapedListing.scraped_at.asc()) \
+                .with_entities(ScrapedListing.id, ScrapedListing.url).limit(limit).all()
+        targets = [(row.id, row.url) for row in known]
+
+        counters = self._progress = {'unchanged': 0, 'updated': 0, 'gone': 0, 'errors': 0}
+        refresher = ListingRefresher(http_cache=HttpCache.from_config())
+        job_logger.log('INFO', f'🔄 Refreshing {len(targets)} known listings...')
+
+        for index, (listing_id, url) in enumerate(targets):
+            if self._cancel.is_set():
+                job_logger.log('WARNING', 'Refresh gestoppt durch Benutzer')
+                break
+
+            if index > 0:
+                refresher.wait()
+
+            status, light = refresher.fetch(url)
+
+            with self.app.app_context():
+                listing = db.session.get(ScrapedListing, listing_id)
+                if not listing:
+                    continue
+                # Jeder Versuch zählt als geprüft - sonst blockieren tote/gesperrte
+                # Listings dauerhaft den Anfang der Refresh-Reihenfolge
+                listing.last_checked_at = datetime.utcnow()
+
+                if status == 'gone':
+                    counters['gone'] += 1
+                    listing.gone_at = listing.last_checked_at
+                    job_logger.log('INFO', f'🗑️  Listing gone: {url}')
+                elif status == 'error':
+                    counters['errors'] += 1
+                    job_logger.log('WARNING', f'Refresh failed for {url}: {light}')
+                elif apply_listing_changes(listing, light, listing_fingerprint(light)):
+                    counters['updated'] += 1
+                    job_logger.log('INFO', f'✏️  Listing updated: {listing.title[:60]}')
+                else:
+                    counters['unchanged'] += 1
+                db.session.commit()
+
+        job_logger.log('SUCCESS', f"Refresh completed: {counters['updated']} updated, "
+                                  f"{counters['unchanged']} unchanged, {counters['gone']} gone, "
+                                  f"{counters['errors']} errors")
+        return {'refresh': counters}
+
+
+def _json_safe(value):
+    """Job-Ergebnis JSON-tauglich machen (datetime etc. als String)"""
+    if value is None:
+        return None
+    return json.loads(json.dumps(value, default=str))
+
+
+def main():
+    from models import create_db_app
+    from utils import configure_logging
+
+    parser = argparse.ArgumentParser(description='Scraping job worker')
+    parser.add_argument('--once', action='store_true', help='Process at most one job and exit')
+    parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds between queue polls')
+    parser.add_argument('--worker-id', help='Worker name shown in the job list')
+    parser.add_argument('--max-running', type=int, default=int(os.environ.get('SCRAPE_MAX_RUNNING', '0')),
+                        help='Max. concurrently running jobs across all workers (0 = unlimited)')
+    args = parser.parse_args()
+
+    configure_logging()
+    worker = ScrapeWorker(create_db_app(), worker_id=args.worker_id, poll_interval=args.poll_interval,
+                          max_running=args.max_running)
+
+    def handle_signal(signum, frame):
+        logger.info(f"Signal {signum} received, stopping worker...")
+        worker.stop()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+    worker.run(once=args.once)
+
+
+if __name__ == '__main__':
+    main()
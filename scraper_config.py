@@ -1,6 +1,7 @@
 """
 Configuration settings for Revolico scraper
 """
+import os
 
 class ScraperConfig:
     """Configuration class for scraper settings"""
@@ -50,3 +51,22 @@ class ScraperConfig:
     REQUESTS_PER_MINUTE = 10
     BACKOFF_FACTOR = 2.0
     MAX_BACKOFF = 60.0
+    
+    # HTTP response cache for homepage and listing pages (requests-based scrapers)
+    HTTP_CACHE_ENABLED = os.environ.get('HTTP_CACHE_ENABLED', '1') == '1'
+    HTTP_CACHE_PATH = os.environ.get('HTTP_CACHE_PATH', 'http_cache.db')
+    HTTP_CACHE_TTL = int(os.environ.get('HTTP_CACHE_TTL', '900'))  # seconds
+    HTTP_CACHE_OFFLINE = os.environ.get('HTTP_CACHE_OFFLINE', '0') == '1'  # replay only, never hit the network
+
+    # Category start pages for scoped scrape jobs (job param "category")
+    CATEGORY_START_URLS = {
+        'moviles': 'https://www.revolico.com/compra-venta/celulares-lineas-accesorios',
+        'computadoras': 'https://www.revolico.com/compra-venta/computadoras',
+        'electrodomesticos': 'https://www.revolico.com/compra-venta/electrodomesticos',
+        'muebles': 'https://www.revolico.com/compra-venta/muebles-decoracion',
+        'ropa': 'https://www.revolico.com/compra-venta/ropa-zapato-accesorios',
+        'autos': 'https://www.revolico.com/autos',
+        'vivienda': 'https://www.revolico.com/vivienda',
+        'servicios': 'https://www.revolico.com/servicios',
+        'empleos': 'https://www.revolico.com/empleos',
+    }
@@ -9,17 +9,20 @@ import re
 import json
 import time
 import random
-from bs4 import BeautifulSoup
 from typing import List, Dict, Any
 import logging
 
+from http_cache import HttpCache
+from utils import configure_logging
+
 # Setup logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+configure_logging()
 logger = logging.getLogger(__name__)
 
 class SimpleRevolicoScraper:
     def __init__(self):
         self.session = requests.Session()
+        self.http_cache = HttpCache.from_config()
         
         # Real browser headers to avoid detection
         self.session.headers.update({
@@ -40,11 +43,16 @@ class SimpleRevolicoScraper:
         """Get listing links from homepage"""
         try:
             logger.info("🌐 Loading revolico.com homepage...")
-            response = self.session.get('https://www.revolico.com', timeout=30)
+            if self.http_cache:
+                # TTL + Revalidierung halten die Homepage aktuell; offline nur aus dem Cache
+                response = self.http_cache.get(self.session, 'https://www.revolico.com', timeout=30)
+            else:
+                response = self.session.get('https://www.revolico.com', timeout=30)
             response.raise_for_status()
             
             logger.info(f"✅ Homepage loaded: {response.status_code}, {len(response.text)} chars")
             
+            from bs4 import BeautifulSoup
             soup = BeautifulSoup(response.text, 'html.parser')
             
             # Find listing links
@@ -94,10 +102,15 @@ class SimpleRevolicoScraper:
         try:
             logger.info(f"📄 Visiting: {url}")
             
-            # Random delay
-            time.sleep(random.uniform(2, 5))
-            
-            response = self.session.get(url, timeout=30)
+            if self.http_cache:
+                # Random delay (not needed when the page is served from cache)
+                if not self.http_cache.is_fresh(url):
+                    time.sleep(random.uniform(2, 5))
+                response = self.http_cache.get(self.session, url, timeout=30)
+            else:
+                # Random delay
+                time.sleep(random.uniform(2, 5))
+                response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
             logger.info(f"Page loaded: {response.status_code}, {len(response.text)} chars")
@@ -115,6 +128,7 @@ class SimpleRevolicoScraper:
             
             # Focus on user profile area where contact info is located
             found_phones = []
+            from bs4 import BeautifulSoup
             soup = BeautifulSoup(response.text, 'html.parser')
             
             # Look for user profile section (like the one you showed)
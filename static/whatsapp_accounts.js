@@ -17,6 +17,21 @@ async function loadWhatsAppAccounts() {
     }
 }
 
+// Apply an account_updated / account_deleted change from the change feed
+function applyAccountChange(change) {
+    if (change.type === 'account_deleted') {
+        currentAccounts = currentAccounts.filter(account => account.id !== change.data.id);
+    } else {
+        const index = currentAccounts.findIndex(account => account.id === change.data.id);
+        if (index >= 0) {
+            currentAccounts[index] = change.data;
+        } else {
+            currentAccounts.push(change.data);
+        }
+    }
+    renderAccountsList();
+}
+
 // Render accounts list
 function renderAccountsList() {
     const accountsList = document.getElementById('accountsList');
@@ -149,8 +164,7 @@ async function deleteAccount(accountId) {
 document.addEventListener('DOMContentLoaded', function() {
     loadWhatsAppAccounts();
 
-    // Refresh accounts every 30 seconds
-    setInterval(loadWhatsAppAccounts, 30000);
+    // No polling: account changes arrive as 'change' events (see applyAccountChange)
 
     // Socket.IO event listeners for real-time updates
     if (typeof socket !== 'undefined') {
@@ -176,5 +190,13 @@ document.addEventListener('DOMContentLoaded', function() {
             // Reload accounts to show updated message counts
             loadWhatsAppAccounts();
         });
+
+        // Background session restore progress (after server start)
+        socket.on('whatsapp_restore_progress', function(data) {
+            console.log('WhatsApp restore progress:', data);
+            if (data.state !== 'pending' && data.state !== 'restoring') {
+                loadWhatsAppAccounts();
+            }
+        });
     }
 });
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Test category mapping (keyword regex, accent folding, specificity, batch API)
+"""
+from category_mapping import (CATEGORY_MAPPINGS, DEFAULT_CATEGORY, fold, get_category_suggestions,
+                              map_categories, map_category)
+
+
+def test_fold_removes_accents_and_case():
+    assert fold('Telefonía Móvil') == 'telefonia movil'
+    assert fold('Diseño') == 'diseno'
+
+
+def test_accented_input_matches_plain_keywords():
+    assert map_category('Cámaras') == 'Foto / Video'
+    assert map_category('Diseño Gráfico') == 'Diseño / Decoración'
+    assert map_category('ELECTRODOMÉSTICOS') == 'Electrodomésticos'
+
+
+def test_longest_keyword_wins_over_dict_order():
+    # 'foto' steht im Mapping vor 'fotografia', 'cama' steckt in 'camara'
+    assert map_category('Fotografía') == 'Servicio de Foto & Video'
+    assert map_category('Camara digital') == 'Foto / Video'
+    assert map_category('Busco trabajo') == 'Busco Trabajo'
+
+
+def test_suggestions_are_ranked_by_specificity():
+    assert get_category_suggestions('Busco trabajo') == ['Busco Trabajo', 'Ofertas de Empleo']
+    assert get_category_suggestions('Cámaras') == ['Foto / Video']
+
+
+def test_default_category():
+    assert map_category('') == DEFAULT_CATEGORY
+    assert map_category(None) == DEFAULT_CATEGORY
+    assert map_category('xyz') == DEFAULT_CATEGORY
+    assert get_category_suggestions('xyz') == [DEFAULT_CATEGORY]
+
+
+def test_every_keyword_maps_to_its_category():
+    for keyword, rico_category in CATEGORY_MAPPINGS.items():
+        assert rico_category in get_category_suggestions(keyword)
+
+
+def test_batch_matches_single_mapping():
+    values = ['Laptops', 'Cámaras', None, 'Laptops', 'Motos', 'Otros servicios']
+    assert map_categories(values) == [map_category(v) for v in values]
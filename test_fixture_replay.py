@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test fixture record & replay (offline, uses the saved debug_page_*.html dumps)
+"""
+import os
+import tempfile
+
+import requests
+
+from fixtures import FIXTURE_FORMAT_VERSION, FixtureArchive, FixtureRecorder, ReplayServer
+from listing_parser import parse_listing_page
+
+
+def build_archive(path):
+    recorder = FixtureRecorder(source='test')
+    recorder.import_html_dump('debug_page_2.html')
+    recorder.record('https://www.revolico.com/item/gone-123', '<html>no next data</html>', status=404)
+    recorder.save(path)
+    return FixtureArchive.load(path)
+
+
+def test_archive_roundtrip():
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = build_archive(os.path.join(tmp, 'fixtures.tar.gz'))
+
+    assert archive.manifest['version'] == FIXTURE_FORMAT_VERSION
+    assert len(archive.pages) == 2
+    page = archive.get('https://www.revolico.com/item/juego-de-champu-y-acondicionar-pantene-51265436')
+    with open('debug_page_2.html', 'rb') as f:
+        assert page['body'] == f.read()
+
+
+def test_replay_server_serves_recorded_pages():
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = build_archive(os.path.join(tmp, 'fixtures.tar.gz'))
+
+    with ReplayServer(archive) as server:
+        url = 'https://www.revolico.com/item/juego-de-champu-y-acondicionar-pantene-51265436'
+        response = requests.get(server.url_for(url), timeout=5)
+        assert response.status_code == 200
+        data = parse_listing_page(response.text, url)
+        assert data['revolico_id'] == '51265436'
+        assert data['price'] == 10.0
+
+        assert requests.get(server.url_for('https://www.revolico.com/item/gone-123'), timeout=5).status_code == 404
+        assert requests.get(server.base_url + '/item/never-recorded-1', timeout=5).status_code == 404
+
+
+def test_recorder_attaches_to_session():
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = build_archive(os.path.join(tmp, 'fixtures.tar.gz'))
+
+        with ReplayServer(archive) as server:
+            recorder = FixtureRecorder()
+            session = recorder.attach(requests.Session())
+            session.get(server.url_for('https://www.revolico.com/item/gone-123'), timeout=5)
+
+        path = os.path.join(tmp, 'recorded.tar.gz')
+        assert recorder.save(path) == 1
+        page = FixtureArchive.load(path).get('/item/gone-123')
+        assert page['status'] == 404
+        assert page['body'] == b'<html>no next data</html>'
+
+
+if __name__ == '__main__':
+    test_archive_roundtrip()
+    test_replay_server_serves_recorded_pages()
+    test_recorder_attaches_to_session()
+    print("✅ Fixture replay tests passed")
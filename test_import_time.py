@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test import graph & import time (python -X importtime)
+Schwere Abhängigkeiten (Selenium, webdriver-manager, cloudscraper, bs4) dürfen
+erst geladen werden, wenn das jeweilige Subsystem benutzt wird.
+
+Budget per Umgebungsvariable anpassbar: IMPORT_TIME_BUDGET_APP (Sekunden)
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+HEAVY_MODULES = {'selenium', 'webdriver_manager', 'cloudscraper', 'bs4', 'whatsapp_simple'}
+
+APP_IMPORT_BUDGET = float(os.environ.get('IMPORT_TIME_BUDGET_APP', '3.0'))
+
+
+def import_profile(module):
+    """
+    Importiert `module` in einem frischen Interpreter mit -X importtime
+
+    Returns:
+        dict top-level Paketname -> kumulierte Importzeit in Sekunden
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ,
+                   PYTHONPATH=ROOT,
+                   DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'import.db')}",
+                   LOG_DIR=os.path.join(tmp, 'logs'),
+                   WHATSAPP_RESTORE_MODE='lazy',
+                   SCHEDULER_ENABLED='0')
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=tmp, env=env, capture_output=True, text=True, timeout=120
+        )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        top_level = name.strip().split('.')[0]
+        modules[top_level] = max(modules.get(top_level, 0.0), int(cumulative) / 1e6)
+    return modules
+
+
+def test_app_import_is_slim():
+    modules = import_profile('app')
+    assert not HEAVY_MODULES & set(modules), sorted(HEAVY_MODULES & set(modules))
+    assert modules['app'] < APP_IMPORT_BUDGET, f"import app took {modules['app']:.2f}s"
+
+
+def test_cli_tools_do_not_import_app():
+    modules = import_profile('cache_existing_profiles')
+    assert 'app' not in modules
+    assert 'flask_socketio' not in modules
+    assert not HEAVY_MODULES & set(modules)
+
+
+def test_scraper_modules_defer_parsers():
+    for module in ('main', 'simple_requests_scraper', 'cloudscraper_revolico', 'enhanced_requests_scraper'):
+        modules = import_profile(module)
+        assert 'bs4' not in modules, module
+        assert 'cloudscraper' not in modules, module
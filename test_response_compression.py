@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test JSON provider and response compression (negotiation, threshold, streaming)
+"""
+import gzip
+import json
+from datetime import datetime
+
+import brotli
+from flask import Flask, Response, jsonify
+
+from json_provider import FastJSONProvider
+from response_compression import init_compression
+
+ROWS = [{'id': i, 'title': f'Listing {i}', 'created_at': datetime(2024, 1, 1, 12, 30)} for i in range(200)]
+
+
+def make_client():
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    init_compression(app)
+    app.add_url_rule('/rows', 'rows', lambda: jsonify({'rows': ROWS}))
+    app.add_url_rule('/small', 'small', lambda: jsonify({'ok': True}))
+    app.add_url_rule('/stream', 'stream', lambda: Response((f'line {i}\n' for i in range(100)),
+                                                           mimetype='text/plain'))
+    return app.test_client()
+
+
+def test_datetimes_are_iso_8601():
+    data = json.loads(make_client().get('/rows').get_data())
+    assert data['rows'][0]['created_at'] == '2024-01-01T12:30:00'
+
+
+def test_brotli_preferred_and_gzip_fallback():
+    client = make_client()
+    plain = client.get('/rows').get_data()
+
+    response = client.get('/rows', headers={'Accept-Encoding': 'gzip, deflate, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert brotli.decompress(response.get_data()) == plain
+
+    response = client.get('/rows', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.get_data()) == plain
+
+
+def test_small_and_unaccepted_responses_stay_plain():
+    client = make_client()
+    assert 'Content-Encoding' not in client.get('/small', headers={'Accept-Encoding': 'br'}).headers
+    assert 'Content-Encoding' not in client.get('/rows').headers
+    assert 'Content-Encoding' not in client.get('/rows', headers={'Accept-Encoding': 'br;q=0, gzip;q=0'}).headers
+
+
+def test_streamed_response_is_compressed_incrementally():
+    response = make_client().get('/stream', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+    assert gzip.decompress(response.get_data()).decode().splitlines()[-1] == 'line 99'
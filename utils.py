@@ -2,39 +2,198 @@
 Utility functions for the Revolico scraper
 """
 
+import atexit
+import copy
 import json
 import logging
+import queue
 import random
+import time
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Dict, Any
 import os
 
-def setup_logging() -> logging.Logger:
-    """Setup logging configuration"""
-    # Create logs directory if it doesn't exist
-    os.makedirs('logs', exist_ok=True)
-    
-    # Configure logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('logs/scraper.log'),
-            logging.StreamHandler()
-        ]
+# Logging-Konfiguration (einmal pro Prozess, siehe configure_logging)
+LOG_DIR = os.environ.get('LOG_DIR', 'logs')
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')  # 'json' oder 'text' (nur Dateien)
+LOG_MAX_BYTES = int(os.environ.get('LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.environ.get('LOG_BACKUP_COUNT', '5'))
+LOG_ROTATE_HOURS = float(os.environ.get('LOG_ROTATE_HOURS', '24'))
+LOG_MAX_MESSAGE_LENGTH = 4000
+
+# Per-Modul Level, überschreibbar mit LOG_LEVELS="selenium=DEBUG,whatsapp_manager=WARNING"
+DEFAULT_MODULE_LEVELS = {
+    'urllib3': 'WARNING',
+    'selenium': 'WARNING',
+    'WDM': 'WARNING',
+    'engineio': 'WARNING',
+    'socketio': 'WARNING',
+    'werkzeug': 'WARNING',
+}
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_log_listener = None
+
+# Standard-Attribute eines LogRecords (alles andere wird als Extra-Feld ausgegeben)
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatiert LogRecords als eine JSON-Zeile pro Eintrag"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': message,
+            'module': record.module,
+            'line': record.lineno,
+            'thread': record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        # Über die Queue kommt der Traceback bereits formatiert als exc_text (StructuredQueueHandler)
+        exc_text = self.formatException(record.exc_info) if record.exc_info else record.exc_text
+        if exc_text:
+            entry['exc_info'] = exc_text
+        if record.stack_info:
+            entry['stack_info'] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class StructuredQueueHandler(QueueHandler):
+    """
+    QueueHandler, der Tracebacks getrennt von der Meldung weitergibt
+    (QueueHandler.prepare() faltet exc_info sonst in msg ein und löscht es)
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            # exc_info ist nicht picklebar und gehört zum Thread des Aufrufers - als Text mitschicken
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class TruncateFilter(logging.Filter):
+    """Kürzt überlange Meldungen (z.B. versehentlich geloggte Seiteninhalte)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        message = record.getMessage()
+        if len(message) > LOG_MAX_MESSAGE_LENGTH:
+            record.msg = message[:LOG_MAX_MESSAGE_LENGTH] + f'... [{len(message)} chars]'
+            record.args = None
+        return True
+
+
+class SizeAndTimeRotatingFileHandler(RotatingFileHandler):
+    """Rotiert bei Erreichen von maxBytes ODER nach `interval` Sekunden"""
+
+    def __init__(self, filename, maxBytes=0, backupCount=0, interval=86400, encoding='utf-8'):
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding, delay=True)
+        self.interval = interval
+        if os.path.exists(filename):
+            self.rollover_at = os.path.getmtime(filename) + interval
+        else:
+            self.rollover_at = time.time() + interval
+
+    def shouldRollover(self, record):
+        if self.interval and time.time() >= self.rollover_at:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.rollover_at = time.time() + self.interval
+
+
+def _parse_module_levels(spec: str) -> Dict[str, str]:
+    levels = {}
+    for item in (spec or '').split(','):
+        if '=' in item:
+            name, level = item.split('=', 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging(level: str = None, log_dir: str = None, module_levels: Dict[str, str] = None,
+                      console: bool = True) -> None:
+    """
+    Richtet das Logging einmal pro Prozess ein (weitere Aufrufe sind No-ops)
+
+    Alle Records gehen über einen QueueHandler an einen QueueListener-Thread,
+    der in rotierende Dateien (logs/scraper.log, logs/scraper_errors.log) und
+    optional auf die Konsole schreibt - Hot Paths blockieren nie auf Disk-I/O.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+
+    log_dir = log_dir or LOG_DIR
+    os.makedirs(log_dir, exist_ok=True)
+
+    file_formatter = JsonFormatter() if LOG_FORMAT == 'json' else logging.Formatter(TEXT_FORMAT)
+    rotate_seconds = LOG_ROTATE_HOURS * 3600
+
+    main_handler = SizeAndTimeRotatingFileHandler(
+        os.path.join(log_dir, 'scraper.log'), LOG_MAX_BYTES, LOG_BACKUP_COUNT, rotate_seconds
+    )
+    main_handler.setFormatter(file_formatter)
+
+    error_handler = SizeAndTimeRotatingFileHandler(
+        os.path.join(log_dir, 'scraper_errors.log'), LOG_MAX_BYTES, LOG_BACKUP_COUNT, rotate_seconds
     )
-    
-    # Create logger for scraper
-    logger = logging.getLogger('revolico_scraper')
-    
-    # Add error-only file handler
-    error_handler = logging.FileHandler('logs/scraper_errors.log')
     error_handler.setLevel(logging.ERROR)
-    error_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    error_handler.setFormatter(error_formatter)
-    logger.addHandler(error_handler)
-    
-    return logger
+    error_handler.setFormatter(file_formatter)
+
+    handlers = [main_handler, error_handler]
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    queue_handler = StructuredQueueHandler(log_queue)
+    queue_handler.addFilter(TruncateFilter())
+    root.addHandler(queue_handler)
+    root.setLevel((level or LOG_LEVEL).upper())
+
+    levels = dict(DEFAULT_MODULE_LEVELS)
+    levels.update(_parse_module_levels(os.environ.get('LOG_LEVELS', '')))
+    levels.update(module_levels or {})
+    for name, module_level in levels.items():
+        logging.getLogger(name).setLevel(module_level)
+
+    _log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Stoppt den QueueListener und schreibt wartende Records noch auf Disk"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+def setup_logging() -> logging.Logger:
+    """Setup logging configuration (idempotent) and return the scraper logger"""
+    configure_logging()
+    return logging.getLogger('revolico_scraper')
 
 def save_to_json(data: Dict[str, Any], filename: str) -> bool:
     """Save data to JSON file with error handling"""
@@ -3,9 +3,14 @@ WhatsApp Account Manager - Manages multiple WhatsApp accounts
 """
 import os
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date
-from typing import Dict, Optional
-from whatsapp_simple import SimpleWhatsAppBot
+from typing import Dict, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # Selenium wird erst geladen, wenn wirklich ein Bot gestartet wird
+    from whatsapp_simple import SimpleWhatsAppBot
 
 logger = logging.getLogger(__name__)
 
@@ -21,14 +26,21 @@ class WhatsAppAccountManager:
             db: SQLAlchemy database instance
         """
         self.db = db
-        self.active_bots: Dict[int, SimpleWhatsAppBot] = {}  # account_id -> bot instance
+        self.active_bots: Dict[int, 'SimpleWhatsAppBot'] = {}  # account_id -> bot instance
         self.base_profile_dir = "whatsapp_profiles"
 
+        # Session restore tracking (background supervisor + on-demand restore)
+        self.restore_state: Dict[int, dict] = {}
+        self.on_restore_progress = None  # callback(dict) e.g. SocketIO emit
+        self._restore_locks: Dict[int, threading.Lock] = {}
+        self._state_lock = threading.Lock()
+        self._bots_lock = threading.Lock()
+
         # Create base profile directory if it doesn't exist
         os.makedirs(self.base_profile_dir, exist_ok=True)
         logger.info(f"WhatsApp Account Manager initialized with base dir: {self.base_profile_dir}")
 
-    def get_or_create_bot(self, account_id: int) -> Optional[SimpleWhatsAppBot]:
+    def get_or_create_bot(self, account_id: int) -> Optional['SimpleWhatsAppBot']:
         """
         Get existing bot instance or create new one for account
 
@@ -38,7 +50,12 @@ class WhatsAppAccountManager:
         Returns:
             SimpleWhatsAppBot instance or None if account not found
         """
+        with self._bots_lock:
+            return self._get_or_create_bot(account_id)
+
+    def _get_or_create_bot(self, account_id: int) -> Optional['SimpleWhatsAppBot']:
         from models import WhatsAppAccount
+        from whatsapp_simple import SimpleWhatsAppBot
 
         # Return existing bot if already active
         if account_id in self.active_bots:
@@ -69,7 +86,7 @@ class WhatsAppAccountManager:
             logger.error(f"Failed to create bot for account {account_id}: {e}")
             return None
 
-    def get_bot(self, account_id: int) -> Optional[SimpleWhatsAppBot]:
+    def get_bot(self, account_id: int) -> Optional['SimpleWhatsAppBot']:
         """Get existing bot instance (does not create new one)"""
         return self.active_bots.get(account_id)
 
@@ -93,6 +110,7 @@ class WhatsAppAccountManager:
             is_logged_in: Login status
             phone_number: Phone number (if detected)
         """
+        from change_feed import ChangeFeed
         from models import WhatsAppAccount
 
         try:
@@ -107,6 +125,7 @@ class WhatsAppAccountManager:
                 if phone_number and not account.phone_number:
                     account.phone_number = phone_number
 
+                ChangeFeed.account(account)
                 self.db.session.commit()
                 logger.info(f"Updated account {account_id} status: logged_in={is_logged_in}")
         except Exception as e:
@@ -121,6 +140,7 @@ class WhatsAppAccountManager:
             account_id: WhatsApp account ID
             success: Whether message was sent successfully
         """
+        from change_feed import ChangeFeed
         from models import WhatsAppAccount
 
         try:
@@ -136,6 +156,7 @@ class WhatsAppAccountManager:
                     account.total_messages_failed += 1
 
                 account.last_seen_at = datetime.utcnow()
+                ChangeFeed.account(account)
                 self.db.session.commit()
                 logger.info(f"Account {account_id}: messages_sent_today={account.messages_sent_today}/{account.daily_message_limit}")
         except Exception as e:
@@ -209,6 +230,7 @@ class WhatsAppAccountManager:
         Returns:
             Account dict or None if creation failed
         """
+        from change_feed import ChangeFeed
         from models import WhatsAppAccount
         import re
 
@@ -233,6 +255,8 @@ class WhatsAppAccountManager:
             )
 
             self.db.session.add(account)
+            self.db.session.flush()
+            ChangeFeed.account(account)
             self.db.session.commit()
 
             logger.info(f"Created new WhatsApp account: {account_name} (ID: {account.id})")
@@ -252,6 +276,7 @@ class WhatsAppAccountManager:
         Returns:
             True if deleted successfully
         """
+        from change_feed import ChangeFeed
         from models import WhatsAppAccount
         import shutil
 
@@ -271,6 +296,7 @@ class WhatsAppAccountManager:
 
             # Delete from database
             self.db.session.delete(account)
+            ChangeFeed.account_deleted(account_id)
             self.db.session.commit()
 
             logger.info(f"Deleted WhatsApp account {account_id}")
@@ -280,10 +306,158 @@ class WhatsAppAccountManager:
             self.db.session.rollback()
             return False
 
+    def _restore_lock(self, account_id: int) -> threading.Lock:
+        with self._state_lock:
+            return self._restore_locks.setdefault(account_id, threading.Lock())
+
+    def _set_restore_state(self, account_id: int, state: str, message: str = None):
+        with self._state_lock:
+            self.restore_state[account_id] = {
+                'state': state,
+                'message': message,
+                'updated_at': datetime.utcnow().isoformat()
+            }
+        if self.on_restore_progress:
+            try:
+                self.on_restore_progress({'account_id': account_id, 'state': state, 'message': message})
+            except Exception as e:
+                logger.error(f"Restore progress callback failed: {e}")
+
+    def get_restore_status(self) -> Dict[int, dict]:
+        """Restore-Status aller Accounts (pending/restoring/logged_in/qr_required/failed)"""
+        with self._state_lock:
+            return dict(self.restore_state)
+
+    def restore_account(self, account_id: int) -> str:
+        """
+        Restore one account's WhatsApp session from its saved profile
+        (needs an app context). Concurrent calls for the same account wait
+        for the running restore instead of starting a second browser.
+
+        Returns:
+            'logged_in', 'qr_required' or 'failed'
+        """
+        from change_feed import ChangeFeed
+        from models import WhatsAppAccount
+
+        with self._restore_lock(account_id):
+            bot = self.get_bot(account_id)
+            if bot and bot.driver and bot.is_logged_in:
+                return 'logged_in'
+
+            account = self.db.session.get(WhatsAppAccount, account_id)
+            if not account or not account.is_active:
+                self._set_restore_state(account_id, 'failed', 'Account not found or inactive')
+                return 'failed'
+
+            self._set_restore_state(account_id, 'restoring')
+            try:
+                logger.info(f"Restoring session for account {account.id} ({account.account_name})...")
+
+                # Create bot instance with saved profile
+                bot = self.get_or_create_bot(account.id)
+                if not bot:
+                    logger.error(f"Failed to create bot for account {account.id}")
+                    self._set_restore_state(account_id, 'failed', 'Bot could not be created')
+                    return 'failed'
+
+                # Start browser with saved profile
+                if not bot.driver and not bot.setup_browser():
+                    logger.warning(f"Browser setup failed for account {account.id}")
+                    account.is_logged_in = False
+                    ChangeFeed.account(account)
+                    self.db.session.commit()
+                    self._set_restore_state(account_id, 'failed', 'Browser setup failed')
+                    return 'failed'
+
+                # Load WhatsApp Web
+                result = bot.start_whatsapp_web()
+
+                if result['status'] == 'logged_in':
+                    # Session still valid!
+                    logger.info(f"✅ Session restored for account {account.id} ({account.account_name})")
+                    bot.is_logged_in = True
+                    self._set_restore_state(account_id, 'logged_in')
+                    return 'logged_in'
+
+                account.is_logged_in = False
+                bot.is_logged_in = False
+                ChangeFeed.account(account)
+                self.db.session.commit()
+                if result['status'] == 'qr_ready':
+                    # Session expired, needs re-login
+                    logger.warning(f"Session expired for account {account.id}, QR code required")
+                    self._set_restore_state(account_id, 'qr_required', 'Session expired, QR code required')
+                    return 'qr_required'
+
+                logger.error(f"Failed to restore session for account {account.id}: {result.get('message')}")
+                self._set_restore_state(account_id, 'failed', result.get('message'))
+                return 'failed'
+
+            except Exception as e:
+                logger.error(f"Error restoring account {account_id}: {e}")
+                self.db.session.rollback()
+                account.is_logged_in = False
+                ChangeFeed.account(account)
+                self.db.session.commit()
+                self._set_restore_state(account_id, 'failed', str(e))
+                return 'failed'
+
+    def ensure_bot_ready(self, account_id: int) -> Optional['SimpleWhatsAppBot']:
+        """
+        On-demand restore: returns a logged-in bot, restoring the session
+        first if it has not been restored yet (needs an app context)
+        """
+        bot = self.get_bot(account_id)
+        if bot and bot.driver and bot.is_logged_in:
+            return bot
+        if self.restore_account(account_id) == 'logged_in':
+            return self.get_bot(account_id)
+        return None
+
+    def start_background_restore(self, app, max_workers: int = 2) -> threading.Thread:
+        """
+        Restore all active accounts in a background supervisor thread
+        (max_workers browsers in parallel) so the web server starts immediately.
+        Progress is reported through on_restore_progress.
+        """
+        from models import WhatsAppAccount
+
+        def restore_in_context(account_id):
+            with app.app_context():
+                return self.restore_account(account_id)
+
+        def supervisor():
+            try:
+                with app.app_context():
+                    account_ids = [a.id for a in WhatsAppAccount.query.filter_by(is_active=True).all()]
+
+                if not account_ids:
+                    logger.info("No active accounts found")
+                    return
+
+                logger.info(f"Restoring {len(account_ids)} WhatsApp sessions in background "
+                            f"({max_workers} at a time)...")
+                for account_id in account_ids:
+                    self._set_restore_state(account_id, 'pending')
+
+                with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='wa-restore') as pool:
+                    results = list(pool.map(restore_in_context, account_ids))
+
+                restored = results.count('logged_in')
+                logger.info(f"Session restoration complete: {restored}/{len(account_ids)} logged in")
+
+            except Exception as e:
+                logger.error(f"Failed to restore logged-in accounts: {e}")
+
+        thread = threading.Thread(target=supervisor, name='wa-restore-supervisor', daemon=True)
+        thread.start()
+        return thread
+
     def restore_logged_in_accounts(self):
         """
-        Restore WhatsApp sessions for accounts marked as logged_in in database.
-        Called on server startup to restore bot instances and validate sessions.
+        Restore WhatsApp sessions for all active accounts sequentially (blocking).
+        The web app uses start_background_restore() instead.
         """
         from models import WhatsAppAccount
 
@@ -292,54 +466,14 @@ class WhatsAppAccountManager:
 
             # Query all active accounts and try to restore them
             # (even if not marked as logged in - we check the actual session state)
-            logged_in_accounts = WhatsAppAccount.query.filter_by(is_active=True).all()
+            account_ids = [a.id for a in WhatsAppAccount.query.filter_by(is_active=True).all()]
 
-            if not logged_in_accounts:
+            if not account_ids:
                 logger.info("No active accounts found")
                 return
 
-            logger.info(f"Found {len(logged_in_accounts)} accounts marked as logged in")
-
-            for account in logged_in_accounts:
-                try:
-                    logger.info(f"Restoring session for account {account.id} ({account.account_name})...")
-
-                    # Create bot instance with saved profile
-                    bot = self.get_or_create_bot(account.id)
-                    if not bot:
-                        logger.error(f"Failed to create bot for account {account.id}")
-                        continue
-
-                    # Start browser with saved profile
-                    if not bot.setup_browser():
-                        logger.warning(f"Browser setup failed for account {account.id}")
-                        account.is_logged_in = False
-                        self.db.session.commit()
-                        continue
-
-                    # Load WhatsApp Web
-                    result = bot.start_whatsapp_web()
-
-                    if result['status'] == 'logged_in':
-                        # Session still valid!
-                        logger.info(f"✅ Session restored for account {account.id} ({account.account_name})")
-                        bot.is_logged_in = True
-                    elif result['status'] == 'qr_ready':
-                        # Session expired, needs re-login
-                        logger.warning(f"Session expired for account {account.id}, QR code required")
-                        account.is_logged_in = False
-                        bot.is_logged_in = False
-                        self.db.session.commit()
-                    else:
-                        # Error
-                        logger.error(f"Failed to restore session for account {account.id}: {result.get('message')}")
-                        account.is_logged_in = False
-                        self.db.session.commit()
-
-                except Exception as e:
-                    logger.error(f"Error restoring account {account.id}: {e}")
-                    account.is_logged_in = False
-                    self.db.session.commit()
+            for account_id in account_ids:
+                self.restore_account(account_id)
 
             logger.info("Session restoration complete")
 
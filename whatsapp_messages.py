@@ -0,0 +1,22 @@
+"""
+WhatsApp Nachrichtenvorlagen
+Ohne Selenium-Abhängigkeit, damit die Web-UI die Vorlagen laden kann, ohne
+den Browser-Stack zu importieren.
+"""
+
+# Default message templates
+SIMPLE_MESSAGES = {
+    "rico_promo": """🏝️ Hola! Soy de Rico-Cuba, una nueva Plattform für kubanische Dienstleistungen.
+
+Wir helfen kubanischen Unternehmern dabei, ihre Services online anzubieten. Würden Sie gerne mehr über unsere kostenlosen Marketing-Services erfahren?
+
+🔗 Rico-Cuba.com""",
+    
+    "business_intro": """¡Hola! Ich habe Ihre Anzeige auf Revolico gesehen.
+
+Wir von Rico-Cuba helfen kubanischen Geschäftsinhabern dabei, online mehr Kunden zu erreichen. Kostenlose Beratung verfügbar.
+
+Hätten Sie 5 Minuten für ein kurzes Gespräch? 📞""",
+    
+    "simple": """Hola! Ich habe Ihre Anzeige gesehen und würde gerne mehr über Ihre Services erfahren. Könnten wir kurz sprechen? Vielen Dank! 😊"""
+}
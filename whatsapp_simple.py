@@ -8,16 +8,17 @@ import time
 import os
 import json
 import logging
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from webdriver_manager.firefox import GeckoDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 import base64
 
+from browser_lifecycle import ManagedBrowser
+from firefox_setup import BASE_PREFS, launch_firefox
+from metrics import metrics
+from whatsapp_messages import SIMPLE_MESSAGES  # noqa: F401 (re-export)
+
 logger = logging.getLogger(__name__)
 
 class SimpleWhatsAppBot:
@@ -29,8 +30,7 @@ class SimpleWhatsAppBot:
             profile_dir: Custom profile directory (for multi-account support)
             account_id: WhatsApp account ID from database
         """
-        self.driver = None
-        self.wait = None
+        self.browser = None
         self.is_logged_in = False
         self.account_id = account_id
 
@@ -42,7 +42,16 @@ class SimpleWhatsAppBot:
 
         # QR code file in account-specific directory
         self.qr_screenshot_file = os.path.join(self.profile_dir, 'whatsapp_qr_code.png')
-        
+
+    @property
+    def driver(self):
+        """Aktueller Firefox-Driver (wechselt beim Recycling, Profil bleibt gleich)"""
+        return self.browser.driver if self.browser else None
+
+    @property
+    def wait(self):
+        return WebDriverWait(self.driver, 30)
+
     def setup_browser(self):
         """Setup Firefox mit Session-Persistierung"""
         try:
@@ -51,28 +60,18 @@ class SimpleWhatsAppBot:
 
             logger.info(f"🖥️  Setting up Firefox browser with profile: {self.profile_dir}")
 
-            firefox_options = FirefoxOptions()
-
             # KRITISCHER FIX: Direktes Profile-Verzeichnis verwenden statt FirefoxProfile-Objekt
-            # Dies stellt sicher, dass Firefox das Profil direkt nutzt und Session-Daten dort speichert
-            firefox_options.add_argument('-profile')
-            firefox_options.add_argument(self.profile_dir)
-
-            # Headless Mode für Replit
-            firefox_options.add_argument('--headless')
-            firefox_options.add_argument('--width=1200')
-            firefox_options.add_argument('--height=800')
-
-            # Explicitly set Firefox binary location
-            firefox_options.binary_location = '/usr/lib/firefox-esr/firefox-esr'
-
-            # Anti-detection
-            firefox_options.set_preference("dom.webdriver.enabled", False)
-            firefox_options.set_preference("useAutomationExtension", False)
-
-            service = FirefoxService(GeckoDriverManager().install())
-            self.driver = webdriver.Firefox(service=service, options=firefox_options)
-            self.wait = WebDriverWait(self.driver, 30)
+            # Dies stellt sicher, dass Firefox das Profil direkt nutzt und Session-Daten dort speichert.
+            # Binary/geckodriver sind pro Prozess gecacht (kein GeckoDriverManager-Check pro Bot),
+            # BASE_PREFS schalten Telemetrie/Updates ab - Bilder bleiben an (QR-Code)
+            arguments = ['--headless', '--width=1200', '--height=800']
+
+            # Neustart nach BROWSER_MAX_PAGES Seiten / BROWSER_MAX_RSS_MB mit demselben -profile
+            self.browser = ManagedBrowser(
+                lambda: launch_firefox(arguments, prefs=BASE_PREFS, profile_dir=self.profile_dir, name='whatsapp'),
+                name='whatsapp'
+            )
+            self.browser.start()
 
             logger.info("✅ Firefox browser initialized successfully with persistent profile")
             return True
@@ -195,7 +194,27 @@ class SimpleWhatsAppBot:
     
     def send_message(self, phone_number: str, message: str):
         """Sendet Nachricht an Telefonnummer"""
+        with metrics.timer('whatsapp_send_seconds'):
+            result = self._send_message(phone_number, message)
+        metrics.inc('whatsapp_messages_total', status=result.get('status', 'unknown'))
+        return result
+
+    def _recycle_if_needed(self):
+        """Browser zwischen zwei Nachrichten neu starten, wenn Seiten-/Speichergrenze erreicht"""
+        if not self.browser or not self.browser.maybe_recycle():
+            return
+        # Frischer Browser mit demselben Profil: Session ist noch da, WhatsApp Web neu laden
+        self.driver.get("https://web.whatsapp.com")
+        self.browser.page_loaded()
         try:
+            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, '#side')))
+        except TimeoutException:
+            logger.warning("⚠️ WhatsApp Web not ready after browser recycle")
+
+    def _send_message(self, phone_number: str, message: str):
+        try:
+            self._recycle_if_needed()
+
             # Re-validate login status before sending
             current_status = self.check_login_status()
             if current_status['status'] != 'logged_in':
@@ -211,6 +230,7 @@ class SimpleWhatsAppBot:
             logger.info(f"📤 Sending message to {phone_number}...")
 
             self.driver.get(wa_url)
+            self.browser.page_loaded()
             time.sleep(12)  # Increased wait time for page load
 
             # Check for error dialogs first
@@ -279,7 +299,7 @@ class SimpleWhatsAppBot:
     def close(self):
         """Schließt Browser"""
         if self.driver:
-            self.driver.quit()
+            self.browser.quit()
             logger.info("🔌 WhatsApp browser closed")
 
 # Global instance
@@ -291,20 +311,3 @@ def get_whatsapp_bot():
     if whatsapp_bot is None:
         whatsapp_bot = SimpleWhatsAppBot()
     return whatsapp_bot
-
-# Default message templates
-SIMPLE_MESSAGES = {
-    "rico_promo": """🏝️ Hola! Soy de Rico-Cuba, una nueva Plattform für kubanische Dienstleistungen.
-
-Wir helfen kubanischen Unternehmern dabei, ihre Services online anzubieten. Würden Sie gerne mehr über unsere kostenlosen Marketing-Services erfahren?
-
-🔗 Rico-Cuba.com""",
-    
-    "business_intro": """¡Hola! Ich habe Ihre Anzeige auf Revolico gesehen.
-
-Wir von Rico-Cuba helfen kubanischen Geschäftsinhabern dabei, online mehr Kunden zu erreichen. Kostenlose Beratung verfügbar.
-
-Hätten Sie 5 Minuten für ein kurzes Gespräch? 📞""",
-    
-    "simple": """Hola! Ich habe Ihre Anzeige gesehen und würde gerne mehr über Ihre Services erfahren. Könnten wir kurz sprechen? Vielen Dank! 😊"""
-}
\ No newline at end of file
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+WSGI-Einstiegspunkt
+Erstellt die App (inkl. Scrape-Worker, Change-Relay, Scheduler und
+WhatsApp-Restore je nach Config) - `import app` allein startet nichts.
+
+Verwendung:
+    gunicorn -k gthread --threads 8 -w 1 wsgi:app
+"""
+from app import create_app, socketio
+
+app = create_app()
+
+if __name__ == '__main__':
+    socketio.run(app, host='0.0.0.0', port=5000, debug=False, allow_unsafe_werkzeug=True)